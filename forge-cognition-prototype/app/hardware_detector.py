@@ -8,16 +8,28 @@ Supports:
 - Jetson AGX Thor (ARM64, unified memory, NVLink)
 - RTX Pro 4000 (x86_64, discrete GPU, PCIe)
 - Development environments (Tesla P40, etc.)
+
+Hardware facts come from hardware_probe (shared with the inference server),
+which probes NVML, nvidia-smi, Jetson device files and the CUDA version once,
+in parallel, and caches the result on disk per boot and driver version.
 """
 
-import os
-import subprocess
+import sys
 import platform
 import yaml
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+try:
+    from hardware_probe import probe_hardware
+except ImportError:
+    # Repo checkout: the shared module lives next to the inference server
+    sys.path.append(str(
+        Path(__file__).resolve().parents[2] / "honeywell-forge-lab" / "inference-server"
+    ))
+    from hardware_probe import probe_hardware
+
 
 @dataclass
 class HardwareProfile:
@@ -86,54 +98,19 @@ DEFAULT_PROFILES = {
 
 
 def get_gpu_info() -> Dict[str, str]:
-    """Get GPU information using nvidia-smi."""
-    try:
-        result = subprocess.run(
-            [
-                'nvidia-smi',
-                '--query-gpu=name,memory.total,driver_version,compute_cap',
-                '--format=csv,noheader,nounits'
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split(', ')
-            return {
-                'name': parts[0] if len(parts) > 0 else 'Unknown',
-                'memory_mb': int(parts[1]) if len(parts) > 1 else 0,
-                'driver': parts[2] if len(parts) > 2 else 'Unknown',
-                'compute_cap': parts[3] if len(parts) > 3 else 'Unknown',
-            }
-    except Exception as e:
-        print(f"Warning: Could not get GPU info: {e}")
-
-    return {'name': 'Unknown', 'memory_mb': 0, 'driver': 'Unknown', 'compute_cap': 'Unknown'}
+    """Get GPU information (cached hardware probe)."""
+    hw = probe_hardware()
+    return {
+        'name': hw.gpu_name,
+        'memory_mb': hw.gpu_memory_mb,
+        'driver': hw.driver_version,
+        'compute_cap': hw.compute_cap,
+    }
 
 
 def detect_jetson() -> bool:
     """Detect if running on Jetson platform."""
-    # Check for Jetson-specific files
-    jetson_indicators = [
-        '/etc/nv_tegra_release',
-        '/proc/device-tree/compatible',
-    ]
-
-    for indicator in jetson_indicators:
-        if os.path.exists(indicator):
-            return True
-
-    # Check for Jetson in platform info
-    try:
-        with open('/proc/device-tree/compatible', 'rb') as f:
-            content = f.read().decode('utf-8', errors='ignore')
-            if 'tegra' in content.lower() or 'jetson' in content.lower():
-                return True
-    except:
-        pass
-
-    return False
+    return probe_hardware().is_jetson
 
 
 def detect_hardware() -> str:
@@ -236,22 +213,9 @@ def get_gpu_capabilities() -> Dict[str, Any]:
         'is_jetson': detect_jetson(),
     }
 
-    # Check for specific features
-    try:
-        # Check CUDA version
-        result = subprocess.run(
-            ['nvcc', '--version'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'release' in line.lower():
-                    capabilities['cuda_version'] = line.strip()
-                    break
-    except:
-        pass
+    cuda_version = probe_hardware().cuda_version
+    if cuda_version:
+        capabilities['cuda_version'] = cuda_version
 
     return capabilities
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Honeywell Forge Cognition - gRPC vs JSON API Benchmark
+
+Sends the same workload to a running server over POST /v1/chat (JSON over
+HTTP/1.1 keep-alive, aiohttp) and over ForgeInference.Generate (protobuf
+over one multiplexed HTTP/2 channel). Each concurrent client opens its own
+session first, so the run stays under the SKU's session limit.
+
+Reports throughput, client-observed latency, client CPU per request and
+payload bytes per request. Use a small --max-tokens to make protocol
+overhead visible next to the (simulated) generation time.
+
+Usage:
+    python benchmarks/grpc_vs_json.py
+    python benchmarks/grpc_vs_json.py --http http://localhost:8000 --grpc localhost:8001 \\
+        --requests 2000 --concurrency 4 --max-tokens 1
+
+Needs grpcio and the stubs (make grpc-stubs).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+import aiohttp
+import grpc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "inference-server"))
+
+import forge_inference_pb2 as pb2  # noqa: E402
+import forge_inference_pb2_grpc as pb2_grpc  # noqa: E402
+
+PROMPT = "What are common causes of high discharge pressure on chiller CH-003?"
+
+
+def percentile(data: List[float], p: float) -> float:
+    ordered = sorted(data)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+async def run_clients(
+    requests: int,
+    concurrency: int,
+    open_session: Callable[[], Awaitable[str]],
+    send: Callable[[str], Awaitable[None]],
+    close_session: Callable[[str], Awaitable[None]]
+) -> dict:
+    latencies: List[float] = []
+    per_client = requests // concurrency
+
+    async def client():
+        session_id = await open_session()
+        try:
+            for _ in range(per_client):
+                start = time.perf_counter()
+                await send(session_id)
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            await close_session(session_id)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall_s, cpu_s = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    return {
+        "requests": len(latencies),
+        "requests_per_s": len(latencies) / wall_s,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "client_cpu_us": cpu_s / len(latencies) * 1e6,
+    }
+
+
+async def bench_json(args) -> dict:
+    url = args.http.rstrip("/")
+    sizes = {}
+    async with aiohttp.ClientSession() as http:
+        async def open_session() -> str:
+            async with http.post(f"{url}/v1/sessions") as resp:
+                resp.raise_for_status()
+                return (await resp.json())["session_id"]
+
+        async def send(session_id: str):
+            body = json.dumps({"prompt": PROMPT, "session_id": session_id, "max_tokens": args.max_tokens}).encode()
+            async with http.post(f"{url}/v1/chat", data=body, headers={"Content-Type": "application/json"}) as resp:
+                resp.raise_for_status()
+                payload = await resp.read()
+            sizes.update(request=len(body), response=len(payload))
+
+        async def close_session(session_id: str):
+            async with http.delete(f"{url}/v1/sessions/{session_id}"):
+                pass
+
+        result = await run_clients(args.requests, args.concurrency, open_session, send, close_session)
+    return {**result, "request_bytes": sizes["request"], "response_bytes": sizes["response"]}
+
+
+async def bench_grpc(args) -> dict:
+    sizes = {}
+    async with grpc.aio.insecure_channel(args.grpc) as channel:
+        stub = pb2_grpc.ForgeInferenceStub(channel)
+
+        async def open_session() -> str:
+            return (await stub.CreateSession(pb2.CreateSessionRequest())).session_id
+
+        async def send(session_id: str):
+            request = pb2.GenerateRequest(prompt=PROMPT, session_id=session_id, max_tokens=args.max_tokens)
+            response = await stub.Generate(request)
+            sizes.update(request=request.ByteSize(), response=response.ByteSize())
+
+        async def close_session(session_id: str):
+            await stub.CloseSession(pb2.CloseSessionRequest(session_id=session_id))
+
+        result = await run_clients(args.requests, args.concurrency, open_session, send, close_session)
+    return {**result, "request_bytes": sizes["request"], "response_bytes": sizes["response"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC vs JSON API benchmark")
+    parser.add_argument("--http", default="http://localhost:8000")
+    parser.add_argument("--grpc", default="localhost:8001")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4, help="Keep at or below max sessions")
+    parser.add_argument("--max-tokens", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {"JSON /v1/chat": asyncio.run(bench_json(args)), "gRPC Generate": asyncio.run(bench_grpc(args))}
+
+    print("=" * 72)
+    print(f"  gRPC vs JSON ({args.requests} requests, {args.concurrency} clients, max_tokens={args.max_tokens})")
+    print("=" * 72)
+    print(f"  {'API':<16}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'client CPU us':>15}{'req B':>7}{'resp B':>8}")
+    for name, r in results.items():
+        print(f"  {name:<16}{r['requests_per_s']:9.1f}{r['p50_ms']:9.2f}{r['p99_ms']:9.2f}"
+              f"{r['client_cpu_us']:15.1f}{r['request_bytes']:7d}{r['response_bytes']:8d}")
+    print("  (payload bytes exclude HTTP/1.1 and HTTP/2 headers)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
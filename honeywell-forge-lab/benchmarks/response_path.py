@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Honeywell Forge Cognition - /v1/chat Response Path Microbenchmark
+
+Measures the per-request CPU cost of the framework around /v1/chat,
+in-process and without a GPU. Two otherwise identical routes are driven
+through the ASGI interface with a typical short maintenance answer:
+
+1. Legacy: return a ChatResponse model; FastAPI re-validates it against
+   response_model and encodes it via jsonable_encoder + stdlib json
+2. Fast:   return server.FastJSONResponse built from a plain dict
+   (orjson when installed), skipping the second validation pass
+
+The encoder step alone is also timed (stdlib json vs orjson).
+
+Usage:
+    python benchmarks/response_path.py
+    python benchmarks/response_path.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "inference-server"))
+
+import server  # noqa: E402  (import has no side effects)
+from fastapi import FastAPI  # noqa: E402
+
+RESULT = {
+    "text": "Check the condenser fan relay (K3) and verify 24VAC at the contactor coil. "
+            "If voltage is present and the fan does not start, replace the run capacitor.",
+    "ttft_ms": 84.12,
+    "total_latency_ms": 1187.4,
+    "tokens_per_second": 54.9,
+    "input_tokens": 42,
+    "output_tokens": 64,
+}
+BODY = json.dumps({"prompt": "AHU-3 condenser fan not starting", "max_tokens": 128}).encode()
+
+
+def _metrics() -> dict:
+    return {k: RESULT[k] for k in ("ttft_ms", "total_latency_ms", "tokens_per_second", "input_tokens", "output_tokens")}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/legacy", response_model=server.ChatResponse)
+    async def legacy(request: server.ChatRequest):
+        return server.ChatResponse(session_id="a1b2c3d4", response=RESULT["text"], metrics=_metrics())
+
+    @app.post("/fast", response_model=server.ChatResponse)
+    async def fast(request: server.ChatRequest):
+        return server.FastJSONResponse({"session_id": "a1b2c3d4", "response": RESULT["text"], "metrics": _metrics()})
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, requests: int) -> tuple:
+    """Send `requests` POSTs straight into the ASGI app; returns (CPU us/request, body)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(BODY)).encode())],
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    for _ in range(min(200, requests)):  # Warm up routing and pydantic caches
+        await app(dict(scope), receive, send)
+    body.clear()
+    start = time.process_time()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.process_time() - start) / requests * 1e6, body[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/v1/chat response path microbenchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = build_app()
+    legacy_us, legacy_body = asyncio.run(drive(app, "/legacy", args.requests))
+    fast_us, fast_body = asyncio.run(drive(app, "/fast", args.requests))
+    assert json.loads(legacy_body) == json.loads(fast_body), "response bodies differ"
+
+    payload = {"session_id": "a1b2c3d4", "response": RESULT["text"], "metrics": _metrics()}
+    stdlib_us = min(timeit.repeat(
+        lambda: json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(),
+        number=args.iterations, repeat=5)) / args.iterations * 1e6
+    encoder = "orjson" if server.orjson is not None else "stdlib json (orjson not installed)"
+    fast_encode_us = min(timeit.repeat(
+        lambda: server.FastJSONResponse.render(None, payload),
+        number=args.iterations, repeat=5)) / args.iterations * 1e6
+
+    print("=" * 60)
+    print("  /v1/chat RESPONSE PATH CPU COST")
+    print("=" * 60)
+    print(f"  Fast path encoder:              {encoder}")
+    print(f"  Per request, legacy model path: {legacy_us:8.1f} us")
+    print(f"  Per request, fast path:         {fast_us:8.1f} us  ({legacy_us - fast_us:.1f} us saved, "
+          f"{100 * (legacy_us - fast_us) / legacy_us:.0f}%)")
+    print(f"  Encode only, stdlib json:       {stdlib_us:8.2f} us")
+    print(f"  Encode only, fast path:         {fast_encode_us:8.2f} us")
+    print(f"  Response body:                  {len(fast_body)} B (identical JSON)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
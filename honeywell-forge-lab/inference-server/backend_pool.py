@@ -0,0 +1,737 @@
+"""
+Honeywell Forge Cognition - Multi-Replica Backend Pool
+
+Spreads requests over several inference backends so one node can scale past a
+single engine without an external load balancer. Typical layout: one local
+replica per GPU reported by NVML plus optional remote replicas (e.g. a second
+Triton box on the site network).
+
+Routing:
+  - Least outstanding tokens: each in-flight request costs its prompt tokens
+    plus max_tokens, so one long generation weighs more than many short ones.
+  - Session affinity: a session sticks to the replica that served its last
+    turn (warm prefix / KV cache) unless that replica is unavailable or far
+    more loaded than the least-loaded one.
+
+Hedging (optional, short queries only):
+  - If the chosen replica has not produced a first token after the observed
+    P90 TTFT, a second copy goes to another replica; whichever streams first
+    wins and the loser is cancelled. Hedges are budgeted as a fraction of
+    eligible traffic so they cannot amplify overload.
+
+Resilience:
+  - Each replica has a circuit breaker (circuit_breaker.py); open breakers
+    take the replica out of routing until a half-open trial succeeds.
+  - A failed request is retried on another replica only while the retry
+    budget (a token bucket earning a fraction of a retry per request) lasts.
+    Hedged requests whose copies all failed take the same retry path.
+
+Health:
+  - Active probing: health_check() on every replica at a fixed interval;
+    replicas that failed to load are retried.
+  - Outlier ejection: consecutive failures or a high recent error rate eject
+    a replica for a cool-down period. The last available replica is never
+    ejected.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Dict, List, Optional
+
+from prometheus_client import Counter, Gauge
+
+from circuit_breaker import OPEN, BreakerConfig, CircuitBreaker
+from inference_backends import BackendError, InferenceBackend, InferenceResult, StreamChunk
+from tokenization import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Prometheus Metrics
+# ============================================================================
+
+REPLICA_OUTSTANDING_TOKENS = Gauge(
+    'forge_replica_outstanding_tokens',
+    'Estimated tokens (prompt + max_tokens) of in-flight requests per replica',
+    ['replica']
+)
+
+REPLICA_INFLIGHT = Gauge(
+    'forge_replica_inflight_requests',
+    'In-flight requests per replica',
+    ['replica']
+)
+
+REPLICA_AVAILABLE = Gauge(
+    'forge_replica_available',
+    'Replica is loaded, healthy and not ejected (1=available, 0=not)',
+    ['replica']
+)
+
+REPLICA_REQUESTS = Counter(
+    'forge_replica_requests_total',
+    'Requests routed to each replica',
+    ['replica', 'status']
+)
+
+REPLICA_EJECTIONS = Counter(
+    'forge_replica_ejections_total',
+    'Outlier ejections per replica',
+    ['replica']
+)
+
+HEDGE_ELIGIBLE = Counter(
+    'forge_hedge_eligible_requests_total',
+    'Requests eligible for hedging'
+)
+
+HEDGE_REQUESTS = Counter(
+    'forge_hedge_requests_total',
+    'Hedging decisions (issued, won, skipped_budget, skipped_no_replica)',
+    ['outcome']
+)
+
+
+BACKEND_RETRIES = Counter(
+    'forge_backend_retries_total',
+    'Retry decisions after a failed backend call (retried, budget_exhausted, no_replica)',
+    ['outcome']
+)
+
+
+class NoReplicaAvailableError(RuntimeError):
+    """Raised when no replica can accept a request"""
+
+    def __init__(self, message: str, retry_after_s: float = 1.0):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+@dataclass
+class PoolConfig:
+    """Routing and health settings for BackendPool"""
+    probe_interval_s: float = 5.0
+    probe_timeout_s: float = 2.0
+    eject_consecutive_failures: int = 3
+    eject_error_rate: float = 0.5
+    error_rate_min_requests: int = 10
+    error_window: int = 50
+    ejection_duration_s: float = 30.0
+    affinity_max_imbalance_tokens: int = 4096
+    max_affinity_entries: int = 10000
+    retry_budget_percent: float = 20.0   # Retries as % of requests
+    max_retries: int = 1
+
+
+@dataclass
+class HedgePolicy:
+    """When to send a second copy of a slow request to another replica"""
+    enabled: bool = False
+    max_tokens: int = 256             # Only hedge short queries
+    delay_percentile: float = 90.0    # Hedge after this observed TTFT percentile
+    min_delay_ms: float = 20.0
+    max_delay_ms: float = 2000.0      # Hedging later than this cannot save the P99 target
+    budget_percent: float = 10.0      # Max hedges as % of eligible requests
+    min_samples: int = 20             # TTFT samples needed before hedging starts
+    ttft_window: int = 500
+
+
+class RatioBudget:
+    """
+    Token bucket that earns `ratio` tokens per request and spends one per
+    extra attempt, capping extra attempts at ratio x traffic with a small burst.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class TTFTTracker:
+    """Recent TTFT samples with a lazily refreshed percentile"""
+
+    def __init__(self, window: int = 500, refresh_every: int = 50):
+        self._samples = deque(maxlen=window)
+        self._sorted: List[float] = []
+        self._refresh_every = refresh_every
+        self._since_refresh = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, ttft_ms: float):
+        self._samples.append(ttft_ms)
+        self._since_refresh += 1
+
+    def percentile(self, p: float) -> float:
+        if self._since_refresh >= self._refresh_every or len(self._sorted) != len(self._samples):
+            self._sorted = sorted(self._samples)
+            self._since_refresh = 0
+        if not self._sorted:
+            return 0.0
+        index = min(int(len(self._sorted) * p / 100), len(self._sorted) - 1)
+        return self._sorted[index]
+
+
+class Replica:
+    """One backend in the pool plus its load and health bookkeeping"""
+
+    def __init__(
+        self,
+        name: str,
+        backend: InferenceBackend,
+        error_window: int = 50,
+        breaker_config: Optional[BreakerConfig] = None
+    ):
+        self.name = name
+        self.backend = backend
+        self.breaker = CircuitBreaker(name, breaker_config)
+        self.outstanding_tokens = 0
+        self.inflight = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.total_requests = 0
+        self.total_errors = 0
+        self._outcomes = deque(maxlen=error_window)
+
+    @property
+    def ejected(self) -> bool:
+        return time.monotonic() < self.ejected_until
+
+    @property
+    def available(self) -> bool:
+        return (
+            self.backend.is_loaded
+            and self.healthy
+            and not self.ejected
+            and not self.breaker.rejecting
+        )
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def acquire(self, cost: int):
+        self.outstanding_tokens += cost
+        self.inflight += 1
+        self.update_gauges()
+
+    def release(self, cost: int):
+        self.outstanding_tokens -= cost
+        self.inflight -= 1
+        self.update_gauges()
+
+    def record(self, success: bool):
+        self.total_requests += 1
+        self._outcomes.append(success)
+        if success:
+            self.consecutive_failures = 0
+            self.breaker.record_success()
+        else:
+            self.total_errors += 1
+            self.consecutive_failures += 1
+            self.breaker.record_failure()
+        REPLICA_REQUESTS.labels(
+            replica=self.name, status="success" if success else "error"
+        ).inc()
+
+    def eject(self, duration_s: float):
+        self.ejected_until = time.monotonic() + duration_s
+        self.consecutive_failures = 0
+        self._outcomes.clear()
+        REPLICA_EJECTIONS.labels(replica=self.name).inc()
+        self.update_gauges()
+
+    def update_gauges(self):
+        REPLICA_OUTSTANDING_TOKENS.labels(replica=self.name).set(self.outstanding_tokens)
+        REPLICA_INFLIGHT.labels(replica=self.name).set(self.inflight)
+        REPLICA_AVAILABLE.labels(replica=self.name).set(1 if self.available else 0)
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "backend": self.backend.backend_name,
+            "available": self.available,
+            "loaded": self.backend.is_loaded,
+            "healthy": self.healthy,
+            "ejected": self.ejected,
+            "circuit_breaker": self.breaker.state,
+            "outstanding_tokens": self.outstanding_tokens,
+            "inflight_requests": self.inflight,
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "recent_error_rate": round(self.error_rate(), 3),
+        }
+
+
+class BackendPool(InferenceBackend):
+    """
+    InferenceBackend that routes each request to one of several replicas.
+    generate() and generate_stream() take an extra session_id for affinity
+    routing.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        config: Optional[PoolConfig] = None,
+        hedge_policy: Optional[HedgePolicy] = None
+    ):
+        if not replicas:
+            raise ValueError("BackendPool needs at least one replica")
+        self.replicas = replicas
+        self.config = config or PoolConfig()
+        self.hedge_policy = hedge_policy or HedgePolicy()
+        self._affinity: "OrderedDict[str, Replica]" = OrderedDict()
+        self._probe_task: Optional[asyncio.Task] = None
+        self._ttft = TTFTTracker(self.hedge_policy.ttft_window)
+        self._hedge_budget = RatioBudget(self.hedge_policy.budget_percent / 100)
+        self._retry_budget = RatioBudget(self.config.retry_budget_percent / 100)
+        self._hedge_counts = {"eligible": 0, "issued": 0, "won": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def load_model(self) -> None:
+        results = await asyncio.gather(
+            *(r.backend.load_model() for r in self.replicas),
+            return_exceptions=True
+        )
+        for replica, result in zip(self.replicas, results):
+            if isinstance(result, Exception):
+                replica.healthy = False
+                logger.warning(f"Replica {replica.name} failed to load: {result}")
+            replica.update_gauges()
+
+        if not any(r.available for r in self.replicas):
+            raise RuntimeError("No replica loaded successfully")
+
+    def start_probing(self):
+        if self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.config.probe_interval_s)
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.warning(f"Replica probe round failed: {e}")
+
+    async def probe_once(self):
+        """Actively check every replica; retry loading replicas that failed"""
+        async def probe(replica: Replica):
+            try:
+                if not replica.backend.is_loaded:
+                    await asyncio.wait_for(
+                        replica.backend.load_model(), self.config.probe_timeout_s
+                    )
+                health = await asyncio.wait_for(
+                    replica.backend.health_check(), self.config.probe_timeout_s
+                )
+                healthy = health.get("status") == "healthy"
+            except Exception:
+                healthy = False
+            if healthy != replica.healthy:
+                logger.info(f"Replica {replica.name} is now {'healthy' if healthy else 'unhealthy'}")
+            replica.healthy = healthy
+            replica.update_gauges()
+
+        await asyncio.gather(*(probe(r) for r in self.replicas))
+
+    async def close(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        for replica in self.replicas:
+            if hasattr(replica.backend, "close"):
+                await replica.backend.close()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def request_cost(prompt: str, max_tokens: int) -> int:
+        """Estimated tokens a request will hold on its replica"""
+        return count_tokens(prompt) + max_tokens
+
+    def select(self, session_id: Optional[str] = None, exclude: tuple = ()) -> Replica:
+        """
+        Pick the replica with the fewest outstanding tokens (affinity first)
+        and reserve a circuit-breaker slot on it.
+        """
+        excluded = list(exclude)
+        while True:
+            candidates = [r for r in self.replicas if r.available and r not in excluded]
+            if not candidates:
+                raise NoReplicaAvailableError(
+                    "No inference replica available",
+                    retry_after_s=self.retry_after_s()
+                )
+
+            choice = min(candidates, key=lambda r: r.outstanding_tokens)
+            if session_id is not None:
+                affine = self._affinity.get(session_id)
+                if (
+                    affine in candidates
+                    and affine.outstanding_tokens - choice.outstanding_tokens
+                    <= self.config.affinity_max_imbalance_tokens
+                ):
+                    choice = affine
+
+            if choice.breaker.allow_request():
+                return choice
+            # Half-open breaker already has its trial request in flight
+            excluded.append(choice)
+
+    def retry_after_s(self) -> float:
+        """Shortest wait until an open breaker admits a trial request"""
+        waits = [r.breaker.retry_after_s() for r in self.replicas if r.breaker.state == OPEN]
+        return max(1.0, min(waits)) if waits else 1.0
+
+    def _remember_affinity(self, session_id: Optional[str], replica: Replica):
+        if session_id is None:
+            return
+        self._affinity[session_id] = replica
+        self._affinity.move_to_end(session_id)
+        while len(self._affinity) > self.config.max_affinity_entries:
+            self._affinity.popitem(last=False)
+
+    def forget_session(self, session_id: str):
+        self._affinity.pop(session_id, None)
+
+    def _record_outcome(self, replica: Replica, success: bool):
+        replica.record(success)
+        if success:
+            return
+
+        cfg = self.config
+        should_eject = (
+            replica.consecutive_failures >= cfg.eject_consecutive_failures
+            or (
+                len(replica._outcomes) >= cfg.error_rate_min_requests
+                and replica.error_rate() >= cfg.eject_error_rate
+            )
+        )
+        others_available = any(r.available for r in self.replicas if r is not replica)
+        if should_eject and others_available:
+            logger.warning(
+                f"Ejecting replica {replica.name} for {cfg.ejection_duration_s}s "
+                f"(error rate {replica.error_rate():.0%})"
+            )
+            replica.eject(cfg.ejection_duration_s)
+
+    # ------------------------------------------------------------------
+    # InferenceBackend interface
+    # ------------------------------------------------------------------
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        stream: bool = False,
+        session_id: Optional[str] = None
+    ) -> InferenceResult:
+        self._retry_budget.deposit()
+        tried: List[Replica] = []
+        if self._hedge_eligible(max_tokens):
+            try:
+                return await self._generate_hedged(prompt, max_tokens, temperature, session_id, tried)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Every hedged copy failed: same budgeted retry as an unhedged request
+                if not tried or not self._should_retry(tried):
+                    raise
+                logger.info(f"Retrying hedged request after failure on {', '.join(r.name for r in tried)}")
+
+        while True:
+            replica = self.select(session_id, exclude=tuple(tried))
+            try:
+                result = await self._generate_on(replica, prompt, max_tokens, temperature)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                tried.append(replica)
+                if not self._should_retry(tried):
+                    raise
+                logger.info(f"Retrying request after failure on replica {replica.name}")
+                continue
+
+            self._remember_affinity(session_id, replica)
+            self._ttft.observe(result.ttft_ms)
+            return result
+
+    async def _generate_on(
+        self,
+        replica: Replica,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> InferenceResult:
+        """Run one attempt on a replica selected (and breaker-reserved) by select()"""
+        cost = self.request_cost(prompt, max_tokens)
+        replica.acquire(cost)
+        try:
+            result = await replica.backend.generate(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        except asyncio.CancelledError:
+            replica.breaker.release()
+            raise
+        except Exception:
+            self._record_outcome(replica, success=False)
+            raise
+        finally:
+            replica.release(cost)
+
+        self._record_outcome(replica, success=True)
+        return result
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream from one replica (affinity first). No retries or hedging:
+        once chunks have reached the client the request cannot move.
+        """
+        replica = self.select(session_id)
+        cost = self.request_cost(prompt, max_tokens)
+        replica.acquire(cost)
+        recorded = False
+        try:
+            async with aclosing(replica.backend.generate_stream(prompt, max_tokens, temperature)) as chunks:
+                async for chunk in chunks:
+                    if chunk.finished:
+                        recorded = True
+                        self._record_outcome(replica, success=True)
+                        self._remember_affinity(session_id, replica)
+                        if chunk.result is not None:
+                            self._ttft.observe(chunk.result.ttft_ms)
+                    yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # Cancelled by the client: not the replica's fault
+            if not recorded:
+                replica.breaker.release()
+            raise
+        except Exception:
+            self._record_outcome(replica, success=False)
+            raise
+        finally:
+            replica.release(cost)
+
+    def _should_retry(self, tried: List[Replica]) -> bool:
+        if len(tried) > self.config.max_retries:
+            return False
+        if not any(r.available and r not in tried for r in self.replicas):
+            BACKEND_RETRIES.labels(outcome="no_replica").inc()
+            return False
+        if not self._retry_budget.try_spend():
+            BACKEND_RETRIES.labels(outcome="budget_exhausted").inc()
+            return False
+        BACKEND_RETRIES.labels(outcome="retried").inc()
+        return True
+
+    # ------------------------------------------------------------------
+    # Hedging
+    # ------------------------------------------------------------------
+
+    def _hedge_eligible(self, max_tokens: int) -> bool:
+        policy = self.hedge_policy
+        if not policy.enabled or max_tokens > policy.max_tokens:
+            return False
+        if sum(1 for r in self.replicas if r.available) < 2:
+            return False
+        return True
+
+    def _hedge_delay_s(self) -> Optional[float]:
+        """Observed TTFT percentile, or None until enough samples exist"""
+        policy = self.hedge_policy
+        if len(self._ttft) < policy.min_samples:
+            return None
+        delay_ms = self._ttft.percentile(policy.delay_percentile)
+        return min(max(delay_ms, policy.min_delay_ms), policy.max_delay_ms) / 1000
+
+    async def _generate_hedged(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        session_id: Optional[str],
+        tried: List[Replica]
+    ) -> InferenceResult:
+        """Primary attempt plus an optional hedge; failed replicas are appended to tried"""
+        self._hedge_counts["eligible"] += 1
+        HEDGE_ELIGIBLE.inc()
+        self._hedge_budget.deposit()
+
+        start_time = time.perf_counter()
+        cost = self.request_cost(prompt, max_tokens)
+        attempts: Dict[asyncio.Task, Replica] = {}
+        started_at: Dict[Replica, float] = {}
+        state = {"winner": None}
+        first_token = asyncio.Event()
+
+        async def attempt(replica: Replica) -> InferenceResult:
+            replica.acquire(cost)
+            try:
+                result = None
+                stream = replica.backend.generate_stream(prompt, max_tokens, temperature)
+                async with aclosing(stream) as chunks:
+                    async for chunk in chunks:
+                        # Only output or a completed result counts: an empty
+                        # keep-alive chunk must not cancel the other copy
+                        produced = chunk.text or chunk.num_tokens or (chunk.finished and chunk.result)
+                        if produced and state["winner"] is None:
+                            state["winner"] = replica
+                            first_token.set()
+                            # Cancel the other copy as soon as this one streams
+                            for task in attempts:
+                                if task is not asyncio.current_task():
+                                    task.cancel()
+                        if chunk.finished:
+                            result = chunk.result
+                if result is None:
+                    raise BackendError(f"Replica {replica.name} ended the stream without a result")
+            except asyncio.CancelledError:
+                replica.breaker.release()
+                raise
+            except Exception:
+                self._record_outcome(replica, success=False)
+                raise
+            finally:
+                replica.release(cost)
+            self._record_outcome(replica, success=True)
+            return result
+
+        def launch(replica: Replica):
+            started_at[replica] = time.perf_counter()
+            attempts[asyncio.create_task(attempt(replica))] = replica
+
+        primary = self.select(session_id)
+        launch(primary)
+        first_token_wait = asyncio.create_task(first_token.wait())
+        try:
+            delay = self._hedge_delay_s()
+            if delay is not None:
+                await asyncio.wait(
+                    [first_token_wait, *attempts],
+                    timeout=delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                primary_task = next(iter(attempts))
+                if not first_token.is_set() and not primary_task.done():
+                    self._issue_hedge(primary, launch)
+
+            pending = set(attempts)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        tried.append(attempts[task])
+                        continue
+                    replica = attempts[task]
+                    if state["winner"] is not replica:
+                        continue
+                    result = task.result()
+                    if replica is not primary:
+                        self._hedge_counts["won"] += 1
+                        HEDGE_REQUESTS.labels(outcome="won").inc()
+                    # Report latency as the client saw it, from the first attempt
+                    offset_ms = (started_at[replica] - start_time) * 1000
+                    result = replace(
+                        result,
+                        ttft_ms=round(result.ttft_ms + offset_ms, 2),
+                        total_latency_ms=round(result.total_latency_ms + offset_ms, 2)
+                    )
+                    self._remember_affinity(session_id, replica)
+                    self._ttft.observe(result.ttft_ms)
+                    return result
+            raise last_error or NoReplicaAvailableError("All hedged attempts were cancelled")
+        finally:
+            first_token_wait.cancel()
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def _issue_hedge(self, primary: Replica, launch):
+        try:
+            secondary = self.select(exclude=(primary,))
+        except NoReplicaAvailableError:
+            HEDGE_REQUESTS.labels(outcome="skipped_no_replica").inc()
+            return
+        if not self._hedge_budget.try_spend():
+            secondary.breaker.release()
+            HEDGE_REQUESTS.labels(outcome="skipped_budget").inc()
+            return
+        self._hedge_counts["issued"] += 1
+        HEDGE_REQUESTS.labels(outcome="issued").inc()
+        launch(secondary)
+
+    def hedge_stats(self) -> Dict:
+        counts = self._hedge_counts
+        return {
+            "enabled": self.hedge_policy.enabled,
+            "eligible_requests": counts["eligible"],
+            "hedges_issued": counts["issued"],
+            "hedges_won": counts["won"],
+            "hedge_rate": round(counts["issued"] / counts["eligible"], 4) if counts["eligible"] else 0.0,
+            "win_rate": round(counts["won"] / counts["issued"], 4) if counts["issued"] else 0.0,
+            "current_delay_ms": round(self._hedge_delay_s() * 1000, 2) if self._hedge_delay_s() else None,
+            "budget_percent": self.hedge_policy.budget_percent,
+        }
+
+    async def health_check(self) -> Dict:
+        available = sum(1 for r in self.replicas if r.available)
+        return {
+            "backend": "pool",
+            "status": "healthy" if available else "unhealthy",
+            "available_replicas": available,
+            "total_replicas": len(self.replicas),
+        }
+
+    @property
+    def is_loaded(self) -> bool:
+        return any(r.backend.is_loaded for r in self.replicas)
+
+    @property
+    def backend_name(self) -> str:
+        names = {r.backend.backend_name for r in self.replicas}
+        return names.pop() if len(names) == 1 else "mixed"
+
+    def stats(self) -> Dict:
+        return {
+            "replicas": [r.stats() for r in self.replicas],
+            "affinity_sessions": len(self._affinity),
+            "hedging": self.hedge_stats(),
+            "retry_budget_tokens": round(self._retry_budget.tokens, 2),
+        }
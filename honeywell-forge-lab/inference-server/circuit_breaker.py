@@ -0,0 +1,129 @@
+"""
+Honeywell Forge Cognition - Circuit Breaker
+
+Per-backend circuit breaker so a sick upstream fails fast instead of dragging
+every request through full timeouts:
+
+  closed    -> normal operation; consecutive failures are counted
+  open      -> requests are rejected immediately for open_duration_s
+  half_open -> a limited number of trial requests are let through; success
+               closes the breaker, failure re-opens it
+
+State changes are exported as Prometheus metrics.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = Gauge(
+    'forge_circuit_breaker_state',
+    'Circuit breaker state per backend (0=closed, 1=half_open, 2=open)',
+    ['replica']
+)
+
+BREAKER_TRANSITIONS = Counter(
+    'forge_circuit_breaker_transitions_total',
+    'Circuit breaker state transitions per backend',
+    ['replica', 'state']
+)
+
+
+@dataclass
+class BreakerConfig:
+    """Circuit breaker thresholds"""
+    failure_threshold: int = 5        # Consecutive failures that open the breaker
+    open_duration_s: float = 10.0     # How long to reject before trying again
+    half_open_max_calls: int = 1      # Concurrent trial requests while half-open
+    success_threshold: int = 1        # Trial successes needed to close
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one backend"""
+
+    def __init__(self, name: str, config: Optional[BreakerConfig] = None):
+        self.name = name
+        self.config = config or BreakerConfig()
+        self._state = CLOSED
+        self._failures = 0
+        self._half_open_successes = 0
+        self._half_open_inflight = 0
+        self._opened_at = 0.0
+        BREAKER_STATE.labels(replica=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        """Current state; reading it never changes it (metrics, stats)"""
+        return self._state
+
+    @property
+    def rejecting(self) -> bool:
+        """Open and still cooling down: allow_request() would say no"""
+        return self._state == OPEN and self.retry_after_s() > 0
+
+    def retry_after_s(self) -> float:
+        """Seconds until an open breaker lets a trial request through"""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self.config.open_duration_s - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """
+        Reserve a slot for one request; False if the breaker rejects it.
+        An open breaker whose cool-down has passed goes half-open here, when
+        a request actually wants the trial slot.
+        """
+        if self._state == OPEN and self.retry_after_s() == 0:
+            self._transition(HALF_OPEN)
+        if self._state == CLOSED:
+            return True
+        if self._state == HALF_OPEN and self._half_open_inflight < self.config.half_open_max_calls:
+            self._half_open_inflight += 1
+            return True
+        return False
+
+    def record_success(self):
+        if self._state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.config.success_threshold:
+                self._transition(CLOSED)
+        self._failures = 0
+
+    def record_failure(self):
+        if self._state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+            self._transition(OPEN)
+            return
+        self._failures += 1
+        if self._state == CLOSED and self._failures >= self.config.failure_threshold:
+            self._transition(OPEN)
+
+    def release(self):
+        """Give back a half-open slot for a request that was cancelled"""
+        if self._state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker {self.name}: {self._state} -> {state}")
+        self._state = state
+        self._failures = 0
+        self._half_open_successes = 0
+        self._half_open_inflight = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        BREAKER_STATE.labels(replica=self.name).set(_STATE_VALUES[state])
+        BREAKER_TRANSITIONS.labels(replica=self.name, state=state).inc()
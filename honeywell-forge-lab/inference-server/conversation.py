@@ -0,0 +1,124 @@
+"""
+Honeywell Forge Cognition - Server-Side Conversation History
+
+Multi-turn clients (the /v1/ws channel, /v1/chat with use_history) send only
+the new prompt; each session's earlier messages are kept here. A session's
+messages live in a fixed-capacity ring: UTF-8 payloads plus array-backed
+token counts and roles. Memory per session is bounded and reported, and
+token counts are computed once per message, not once per turn.
+
+Context for the next turn is assembled under a max_input_len token budget.
+It contains the pinned system prompt, then the newest messages that still
+fit, then the new prompt. Old messages slide out of the window while the
+head of the prompt stays the same between turns, which keeps prefix
+(KV-cache) reuse effective.
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from tokenization import count_tokens
+
+USER, ASSISTANT = 0, 1
+ROLE_NAMES = ("User", "Assistant")
+ROLE_OVERHEAD_TOKENS = 2  # "User: " / "Assistant: " prefix per message
+
+
+@dataclass
+class ConversationConfig:
+    """Context budget and history limits (config.yaml `conversation:`)"""
+    max_input_len: int = 2048   # Prompt token budget per turn: system + history + new prompt
+    max_messages: int = 32      # Ring capacity per session (user and assistant messages)
+    system_prompt: str = ""     # Pinned at the head of every context
+
+
+class ConversationHistory:
+    """Fixed-capacity ring of one session's messages; the oldest is overwritten"""
+
+    def __init__(self, capacity: int, count_tokens: Callable[[str], int] = count_tokens):
+        self.capacity = max(2, capacity)
+        self.count_tokens = count_tokens
+        self._payloads: List[Optional[bytes]] = [None] * self.capacity
+        self._tokens = array("I", [0]) * self.capacity
+        self._roles = bytearray(self.capacity)
+        self._start = 0
+        self._size = 0
+        self.dropped = 0
+        self.last_context_tokens = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, i: int) -> int:
+        """Ring slot of the i-th oldest message"""
+        return (self._start + i) % self.capacity
+
+    def append(self, role: int, text: str):
+        if self._size == self.capacity:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+            self.dropped += 1
+        else:
+            slot = self._slot(self._size)
+            self._size += 1
+        self._payloads[slot] = text.encode("utf-8")
+        self._tokens[slot] = self.count_tokens(text) + ROLE_OVERHEAD_TOKENS
+        self._roles[slot] = role
+
+    def add_turn(self, prompt: str, response: str):
+        self.append(USER, prompt)
+        self.append(ASSISTANT, response)
+
+    def messages(self) -> Iterator[Tuple[int, str]]:
+        """(role, text) of each message, oldest first"""
+        for i in range(self._size):
+            slot = self._slot(i)
+            yield self._roles[slot], self._payloads[slot].decode("utf-8")
+
+    def window(self, budget_tokens: int) -> range:
+        """Indices (oldest first) of the newest messages fitting budget_tokens"""
+        first, used = self._size, 0
+        while first > 0 and used + self._tokens[self._slot(first - 1)] <= budget_tokens:
+            first -= 1
+            used += self._tokens[self._slot(first)]
+        # Never open the window on an assistant reply without its question
+        if first < self._size and self._roles[self._slot(first)] == ASSISTANT:
+            first += 1
+        return range(first, self._size)
+
+    def build_context(self, prompt: str, config: ConversationConfig, system_tokens: int) -> str:
+        """Pinned system prompt + newest history within budget + the new prompt"""
+        prompt_tokens = self.count_tokens(prompt) + ROLE_OVERHEAD_TOKENS
+        budget = config.max_input_len - system_tokens - prompt_tokens - ROLE_OVERHEAD_TOKENS
+        lines = [f"System: {config.system_prompt}"] if config.system_prompt else []
+        used = system_tokens + prompt_tokens + ROLE_OVERHEAD_TOKENS
+        for i in self.window(max(budget, 0)):
+            slot = self._slot(i)
+            lines.append(f"{ROLE_NAMES[self._roles[slot]]}: {self._payloads[slot].decode('utf-8')}")
+            used += self._tokens[slot]
+        lines.append(f"User: {prompt}")
+        lines.append("Assistant:")
+        self.last_context_tokens = used
+        return "\n".join(lines)
+
+    def memory_bytes(self) -> int:
+        """Payload bytes plus the fixed ring arrays"""
+        payload = sum(len(p) for p in self._payloads if p is not None)
+        return (
+            payload
+            + self._tokens.itemsize * self.capacity
+            + len(self._roles)
+            + sys.getsizeof(self._payloads)
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "messages": self._size,
+            "capacity": self.capacity,
+            "tokens": sum(self._tokens[self._slot(i)] for i in range(self._size)),
+            "memory_bytes": self.memory_bytes(),
+            "dropped_messages": self.dropped,
+            "last_context_tokens": self.last_context_tokens,
+        }
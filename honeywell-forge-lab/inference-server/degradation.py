@@ -0,0 +1,171 @@
+"""
+Honeywell Forge Cognition - Graceful Degradation (Output-Length Clamping)
+
+A small edge GPU under a burst has two options: reject part of the traffic,
+or give every request a shorter answer. Decode time and KV usage scale with
+output length, so capping max_tokens for new requests is the cheapest way
+to drain a backlog while everyone still gets an answer.
+
+DegradationController watches two load signals:
+
+  queue  requests waiting in the engine (admitted beyond the
+         max_concurrent_sessions it runs at once) / the SKU max_queue_depth
+  kv     tokens reserved by in-flight requests (prompt + max_tokens)
+         / kv_budget_tokens (0 disables this signal)
+
+It enters degraded mode when either signal reaches its high watermark. It
+leaves only when both are below their low watermarks and min_degraded_s has
+passed since the last high reading, so it does not flap around one
+threshold. While degraded, each priority class has its own policy: the
+requested max_tokens is scaled and then capped, never below min_tokens.
+Clamped responses say so (clamped / effective_max_tokens), and the time
+spent degraded is exported as forge_degraded_seconds_total.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+DEGRADED = Gauge(
+    'forge_degraded',
+    'Whether output-length clamping is active (1) or not (0)',
+    multiprocess_mode='livemax'
+)
+
+DEGRADED_SECONDS = Counter(
+    'forge_degraded_seconds_total',
+    'Time spent in degraded mode (output-length clamping) in seconds'
+)
+
+DEGRADATION_TRANSITIONS = Counter(
+    'forge_degradation_transitions_total',
+    'Entries into and exits from degraded mode',
+    ['direction']
+)
+
+CLAMPED_REQUESTS = Counter(
+    'forge_clamped_requests_total',
+    'Requests whose max_tokens was lowered in degraded mode, by priority class',
+    ['priority']
+)
+
+_ENTERED = DEGRADATION_TRANSITIONS.labels(direction="enter")
+_EXITED = DEGRADATION_TRANSITIONS.labels(direction="exit")
+
+
+@dataclass
+class ClassPolicy:
+    """max_tokens for one priority class while degraded"""
+    scale: float = 1.0      # Fraction of the requested max_tokens
+    max_tokens: int = 0     # Then capped here (0: no cap)
+
+
+DEFAULT_POLICY = {
+    "high": {"scale": 1.0, "max_tokens": 0},
+    "normal": {"scale": 0.5, "max_tokens": 256},
+    "low": {"scale": 0.25, "max_tokens": 128},
+}
+
+
+_CLAMPED = {p: CLAMPED_REQUESTS.labels(priority=p) for p in DEFAULT_POLICY}
+
+
+@dataclass
+class DegradationConfig:
+    """config.yaml `degradation:` section (sku_profiles.yaml may override it)"""
+    enabled: bool = True
+    queue_high: float = 0.8         # Enter at this fraction of max_queue_depth...
+    queue_low: float = 0.4          # ...leave below this one
+    kv_high: float = 0.9            # Same for reserved tokens / kv_budget_tokens
+    kv_low: float = 0.7
+    kv_budget_tokens: int = 0       # KV capacity in tokens (0: queue signal only)
+    min_degraded_s: float = 10.0    # Stay degraded this long after the last high reading
+    min_tokens: int = 32            # Never clamp below this
+    policy: Dict[str, ClassPolicy] = field(default_factory=dict)
+
+    def __post_init__(self):
+        merged = {p: dict(v) for p, v in DEFAULT_POLICY.items()}
+        for priority, overrides in (self.policy or {}).items():
+            if isinstance(overrides, ClassPolicy):
+                overrides = {"scale": overrides.scale, "max_tokens": overrides.max_tokens}
+            merged.setdefault(priority, {}).update(overrides)
+        self.policy = {p: ClassPolicy(**v) for p, v in merged.items()}
+
+
+class DegradationController:
+    """Watermark state machine with hysteresis, plus the per-class clamp"""
+
+    def __init__(self, cfg: DegradationConfig, max_queue_depth: int):
+        self.config = cfg
+        self.max_queue_depth = max_queue_depth
+        self.degraded = False
+        self.entered_at: Optional[float] = None
+        self.total_degraded_s = 0.0
+        self.queue_load = 0.0
+        self.kv_load = 0.0
+        self._last_high = 0.0
+        self._last_observed = time.monotonic()
+
+    def observe(self, queue_depth: int, reserved_tokens: int, now: Optional[float] = None) -> bool:
+        """Update the load signals and the state; returns whether degraded"""
+        now = time.monotonic() if now is None else now
+        cfg = self.config
+        if self.degraded:
+            elapsed = now - self._last_observed
+            self.total_degraded_s += elapsed
+            DEGRADED_SECONDS.inc(elapsed)
+        self._last_observed = now
+
+        self.queue_load = queue_depth / max(self.max_queue_depth, 1)
+        self.kv_load = reserved_tokens / cfg.kv_budget_tokens if cfg.kv_budget_tokens > 0 else 0.0
+        high = self.queue_load >= cfg.queue_high or (cfg.kv_budget_tokens > 0 and self.kv_load >= cfg.kv_high)
+        low = self.queue_load < cfg.queue_low and self.kv_load < cfg.kv_low
+
+        if high:
+            self._last_high = now
+        if not self.degraded and high and cfg.enabled:
+            self.degraded, self.entered_at = True, now
+            DEGRADED.set(1)
+            _ENTERED.inc()
+            logger.warning(f"Degraded mode on (queue {self.queue_load:.0%}, kv {self.kv_load:.0%}): clamping max_tokens")
+        elif self.degraded and (not cfg.enabled or (low and now - self._last_high >= cfg.min_degraded_s)):
+            logger.warning(f"Degraded mode off after {now - self.entered_at:.1f}s")
+            self.degraded, self.entered_at = False, None
+            DEGRADED.set(0)
+            _EXITED.inc()
+        return self.degraded
+
+    def clamp(self, priority: str, max_tokens: int) -> Tuple[int, bool]:
+        """Effective max_tokens for a new request and whether it was lowered"""
+        if not self.degraded:
+            return max_tokens, False
+        policy = self.config.policy.get(priority) or self.config.policy["normal"]
+        limit = int(max_tokens * policy.scale)
+        if policy.max_tokens > 0:
+            limit = min(limit, policy.max_tokens)
+        limit = max(limit, self.config.min_tokens)
+        if limit >= max_tokens:
+            return max_tokens, False
+        (_CLAMPED.get(priority) or CLAMPED_REQUESTS.labels(priority=priority)).inc()
+        return limit, True
+
+    def stats(self) -> Dict:
+        cfg = self.config
+        return {
+            "enabled": cfg.enabled,
+            "degraded": self.degraded,
+            "degraded_for_s": round(time.monotonic() - self.entered_at, 2) if self.degraded else 0.0,
+            "total_degraded_s": round(self.total_degraded_s, 2),
+            "queue_load": round(self.queue_load, 3),
+            "kv_load": round(self.kv_load, 3),
+            "watermarks": {
+                "queue": [cfg.queue_low, cfg.queue_high],
+                "kv": [cfg.kv_low, cfg.kv_high] if cfg.kv_budget_tokens > 0 else None,
+            },
+            "policy": {p: {"scale": c.scale, "max_tokens": c.max_tokens} for p, c in cfg.policy.items()},
+        }
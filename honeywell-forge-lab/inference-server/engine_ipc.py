@@ -0,0 +1,208 @@
+"""
+Honeywell Forge Cognition - Engine IPC
+
+Unix-socket RPC between HTTP front-end workers and the single engine
+process in multi-worker mode (see server.py, FORGE_WORKERS). The engine
+process stays the only owner of the GPU, the model, sessions and limits;
+workers only parse, validate and serialize.
+
+Wire format: 4-byte big-endian length + JSON object, one request and one
+response per frame, sequential per connection. Clients keep a pool of
+connections so concurrent requests do not queue behind each other.
+
+  request:  {"op": "generate", "args": {...}}
+  response: {"ok": true, "result": ...}
+            {"ok": false, "error": {"type": "http" | "no_replica" | "backend" | "timeout" | "error", ...}}
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional
+
+from fastapi import HTTPException
+
+from backend_pool import NoReplicaAvailableError
+from inference_backends import BackendError
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class EngineUnavailableError(ConnectionError):
+    """The engine process cannot be reached over IPC"""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict:
+    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"IPC frame of {length} bytes exceeds limit")
+    return json.loads(await reader.readexactly(length))
+
+
+def write_frame(writer: asyncio.StreamWriter, message: Dict):
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    writer.write(_HEADER.pack(len(payload)) + payload)
+
+
+# ============================================================================
+# Error transport (engine exceptions are re-raised in the worker)
+# ============================================================================
+
+def encode_error(e: BaseException) -> Dict:
+    if isinstance(e, HTTPException):
+        return {"type": "http", "status": e.status_code, "detail": e.detail, "headers": e.headers}
+    if isinstance(e, NoReplicaAvailableError):
+        return {"type": "no_replica", "detail": str(e), "retry_after_s": e.retry_after_s}
+    if isinstance(e, BackendError):
+        return {"type": "backend", "detail": str(e)}
+    if isinstance(e, asyncio.TimeoutError):
+        return {"type": "timeout", "detail": "Inference backend timed out"}
+    return {"type": "error", "detail": f"{type(e).__name__}: {e}"}
+
+
+def decode_error(error: Dict) -> BaseException:
+    kind = error.get("type")
+    if kind == "http":
+        return HTTPException(status_code=error["status"], detail=error["detail"], headers=error.get("headers"))
+    if kind == "no_replica":
+        return NoReplicaAvailableError(error["detail"], error["retry_after_s"])
+    if kind == "backend":
+        return BackendError(error["detail"])
+    if kind == "timeout":
+        return asyncio.TimeoutError(error["detail"])
+    return RuntimeError(error.get("detail", "engine error"))
+
+
+# ============================================================================
+# Engine side
+# ============================================================================
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class EngineIPCServer:
+    """Serves registered async handlers on a Unix socket"""
+
+    def __init__(self, socket_path: str, handlers: Dict[str, Handler]):
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._serve_connection, path=self.socket_path)
+        logger.info(f"Engine IPC listening on {self.socket_path}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_frame(reader)
+                handler = self.handlers.get(request.get("op"))
+                try:
+                    if handler is None:
+                        raise ValueError(f"Unknown engine op: {request.get('op')}")
+                    response = {"ok": True, "result": await handler(**request.get("args", {}))}
+                except Exception as e:
+                    response = {"ok": False, "error": encode_error(e)}
+                write_frame(writer, response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Worker closed the connection
+        except asyncio.CancelledError:
+            pass  # Engine shutting down; returning avoids a logged cancelled-task error
+        finally:
+            writer.close()
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+class EngineClient:
+    """
+    Pooled connections from one front-end worker to the engine process.
+    A connection that breaks mid-call (engine died or restarted) raises
+    EngineUnavailableError; ops listed in idempotent_ops are retried once
+    on a new connection first.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        pool_size: int = 32,
+        connect_timeout_s: float = 5.0,
+        idempotent_ops: Collection[str] = ()
+    ):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.connect_timeout_s = connect_timeout_s
+        self.idempotent_ops = frozenset(idempotent_ops)
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _connect(self):
+        deadline = time.monotonic() + self.connect_timeout_s
+        while True:
+            try:
+                return await asyncio.open_unix_connection(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                # The engine process may still be starting
+                if time.monotonic() >= deadline:
+                    raise EngineUnavailableError(f"Engine not reachable at {self.socket_path}: {e}")
+                await asyncio.sleep(0.1)
+
+    def _drop_idle(self):
+        """The engine went away: every pooled connection is stale"""
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+
+    async def call(self, op: str, **args) -> Any:
+        attempts = 2 if op in self.idempotent_ops else 1
+        for attempt in range(attempts):
+            try:
+                response = await self._call_once(op, args)
+                break
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                if isinstance(e, EngineUnavailableError):
+                    raise
+                self._drop_idle()
+                if attempt + 1 == attempts:
+                    raise EngineUnavailableError(f"Engine connection lost during {op}: {e!r}") from e
+                logger.info(f"Engine connection lost during {op}; retrying on a new connection")
+
+        if response["ok"]:
+            return response["result"]
+        raise decode_error(response["error"])
+
+    async def _call_once(self, op: str, args: Dict) -> Dict:
+        async with self._slots:
+            conn = self._idle.get_nowait() if not self._idle.empty() else await self._connect()
+            reader, writer = conn
+            try:
+                write_frame(writer, {"op": op, "args": args})
+                await writer.drain()
+                response = await read_frame(reader)
+            except BaseException:
+                # Includes cancellation: the stream may hold a half-read frame
+                writer.close()
+                raise
+            self._idle.put_nowait(conn)
+        return response
+
+    async def close(self):
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
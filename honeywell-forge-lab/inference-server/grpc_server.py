@@ -0,0 +1,188 @@
+"""
+Honeywell Forge Cognition - gRPC Inference API
+
+ForgeInference (forge_inference.proto) on port 8001 for site gateways that
+multiplex many tablets over a few HTTP/2 connections. Requests go through
+the same SessionManager, InferenceEngine and record_turn() bookkeeping as
+POST /v1/chat, so limits, Prometheus metrics and SLO windows are shared.
+
+The forge_inference_pb2* stubs are generated at image build time; without
+them (or without grpcio) server.py runs HTTP only. In multi-worker mode
+every front-end worker binds the port with SO_REUSEPORT (gRPC's default on
+Linux) and the kernel spreads connections across them.
+"""
+
+import logging
+from contextlib import aclosing
+from typing import Awaitable, Callable, Dict
+
+import grpc
+from fastapi import HTTPException
+
+import forge_inference_pb2 as pb2
+import forge_inference_pb2_grpc as pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {
+    pb2.PRIORITY_UNSPECIFIED: "normal",
+    pb2.PRIORITY_HIGH: "high",
+    pb2.PRIORITY_NORMAL: "normal",
+    pb2.PRIORITY_LOW: "low",
+}
+
+# HTTP status of the shared error path -> gRPC status
+STATUS_CODES = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    404: grpc.StatusCode.NOT_FOUND,
+    409: grpc.StatusCode.ALREADY_EXISTS,
+    422: grpc.StatusCode.INVALID_ARGUMENT,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    502: grpc.StatusCode.UNAVAILABLE,
+    503: grpc.StatusCode.UNAVAILABLE,
+    504: grpc.StatusCode.DEADLINE_EXCEEDED,
+}
+
+
+async def abort_with(context: grpc.aio.ServicerContext, error: HTTPException):
+    """Abort the RPC with the gRPC equivalent of an HTTP error"""
+    metadata = tuple((k.lower(), str(v)) for k, v in (error.headers or {}).items())
+    await context.abort(
+        STATUS_CODES.get(error.status_code, grpc.StatusCode.INTERNAL),
+        str(error.detail),
+        trailing_metadata=metadata
+    )
+
+
+class ForgeInferenceServicer(pb2_grpc.ForgeInferenceServicer):
+    """ForgeInference backed by the HTTP server's runtime objects"""
+
+    def __init__(
+        self,
+        sessions,
+        engine,
+        record_turn: Callable,
+        record_error: Callable[[str], Awaitable[None]],
+        inference_error: Callable[[Exception], HTTPException]
+    ):
+        self.sessions = sessions
+        self.engine = engine
+        self.record_turn = record_turn
+        self.record_error = record_error
+        self.inference_error = inference_error
+
+    async def _session_for(self, request: pb2.GenerateRequest, context) -> str:
+        try:
+            if request.session_id:
+                return (await self.sessions.get_session(request.session_id)).session_id
+            return await self.sessions.create_session()
+        except HTTPException as e:
+            await abort_with(context, e)
+
+    async def _generate_args(self, request: pb2.GenerateRequest, session_id: str, priority: str) -> Dict:
+        prompt = request.prompt
+        if request.use_history:
+            prompt = await self.sessions.build_prompt(session_id, request.prompt)
+        return {
+            "prompt": prompt,
+            "max_tokens": request.max_tokens if request.HasField("max_tokens") else 256,
+            "temperature": request.temperature if request.HasField("temperature") else 0.7,
+            "session_id": session_id,
+            "priority": priority,
+        }
+
+    async def _complete(self, request: pb2.GenerateRequest, session_id: str, priority: str, result: Dict) -> Dict:
+        metrics = await self.record_turn(session_id, priority, result)
+        if request.use_history:
+            await self.sessions.append_turn(session_id, request.prompt, result["text"])
+        return metrics
+
+    async def Generate(self, request, context):
+        priority = PRIORITIES.get(request.priority, "normal")
+        session_id = await self._session_for(request, context)
+        try:
+            result = await self.engine.generate(**await self._generate_args(request, session_id, priority))
+            metrics = await self._complete(request, session_id, priority, result)
+        except Exception as e:
+            await self.record_error(priority)
+            await abort_with(context, self.inference_error(e))
+        return pb2.GenerateResponse(
+            session_id=session_id,
+            response=result["text"],
+            metrics=pb2.Metrics(**metrics),
+            clamped=result["clamped"],
+            effective_max_tokens=result["effective_max_tokens"]
+        )
+
+    async def GenerateStream(self, request, context):
+        priority = PRIORITIES.get(request.priority, "normal")
+        session_id = await self._session_for(request, context)
+        try:
+            final = None
+            # Client cancellation closes the stream and the backend request
+            stream = self.engine.generate_stream(**await self._generate_args(request, session_id, priority))
+            async with aclosing(stream) as chunks:
+                async for chunk in chunks:
+                    if chunk["finished"]:
+                        final = chunk
+                    else:
+                        yield pb2.GenerateChunk(
+                            session_id=session_id,
+                            text=chunk["text"],
+                            num_tokens=chunk["num_tokens"]
+                        )
+            result = final["result"]
+            metrics = await self._complete(request, session_id, priority, result)
+        except Exception as e:
+            await self.record_error(priority)
+            await abort_with(context, self.inference_error(e))
+        yield pb2.GenerateChunk(
+            session_id=session_id,
+            text=final["text"],
+            num_tokens=final["num_tokens"],
+            finished=True,
+            result=pb2.GenerateResponse(
+                session_id=session_id,
+                response=result["text"],
+                metrics=pb2.Metrics(**metrics),
+                clamped=result["clamped"],
+                effective_max_tokens=result["effective_max_tokens"]
+            )
+        )
+
+    async def CreateSession(self, request, context):
+        try:
+            session_id = await self.sessions.create_session()
+        except HTTPException as e:
+            await abort_with(context, e)
+        return pb2.Session(session_id=session_id)
+
+    async def CloseSession(self, request, context):
+        await self.sessions.close_session(request.session_id)
+        await self.engine.forget_session(request.session_id)
+        return pb2.CloseSessionResponse(session_id=request.session_id, status="closed")
+
+    async def ListSessions(self, request, context):
+        sessions = await self.sessions.get_all_sessions()
+        return pb2.ListSessionsResponse(
+            count=len(sessions),
+            max_sessions=self.sessions.max_sessions,
+            sessions=[
+                pb2.Session(
+                    session_id=s.session_id,
+                    request_count=s.request_count,
+                    total_tokens=s.total_tokens,
+                    avg_latency_ms=round(s.avg_latency_ms, 2)
+                )
+                for s in sessions
+            ]
+        )
+
+
+async def start_grpc_server(port: int, servicer: ForgeInferenceServicer) -> grpc.aio.Server:
+    server = grpc.aio.server()
+    pb2_grpc.add_ForgeInferenceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    logger.info(f"gRPC API listening on port {port}")
+    return server
@@ -0,0 +1,229 @@
+"""
+Honeywell Forge Cognition - Hardware Probe
+
+Single source of hardware facts for SKU detection, shared by the inference
+server (server.detect_sku) and the prototype
+(forge-cognition-prototype/app/hardware_detector.py).
+
+Each source (NVML, nvidia-smi, Jetson device files, CUDA toolkit version)
+is probed once, in parallel, with a timeout. The merged result is memoized
+in-process and cached on disk keyed by boot ID and driver version, so a
+restart on the same boot skips the nvidia-smi / nvcc forks entirely.
+"""
+
+import functools
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get("FORGE_HW_CACHE_PATH", "/tmp/forge-hardware-probe.json")
+PROBE_TIMEOUT_S = float(os.environ.get("FORGE_HW_PROBE_TIMEOUT_S", "5"))
+
+JETSON_FILES = ("/etc/nv_tegra_release", "/proc/device-tree/compatible")
+CUDA_VERSION_FILES = ("/usr/local/cuda/version.json", "/usr/local/cuda/version.txt")
+
+
+@dataclass
+class HardwareInfo:
+    """Merged result of all hardware probes"""
+    arch: str
+    is_jetson: bool = False
+    gpu_count: int = 0
+    gpu_name: str = "Unknown"
+    gpu_memory_mb: int = 0
+    driver_version: str = "Unknown"
+    compute_cap: str = "Unknown"
+    cuda_version: Optional[str] = None
+    sources: Dict[str, str] = field(default_factory=dict)  # probe -> ok / failed / timeout
+    probe_ms: float = 0.0
+    cached: bool = False
+
+
+# ============================================================================
+# Probes (each runs once, in its own thread)
+# ============================================================================
+
+def _probe_nvml() -> Dict:
+    import pynvml
+    pynvml.nvmlInit()
+    try:
+        count = pynvml.nvmlDeviceGetCount()
+        if count == 0:
+            return {"gpu_count": 0}
+        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        name = pynvml.nvmlDeviceGetName(handle)
+        driver = pynvml.nvmlSystemGetDriverVersion()
+        major, minor = pynvml.nvmlDeviceGetCudaComputeCapability(handle)
+        return {
+            "gpu_count": count,
+            "gpu_name": name.decode("utf-8") if isinstance(name, bytes) else name,
+            "gpu_memory_mb": pynvml.nvmlDeviceGetMemoryInfo(handle).total // (1024 ** 2),
+            "driver_version": driver.decode("utf-8") if isinstance(driver, bytes) else driver,
+            "compute_cap": f"{major}.{minor}",
+        }
+    finally:
+        pynvml.nvmlShutdown()
+
+
+def _probe_nvidia_smi() -> Dict:
+    result = subprocess.run(
+        [
+            "nvidia-smi",
+            "--query-gpu=name,memory.total,driver_version,compute_cap",
+            "--format=csv,noheader,nounits"
+        ],
+        capture_output=True,
+        text=True,
+        timeout=PROBE_TIMEOUT_S
+    )
+    result.check_returncode()
+    lines = result.stdout.strip().splitlines()
+    parts = [p.strip() for p in lines[0].split(",")]
+    return {
+        "gpu_count": len(lines),
+        "gpu_name": parts[0],
+        "gpu_memory_mb": int(parts[1]) if parts[1].isdigit() else 0,  # [N/A] on Jetson
+        "driver_version": parts[2],
+        "compute_cap": parts[3],
+    }
+
+
+def _probe_jetson() -> Dict:
+    if os.path.exists(JETSON_FILES[0]):
+        return {"is_jetson": True}
+    try:
+        with open(JETSON_FILES[1], "rb") as f:
+            content = f.read().decode("utf-8", errors="ignore").lower()
+        return {"is_jetson": "tegra" in content or "jetson" in content}
+    except OSError:
+        return {"is_jetson": False}
+
+
+def _probe_cuda() -> Dict:
+    # The toolkit ships its version as a file; only fork nvcc without one
+    for path in CUDA_VERSION_FILES:
+        try:
+            with open(path) as f:
+                if path.endswith(".json"):
+                    return {"cuda_version": json.load(f)["cuda"]["version"]}
+                return {"cuda_version": f.read().strip()}
+        except (OSError, KeyError, ValueError):
+            continue
+    result = subprocess.run(
+        ["nvcc", "--version"], capture_output=True, text=True, timeout=PROBE_TIMEOUT_S
+    )
+    result.check_returncode()
+    for line in result.stdout.splitlines():
+        if "release" in line.lower():
+            return {"cuda_version": line.strip()}
+    return {}
+
+
+# Later entries win: NVML is preferred over nvidia-smi when both answer
+PROBES: Dict[str, Callable[[], Dict]] = {
+    "nvidia_smi": _probe_nvidia_smi,
+    "nvml": _probe_nvml,
+    "jetson": _probe_jetson,
+    "cuda": _probe_cuda,
+}
+
+
+# ============================================================================
+# Disk cache
+# ============================================================================
+
+def _read_first_line(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return ""
+
+
+def cache_key() -> str:
+    """Boot ID plus driver version; either changing invalidates the cache"""
+    driver = _read_first_line("/proc/driver/nvidia/version") or _read_first_line(JETSON_FILES[0])
+    return f"{_read_first_line('/proc/sys/kernel/random/boot_id')}|{driver}"
+
+
+def _load_cached(key: str) -> Optional[HardwareInfo]:
+    try:
+        with open(CACHE_PATH) as f:
+            data = json.load(f)
+        if data.get("key") != key:
+            return None
+        info = HardwareInfo(**data["info"])
+        info.cached = True
+        return info
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached(key: str, info: HardwareInfo):
+    tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "info": asdict(info)}, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Could not write hardware probe cache {CACHE_PATH}: {e}")
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def _run_probes() -> HardwareInfo:
+    start_time = time.perf_counter()
+    info = HardwareInfo(arch=platform.machine())
+    merged: Dict = {}
+
+    executor = ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix="hw-probe")
+    futures = {name: executor.submit(probe) for name, probe in PROBES.items()}
+    wait(futures.values(), timeout=PROBE_TIMEOUT_S)
+    # Do not block on a hung probe; its thread is abandoned
+    executor.shutdown(wait=False)
+
+    for name, future in futures.items():
+        if not future.done():
+            info.sources[name] = "timeout"
+            continue
+        try:
+            merged.update(future.result())
+            info.sources[name] = "ok"
+        except Exception as e:
+            info.sources[name] = "failed"
+            logger.debug(f"Hardware probe {name} failed: {e}")
+
+    for key, value in merged.items():
+        setattr(info, key, value)
+    info.probe_ms = round((time.perf_counter() - start_time) * 1000, 2)
+    return info
+
+
+@functools.lru_cache(maxsize=1)
+def probe_hardware() -> HardwareInfo:
+    """
+    Hardware facts for this host: from the on-disk cache when the boot ID
+    and driver version match, otherwise by probing. Memoized per process.
+    """
+    key = cache_key()
+    info = _load_cached(key)
+    if info is None:
+        info = _run_probes()
+        # A timed-out probe may answer next time; do not pin the partial result
+        if "timeout" not in info.sources.values():
+            _store_cached(key, info)
+    logger.info(
+        f"Hardware: {info.gpu_name} x{info.gpu_count} ({info.arch}, "
+        f"jetson={info.is_jetson}) {'from cache' if info.cached else f'probed in {info.probe_ms}ms'}"
+    )
+    return info
@@ -6,8 +6,9 @@ vLLM is NOT being used for this project.
 
 Backends:
   1. SimulatedBackend - No GPU, for API testing and CI/CD
-  2. TensorRTLLMBackend - Production backend (TensorRT-LLM)
-  3. OpenAICompatibleBackend - For testing with Triton Inference Server
+  2. VLLMBackend - Dev boxes only
+  3. OpenAICompatibleBackend - For testing with external OpenAI-style APIs
+  4. TritonBackend - Production backend (TensorRT-LLM on Triton, streaming)
 
 Usage:
     # Auto-select based on environment
@@ -18,16 +19,29 @@ Usage:
 """
 
 import asyncio
+import functools
+import importlib.util
+import itertools
+import json
 import os
 import time
 from abc import ABC, abstractmethod
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Dict, Optional, AsyncIterator
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, AsyncIterator
 import logging
 
+from hardware_probe import probe_hardware
+from tokenization import count_tokens
+
 logger = logging.getLogger(__name__)
 
 
+class BackendError(RuntimeError):
+    """Upstream inference service returned an error or could not be reached"""
+
+
 @dataclass
 class InferenceResult:
     """Standardized inference result across all backends"""
@@ -39,6 +53,16 @@ class InferenceResult:
     tokens_per_second: float
     model: str
     backend: str
+    tpot_ms: float = 0.0  # Time per output token after the first (0 if unknown)
+
+
+@dataclass
+class StreamChunk:
+    """Incremental output from InferenceBackend.generate_stream()"""
+    text: str
+    num_tokens: int = 0
+    finished: bool = False
+    result: Optional[InferenceResult] = None  # Set on the final chunk only
 
 
 class InferenceBackend(ABC):
@@ -60,6 +84,28 @@ class InferenceBackend(ABC):
         """Generate text from prompt"""
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream generated text as it is produced.
+
+        Backends without native streaming emit a single chunk. The last
+        chunk always has finished=True and carries the full InferenceResult.
+        Consumers that may stop early should wrap the iterator in
+        contextlib.aclosing() so the backend can cancel the request.
+        """
+        result = await self.generate(prompt, max_tokens, temperature)
+        yield StreamChunk(
+            text=result.text,
+            num_tokens=result.output_tokens,
+            finished=True,
+            result=result
+        )
+
     @abstractmethod
     async def health_check(self) -> Dict:
         """Check backend health"""
@@ -121,7 +167,7 @@ class SimulatedBackend(InferenceBackend):
         ttft_ms = (ttft_time - start_time) * 1000
 
         # Simulate token generation
-        input_tokens = len(prompt.split())
+        input_tokens = count_tokens(prompt)
         output_tokens = min(max_tokens, input_tokens + 50)
         await asyncio.sleep((output_tokens * self._token_latency_ms) / 1000)
 
@@ -167,6 +213,17 @@ class VLLMBackend(InferenceBackend):
     """
     vLLM backend for real GPU inference.
 
+    Two engine modes:
+      - offline (default): synchronous vllm.LLM, run in an executor.
+        Cannot stream, so TTFT is approximated.
+      - async_engine: vllm.AsyncLLMEngine with in-flight batching.
+        Streams tokens per request, supports cancellation and reports
+        real TTFT/TPOT.
+
+    Tests can pass engine= with any object exposing the AsyncLLMEngine
+    generate(prompt, sampling_params, request_id) / abort(request_id)
+    interface; this implies async_engine mode and skips model loading.
+
     Requirements:
       - NVIDIA GPU with sufficient VRAM
       - vllm package installed
@@ -183,18 +240,27 @@ class VLLMBackend(InferenceBackend):
         model_name: str = "TinyLlama/TinyLlama-1.1B-Chat-v1.0",
         tensor_parallel_size: int = 1,
         gpu_memory_utilization: float = 0.85,
-        max_model_len: int = 4096
+        max_model_len: int = 4096,
+        async_engine: bool = False,
+        engine: Optional[Any] = None
     ):
         self.model_name = model_name
         self.tensor_parallel_size = tensor_parallel_size
         self.gpu_memory_utilization = gpu_memory_utilization
         self.max_model_len = max_model_len
+        self.async_engine = async_engine or engine is not None
         self._llm = None
+        self._engine = engine
+        self._request_ids = itertools.count()
         self._loaded = False
 
     async def load_model(self) -> None:
         logger.info(f"Loading vLLM model: {self.model_name}")
 
+        if self.async_engine:
+            await self._load_async_engine()
+            return
+
         try:
             from vllm import LLM, SamplingParams
             self._SamplingParams = SamplingParams
@@ -220,6 +286,119 @@ class VLLMBackend(InferenceBackend):
             logger.error(f"Failed to load vLLM model: {e}")
             raise
 
+    async def _load_async_engine(self) -> None:
+        """Start AsyncLLMEngine (or adopt an injected engine)"""
+        try:
+            from vllm import SamplingParams
+            self._SamplingParams = SamplingParams
+        except ImportError:
+            if self._engine is None:
+                raise RuntimeError("vLLM not installed. Run: pip install vllm")
+            # Injected (fake) engine without vllm installed
+            self._SamplingParams = SimpleNamespace
+
+        if self._engine is None:
+            try:
+                from vllm import AsyncEngineArgs, AsyncLLMEngine
+                engine_args = AsyncEngineArgs(
+                    model=self.model_name,
+                    tensor_parallel_size=self.tensor_parallel_size,
+                    gpu_memory_utilization=self.gpu_memory_utilization,
+                    max_model_len=self.max_model_len,
+                    trust_remote_code=True
+                )
+                self._engine = AsyncLLMEngine.from_engine_args(engine_args)
+            except Exception as e:
+                logger.error(f"Failed to start vLLM async engine: {e}")
+                raise
+
+        self._loaded = True
+        logger.info(f"vLLM async engine ready: {self.model_name}")
+
+    async def _stream_outputs(self, prompt: str, sampling_params) -> AsyncIterator[Any]:
+        """
+        Yield cumulative RequestOutputs for one request. The request is
+        aborted in the engine if the consumer stops early (cancellation).
+        """
+        request_id = f"forge-{next(self._request_ids)}"
+        finished = False
+        try:
+            async for output in self._engine.generate(prompt, sampling_params, request_id):
+                finished = output.finished
+                yield output
+        finally:
+            if not finished:
+                await self._engine.abort(request_id)
+                logger.debug(f"Aborted vLLM request {request_id}")
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7
+    ) -> AsyncIterator[StreamChunk]:
+        if not self.async_engine:
+            async for chunk in super().generate_stream(prompt, max_tokens, temperature):
+                yield chunk
+            return
+
+        if not self._loaded or self._engine is None:
+            raise RuntimeError("Model not loaded")
+
+        start_time = time.perf_counter()
+        first_token_time = None
+        sent_chars = 0
+        sent_tokens = 0
+        input_tokens = 0
+
+        sampling_params = self._SamplingParams(
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+
+        async with aclosing(self._stream_outputs(prompt, sampling_params)) as outputs:
+            async for output in outputs:
+                completion = output.outputs[0]
+                input_tokens = len(output.prompt_token_ids or [])
+                num_tokens = len(completion.token_ids)
+                if num_tokens > sent_tokens:
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter()
+                    yield StreamChunk(
+                        text=completion.text[sent_chars:],
+                        num_tokens=num_tokens - sent_tokens
+                    )
+                    sent_chars = len(completion.text)
+                    sent_tokens = num_tokens
+                    text = completion.text
+
+        end_time = time.perf_counter()
+        if first_token_time is None:
+            first_token_time = end_time
+            text = ""
+
+        total_latency_ms = (end_time - start_time) * 1000
+        ttft_ms = (first_token_time - start_time) * 1000
+        decode_time = end_time - first_token_time
+        tpot_ms = (decode_time * 1000) / (sent_tokens - 1) if sent_tokens > 1 else 0.0
+        tps = sent_tokens / decode_time if decode_time > 0 else 0
+
+        yield StreamChunk(
+            text="",
+            finished=True,
+            result=InferenceResult(
+                text=text,
+                input_tokens=input_tokens,
+                output_tokens=sent_tokens,
+                ttft_ms=round(ttft_ms, 2),
+                total_latency_ms=round(total_latency_ms, 2),
+                tokens_per_second=round(tps, 2),
+                model=self.model_name,
+                backend="vllm",
+                tpot_ms=round(tpot_ms, 2)
+            )
+        )
+
     async def generate(
         self,
         prompt: str,
@@ -227,6 +406,14 @@ class VLLMBackend(InferenceBackend):
         temperature: float = 0.7,
         stream: bool = False
     ) -> InferenceResult:
+        if self.async_engine:
+            result = None
+            async with aclosing(self.generate_stream(prompt, max_tokens, temperature)) as chunks:
+                async for chunk in chunks:
+                    if chunk.finished:
+                        result = chunk.result
+            return result
+
         if not self._loaded or self._llm is None:
             raise RuntimeError("Model not loaded")
 
@@ -256,6 +443,7 @@ class VLLMBackend(InferenceBackend):
 
         # Estimate TTFT (vLLM doesn't expose this directly in sync mode)
         # Approximate as latency / output_tokens * 1 token
+        # Use async_engine=True for measured TTFT/TPOT
         ttft_ms = total_latency_ms / output_tokens if output_tokens > 0 else total_latency_ms
 
         tps = output_tokens / (total_latency_ms / 1000) if total_latency_ms > 0 else 0
@@ -276,6 +464,7 @@ class VLLMBackend(InferenceBackend):
             "backend": "vllm",
             "status": "healthy" if self._loaded else "not_loaded",
             "model": self.model_name,
+            "engine_mode": "async_engine" if self.async_engine else "offline",
             "tensor_parallel_size": self.tensor_parallel_size,
             "gpu_memory_utilization": self.gpu_memory_utilization
         }
@@ -319,22 +508,26 @@ class OpenAICompatibleBackend(InferenceBackend):
 
     async def load_model(self) -> None:
         import aiohttp
-        self._session = aiohttp.ClientSession(
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.api_key}"}
+            )
 
-        # Test connection
+        # Test connection; only a verified API counts as loaded so the
+        # pool's health probing can retry instead of routing into failures
         try:
             async with self._session.get(f"{self.base_url}/models") as resp:
-                if resp.status == 200:
-                    self._loaded = True
-                    logger.info(f"Connected to OpenAI-compatible API: {self.base_url}")
-                else:
-                    logger.warning(f"API returned status {resp.status}")
-                    self._loaded = True  # Still mark as loaded, might work
+                if resp.status != 200:
+                    raise BackendError(f"API returned status {resp.status}")
+        except BackendError:
+            self._loaded = False
+            raise
         except Exception as e:
-            logger.warning(f"Could not verify API connection: {e}")
-            self._loaded = True  # Optimistically mark as loaded
+            self._loaded = False
+            raise BackendError(f"Could not verify API connection: {e}") from e
+
+        self._loaded = True
+        logger.info(f"Connected to OpenAI-compatible API: {self.base_url}")
 
     async def generate(
         self,
@@ -362,7 +555,7 @@ class OpenAICompatibleBackend(InferenceBackend):
         ) as resp:
             if resp.status != 200:
                 error = await resp.text()
-                raise RuntimeError(f"API error: {error}")
+                raise BackendError(f"API error: {error}")
 
             data = await resp.json()
 
@@ -372,8 +565,8 @@ class OpenAICompatibleBackend(InferenceBackend):
         message = data["choices"][0]["message"]["content"]
         usage = data.get("usage", {})
 
-        input_tokens = usage.get("prompt_tokens", len(prompt.split()))
-        output_tokens = usage.get("completion_tokens", len(message.split()))
+        input_tokens = usage.get("prompt_tokens") or count_tokens(prompt)
+        output_tokens = usage.get("completion_tokens") or count_tokens(message)
         total_latency_ms = (end_time - start_time) * 1000
 
         # Estimate TTFT
@@ -413,10 +606,226 @@ class OpenAICompatibleBackend(InferenceBackend):
             await self._session.close()
 
 
+# =============================================================================
+# Backend 4: Triton Inference Server + TensorRT-LLM (production)
+# =============================================================================
+
+class TritonBackend(InferenceBackend):
+    """
+    TensorRT-LLM served by Triton Inference Server.
+
+    Uses the streaming generate extension
+    (POST /v2/models/{model}/generate_stream, server-sent events) so TTFT is
+    measured from the first token event rather than estimated. A single
+    pooled aiohttp session (keep-alive connections) is shared by all requests.
+    """
+
+    def __init__(
+        self,
+        url: str = "http://triton-inference-server:8000",
+        model_name: str = "tensorrt_llm",
+        pool_size: int = 32,
+        request_timeout_s: float = 120.0
+    ):
+        self.url = url.rstrip('/')
+        self.model_name = model_name
+        self.pool_size = pool_size
+        self.request_timeout_s = request_timeout_s
+        self._session = None
+        self._loaded = False
+
+    async def load_model(self) -> None:
+        import aiohttp
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout_s)
+            )
+
+        # Triton loads the engine itself; we only wait for it to be ready
+        ready_url = f"{self.url}/v2/models/{self.model_name}/ready"
+        try:
+            async with self._session.get(ready_url) as resp:
+                if resp.status != 200:
+                    raise BackendError(f"Triton model not ready (HTTP {resp.status})")
+        except BackendError:
+            raise
+        except Exception as e:
+            raise BackendError(f"Could not reach Triton at {self.url}: {e}") from e
+
+        self._loaded = True
+        logger.info(f"Connected to Triton: {self.url} (model: {self.model_name})")
+
+    async def _token_events(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncIterator[Dict]:
+        """POST to generate_stream and yield each decoded SSE event"""
+        payload = {
+            "text_input": prompt,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+        url = f"{self.url}/v2/models/{self.model_name}/generate_stream"
+
+        try:
+            async with self._session.post(url, json=payload) as resp:
+                if resp.status != 200:
+                    error = await resp.text()
+                    raise BackendError(f"Triton error (HTTP {resp.status}): {error}")
+
+                async for raw_line in resp.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[len("data:"):])
+                    if "error" in event:
+                        raise BackendError(f"Triton error: {event['error']}")
+                    yield event
+        except BackendError:
+            raise
+        except Exception as e:
+            raise BackendError(f"Triton request failed: {e}") from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7
+    ) -> AsyncIterator[StreamChunk]:
+        if not self._loaded or self._session is None:
+            raise RuntimeError("Backend not initialized")
+
+        start_time = time.perf_counter()
+        first_token_time = None
+        output_tokens = 0
+        pieces = []
+
+        async with aclosing(self._token_events(prompt, max_tokens, temperature)) as events:
+            async for event in events:
+                text = event.get("text_output", "")
+                if not text:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.perf_counter()
+                # TensorRT-LLM emits one event per streaming_interval tokens (1 by default)
+                output_tokens += 1
+                pieces.append(text)
+                yield StreamChunk(text=text, num_tokens=1)
+
+        end_time = time.perf_counter()
+        if first_token_time is None:
+            first_token_time = end_time
+
+        total_latency_ms = (end_time - start_time) * 1000
+        ttft_ms = (first_token_time - start_time) * 1000
+        decode_time = end_time - first_token_time
+        tpot_ms = (decode_time * 1000) / (output_tokens - 1) if output_tokens > 1 else 0.0
+        tps = output_tokens / decode_time if decode_time > 0 else 0
+
+        yield StreamChunk(
+            text="",
+            finished=True,
+            result=InferenceResult(
+                text="".join(pieces),
+                input_tokens=count_tokens(prompt),
+                output_tokens=output_tokens,
+                ttft_ms=round(ttft_ms, 2),
+                total_latency_ms=round(total_latency_ms, 2),
+                tokens_per_second=round(tps, 2),
+                model=self.model_name,
+                backend="triton",
+                tpot_ms=round(tpot_ms, 2)
+            )
+        )
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        stream: bool = False
+    ) -> InferenceResult:
+        result = None
+        async with aclosing(self.generate_stream(prompt, max_tokens, temperature)) as chunks:
+            async for chunk in chunks:
+                if chunk.finished:
+                    result = chunk.result
+        return result
+
+    async def health_check(self) -> Dict:
+        status = "not_loaded"
+        if self._session is not None:
+            try:
+                async with self._session.get(
+                    f"{self.url}/v2/models/{self.model_name}/ready"
+                ) as resp:
+                    status = "healthy" if resp.status == 200 else "unhealthy"
+            except Exception:
+                status = "unreachable"
+        return {
+            "backend": "triton",
+            "status": status,
+            "url": self.url,
+            "model": self.model_name
+        }
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def backend_name(self) -> str:
+        return "triton"
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
 # =============================================================================
 # Backend Factory
 # =============================================================================
 
+def _gpu_present() -> bool:
+    """
+    GPU check from the shared hardware probe (memoized, and cached on disk
+    per boot), which SKU detection has usually run already. Avoids importing
+    torch just to call torch.cuda.is_available().
+    """
+    info = probe_hardware()
+    return info.gpu_count > 0 or info.is_jetson
+
+
+@functools.lru_cache(maxsize=1)
+def detect_backend_type() -> str:
+    """
+    Pick the best available backend without importing torch or vllm
+    (seconds of import time and hundreds of MB of RSS). Cached per process.
+    """
+    start_time = time.perf_counter()
+    gpu = _gpu_present()
+    if gpu and importlib.util.find_spec("vllm") is not None:
+        backend_type, reason = "vllm", "GPU available"
+    elif gpu:
+        backend_type, reason = "simulated", "vLLM not installed"
+    else:
+        backend_type, reason = "simulated", "no GPU"
+    logger.info(
+        f"Auto-selected {backend_type} backend ({reason}); "
+        f"probe took {(time.perf_counter() - start_time) * 1000:.1f}ms"
+    )
+    return backend_type
+
+
 def create_inference_backend(
     backend_type: Optional[str] = None,
     **kwargs
@@ -425,7 +834,8 @@ def create_inference_backend(
     Factory function to create inference backend.
 
     Args:
-        backend_type: One of "simulated", "vllm", "openai_compatible"
+        backend_type: One of "simulated", "vllm", "openai_compatible",
+                     "triton" (alias "tensorrt")
                      If None, auto-selects based on environment
         **kwargs: Backend-specific configuration
 
@@ -438,23 +848,17 @@ def create_inference_backend(
         backend_type = os.environ.get("FORGE_INFERENCE_BACKEND", "auto")
 
     if backend_type == "auto":
-        # Try to detect best available backend
-        try:
-            import torch
-            if torch.cuda.is_available():
-                try:
-                    import vllm
-                    backend_type = "vllm"
-                    logger.info("Auto-selected vLLM backend (GPU available)")
-                except ImportError:
-                    backend_type = "simulated"
-                    logger.info("Auto-selected simulated backend (vLLM not installed)")
-            else:
-                backend_type = "simulated"
-                logger.info("Auto-selected simulated backend (no GPU)")
-        except ImportError:
-            backend_type = "simulated"
-            logger.info("Auto-selected simulated backend (torch not available)")
+        backend_type = detect_backend_type()
+
+    # One local replica per GPU (backend_pool replicas_per_gpu). Nothing here
+    # can pin an in-process engine or a remote server to a device yet, so
+    # refuse rather than loading every replica onto the same GPU.
+    gpu_id = kwargs.pop("gpu_id", None)
+    if gpu_id and backend_type != "simulated":
+        raise ValueError(
+            f"{backend_type} backend cannot be pinned to GPU {gpu_id}; "
+            f"run one server per GPU and list them under backend.remote_replicas"
+        )
 
     # Create backend
     if backend_type == "simulated":
@@ -467,7 +871,12 @@ def create_inference_backend(
             model_name=kwargs.get("model_name", "TinyLlama/TinyLlama-1.1B-Chat-v1.0"),
             tensor_parallel_size=kwargs.get("tensor_parallel_size", 1),
             gpu_memory_utilization=kwargs.get("gpu_memory_utilization", 0.85),
-            max_model_len=kwargs.get("max_model_len", 4096)
+            max_model_len=kwargs.get("max_model_len", 4096),
+            async_engine=kwargs.get(
+                "async_engine",
+                os.environ.get("FORGE_VLLM_ASYNC_ENGINE", "true").lower() == "true"
+            ),
+            engine=kwargs.get("engine")
         )
 
     elif backend_type == "openai_compatible":
@@ -477,6 +886,14 @@ def create_inference_backend(
             model_name=kwargs.get("model_name", "default")
         )
 
+    elif backend_type in ("triton", "tensorrt"):
+        return TritonBackend(
+            url=kwargs.get("url", os.environ.get("FORGE_TRITON_URL", "http://triton-inference-server:8000")),
+            model_name=kwargs.get("model_name", os.environ.get("FORGE_TRITON_MODEL", "tensorrt_llm")),
+            pool_size=kwargs.get("pool_size", 32),
+            request_timeout_s=kwargs.get("request_timeout_s", 120.0)
+        )
+
     else:
         raise ValueError(f"Unknown backend type: {backend_type}")
 
@@ -0,0 +1,114 @@
+"""
+Honeywell Forge Cognition - Event-Loop Lag Monitor
+
+Every synchronous call on the asyncio loop (GPUMonitor.get_gpu_stats(),
+YAML loading, generate_latest(), ...) delays every in-flight request. This
+monitor schedules a sleep every interval and records how late it wakes up
+as forge_event_loop_lag_seconds, which is that delay.
+
+In debug mode a watchdog thread also notices when the loop has not ticked
+for longer than block_threshold_ms and captures the loop thread's stack
+while it is still blocked, so the offending callback is named directly.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Optional
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = Histogram(
+    'forge_event_loop_lag_seconds',
+    'Event-loop scheduling lag (how late a timer callback ran) in seconds',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+LOOP_BLOCKED = Counter(
+    'forge_event_loop_blocked_total',
+    'Times the event loop was blocked longer than the debug threshold'
+)
+
+
+class LoopLagMonitor:
+    """Measures loop lag continuously; captures blocking stacks in debug mode"""
+
+    def __init__(
+        self,
+        interval_s: float = 0.1,
+        debug: bool = False,
+        block_threshold_ms: float = 100.0,
+        max_captures: int = 20
+    ):
+        self.interval_s = interval_s
+        self.debug = debug
+        self.block_threshold_ms = block_threshold_ms
+        self.captures: deque = deque(maxlen=max_captures)
+        self.max_lag_ms = 0.0
+        self._last_tick = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+        if self.debug:
+            self._watchdog = threading.Thread(target=self._watch, name="forge-loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            now = time.perf_counter()
+            lag_s = max(0.0, now - expected)
+            self._last_tick = now
+            self.max_lag_ms = max(self.max_lag_ms, lag_s * 1000)
+            LOOP_LAG.observe(lag_s)
+
+    def _watch(self):
+        """Watchdog thread: snapshot the loop's stack while it is blocked"""
+        captured_tick = None
+        poll_s = min(self.interval_s, self.block_threshold_ms / 1000) / 2
+        while not self._stop.wait(poll_s):
+            last_tick = self._last_tick
+            blocked_ms = (time.perf_counter() - last_tick - self.interval_s) * 1000
+            if blocked_ms < self.block_threshold_ms or captured_tick == last_tick:
+                continue
+            # One capture per stall
+            captured_tick = last_tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            LOOP_BLOCKED.inc()
+            self.captures.append({
+                "timestamp": time.time(),
+                "blocked_ms": round(blocked_ms, 1),
+                "stack": stack,
+            })
+            logger.warning(f"Event loop blocked for {blocked_ms:.0f}ms+ in:\n{stack}")
+
+    def stats(self) -> Dict:
+        return {
+            "interval_ms": self.interval_s * 1000,
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "debug": self.debug,
+            "block_threshold_ms": self.block_threshold_ms,
+            "blocked": list(self.captures),
+        }
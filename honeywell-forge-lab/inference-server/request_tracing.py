@@ -0,0 +1,111 @@
+"""
+Honeywell Forge Cognition - Request Phase Tracing
+
+Splits each /v1/chat request into phases so a P99 regression can be pinned
+on the phase that moved:
+
+  parse       body read + pydantic validation (middleware -> handler)
+  session     session lookup / creation
+  tokenize    prompt assembly and token counting (tokenization.py)
+  queue       waiting for the model (pre-ready queue, backend queueing)
+  prefill     time to first token
+  decode      remaining token generation
+  postprocess metrics, session stats, history update
+  serialize   response construction and JSON encoding, up to the middleware
+
+Phases are exported as a `Server-Timing` header, a per-phase Prometheus
+histogram and the slowest N of the most recent requests (/v1/debug/slow).
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from prometheus_client import Histogram
+
+PHASES = ("parse", "session", "tokenize", "queue", "prefill", "decode", "postprocess", "serialize")
+
+PHASE_LATENCY = Histogram(
+    'forge_request_phase_seconds',
+    'Per-phase latency of /v1/chat requests in seconds',
+    ['phase'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+_PHASE_CHILDREN = {phase: PHASE_LATENCY.labels(phase=phase) for phase in PHASES}
+
+
+class RequestTrace:
+    """Phase durations (ms) of one request, recorded as consecutive marks"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.phases: Dict[str, float] = {}
+        self.meta: Dict = {}
+
+    def mark(self, phase: str):
+        """Attribute the time since the previous mark to `phase`"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def add(self, phase: str, duration_ms: float):
+        """Attribute a duration measured elsewhere (e.g. backend TTFT)"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, duration_ms)
+
+    def skip(self):
+        """Move the cursor without attributing time (already added via add())"""
+        self._last = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.start) * 1000
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, shown per request in browser devtools"""
+        entries = [f"{phase};dur={ms:.2f}" for phase, ms in self.phases.items()]
+        entries.append(f"total;dur={self.total_ms:.2f}")
+        return ", ".join(entries)
+
+    def observe(self):
+        for phase, ms in self.phases.items():
+            _PHASE_CHILDREN[phase].observe(ms / 1000)
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": time.time() - (time.perf_counter() - self.start),
+            "total_ms": round(self.total_ms, 2),
+            "phases_ms": {phase: round(ms, 2) for phase, ms in self.phases.items()},
+            **self.meta,
+        }
+
+
+class SlowRequestLog:
+    """
+    The N slowest of the last `window` traces. A ring of recent requests
+    rather than an all-time top N, so start-up outliers age out and the log
+    shows what is slow now.
+    """
+
+    def __init__(self, size: int = 50, window: int = 1000):
+        self.size = size
+        self.window = window
+        self._recent: Deque[RequestTrace] = deque(maxlen=max(window, 0))
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def record(self, trace: RequestTrace):
+        if self.size <= 0 or self.window <= 0:
+            return
+        self._recent.append(trace)
+
+    def slowest(self, limit: Optional[int] = None) -> List[Dict]:
+        count = self.size if limit is None else min(limit, self.size)
+        entries = heapq.nlargest(count, self._recent, key=lambda t: t.total_ms)
+        return [trace.to_dict() for trace in entries]
+
+    def clear(self):
+        self._recent.clear()
@@ -0,0 +1,148 @@
+"""
+Honeywell Forge Cognition - In-Process Sampling Profiler
+
+Statistical profiler for locked-down edge boxes (no SSH, no py-spy): a
+background thread snapshots every thread's Python stack via
+sys._current_frames() at a fixed rate and aggregates them as collapsed
+stacks ("frame;frame;frame count"), which flamegraph.pl, speedscope and
+Grafana's flame graph panel read directly.
+
+The event-loop thread gets a second view: consecutive samples in which the
+loop is not idle in select() are merged into busy runs, and runs longer than
+a threshold are reported as blocking episodes with their dominant stack.
+Sampling cannot see native frames, so time inside C calls (NVML, pydantic
+core) is attributed to the Python frame that made the call.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames that mean the event loop is waiting for I/O, not working
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "_run_once", "run_forever", "run_until_complete"}
+_IDLE_FILES = ("selectors.py", "base_events.py", "runners.py")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _collapse(frame) -> List[str]:
+    """Frame labels root-first"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _loop_idle(frame) -> bool:
+    code = frame.f_code
+    return code.co_name in _IDLE_FUNCTIONS and code.co_filename.endswith(_IDLE_FILES)
+
+
+class SamplingProfiler:
+    """Samples all thread stacks from a daemon thread until stopped"""
+
+    def __init__(
+        self,
+        interval_s: float = 0.01,
+        loop_thread_id: Optional[int] = None,
+        blocking_threshold_ms: float = 50.0
+    ):
+        self.interval_s = interval_s
+        self.loop_thread_id = loop_thread_id
+        self.blocking_threshold_ms = blocking_threshold_ms
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.loop_busy_samples = 0
+        self.blocking: List[Dict] = []
+        self._busy_run: Counter = Counter()
+        self._busy_run_start = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="forge-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._stopped_at = time.perf_counter()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            sample_time = time.perf_counter()
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = ";".join([names.get(thread_id, str(thread_id))] + _collapse(frame))
+                self.stacks[stack] += 1
+                if thread_id == self.loop_thread_id:
+                    self._sample_loop(frame, stack, sample_time)
+            self.samples += 1
+            del frames
+            self._stop.wait(max(0.0, self.interval_s - (time.perf_counter() - sample_time)))
+        self._end_busy_run(time.perf_counter())
+
+    def _sample_loop(self, frame, stack: str, sample_time: float):
+        if _loop_idle(frame):
+            self._end_busy_run(sample_time)
+            return
+        self.loop_busy_samples += 1
+        if not self._busy_run:
+            self._busy_run_start = sample_time
+        self._busy_run[stack] += 1
+
+    def _end_busy_run(self, now: float):
+        if not self._busy_run:
+            return
+        duration_ms = (now - self._busy_run_start) * 1000
+        if duration_ms >= self.blocking_threshold_ms:
+            stack, count = self._busy_run.most_common(1)[0]
+            self.blocking.append({
+                "duration_ms": round(duration_ms, 1),
+                "samples": sum(self._busy_run.values()),
+                "stack": stack,
+                "stack_samples": count,
+            })
+        self._busy_run = Counter()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one "frame;frame count" line per unique stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def report(self, top: int = 20) -> Dict:
+        duration_s = (self._stopped_at or time.perf_counter()) - self._started_at
+        return {
+            "duration_s": round(duration_s, 3),
+            "interval_ms": self.interval_s * 1000,
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "event_loop": {
+                "busy_percent": round(100 * self.loop_busy_samples / max(self.samples, 1), 1),
+                "blocking_threshold_ms": self.blocking_threshold_ms,
+                "blocking_episodes": sorted(
+                    self.blocking, key=lambda b: b["duration_ms"], reverse=True
+                )[:top],
+            },
+            "collapsed": self.collapsed().splitlines(),
+        }
@@ -11,27 +11,76 @@ Key Features:
 - Real-time latency tracking
 - GPU memory monitoring with SKU-specific thresholds
 - Prometheus metrics export
+
+Importing this module does not load config, touch NVML or build the
+inference engine; init_runtime() does that from the app lifespan. Its one
+side effect: when PROMETHEUS_MULTIPROC_DIR is set, the directory is created,
+because prometheus_client opens its per-process files as the module-level
+metrics are defined.
+Run with `uvicorn server:app` or `uvicorn --factory server:create_app`.
 """
 
+import time
+_IMPORT_START = time.perf_counter()  # Startup breakdown: module import
+
 import asyncio
+import gzip
+import hmac
+import json
 import os
 import platform
-import time
+import signal
+import sys
+import threading
 import uuid
-from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
 
 import yaml
 import numpy as np
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, FastAPI, Header, HTTPException, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 import pynvml
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+
+# Multi-worker mode: prometheus_client opens its per-process files at import
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, Gauge, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+)
 from starlette.responses import Response
 
+from hardware_probe import probe_hardware
+from inference_backends import BackendError, create_inference_backend
+from backend_pool import BackendPool, HedgePolicy, NoReplicaAvailableError, Replica
+from warmup import WarmupConfig, run_warmup
+from request_tracing import RequestTrace, SlowRequestLog
+from sampling_profiler import SamplingProfiler
+from loop_monitor import LoopLagMonitor
+from slo_tracker import GoodputTracker, SLOObjective, SLOTracker
+from conversation import ASSISTANT, ROLE_OVERHEAD_TOKENS, USER, ConversationConfig, ConversationHistory
+import tokenization
+from tokenization import TokenizerConfig, count_tokens
+from degradation import DegradationConfig, DegradationController
+from session_store import (
+    RestoredSession, SessionStore, SessionStoreConfig, close_record, message_record, replay, session_record
+)
+from engine_ipc import EngineClient, EngineIPCServer, EngineUnavailableError
+
+try:
+    import orjson  # Optional: faster JSON encoding on the /v1/chat response path
+except ImportError:
+    orjson = None
+
+if __name__ in ("__main__", "__mp_main__"):
+    # `python server.py` (or a spawned worker re-running it): alias the module
+    # so uvicorn's "server:app" import does not register every metric twice
+    sys.modules["server"] = sys.modules[__name__]
+
 # ============================================================================
 # SKU Detection and Configuration
 # ============================================================================
@@ -84,35 +133,44 @@ class ServerConfig:
     quantization: str = "FP16"
     # TensorRT-LLM settings
     tensorrt_llm: TensorRTLLMConfig = field(default_factory=TensorRTLLMConfig)
+    # Inference backend pool
+    backend_type: str = "builtin"
+    replicas_per_gpu: bool = False
+    remote_replicas: List[Dict] = field(default_factory=list)
+    hedging: Dict = field(default_factory=dict)
+    # Warm-up before readiness (see warmup.WarmupConfig)
+    warmup: Dict = field(default_factory=dict)
+    # Requests held while the model loads (0 disables: 503 until loaded)
+    pre_ready_max_depth: int = 10
+    pre_ready_timeout_s: float = 60.0
+    # Server-side history and context budget (see conversation.ConversationConfig)
+    conversation: Dict = field(default_factory=dict)
+    # Tokenizer and token count cache (see tokenization.TokenizerConfig)
+    tokenizer: Dict = field(default_factory=dict)
+    # Session snapshots across restarts (see session_store.SessionStoreConfig)
+    session_store: Dict = field(default_factory=dict)
+    # Output-length clamping under load (see degradation.DegradationConfig)
+    degradation: Dict = field(default_factory=dict)
 
 def detect_sku() -> str:
     """
     Detect which SKU we're running on based on:
     1. Architecture (ARM64 = Jetson, x86_64 = RTX)
     2. GPU name pattern matching
+    Hardware facts come from the shared, cached hardware_probe module.
     """
-    arch = platform.machine()
+    hw = probe_hardware()
 
     # Check architecture first
-    if arch in ("aarch64", "arm64"):
+    if hw.arch in ("aarch64", "arm64") or hw.is_jetson:
         return "jetson_thor"
-    elif arch in ("x86_64", "AMD64"):
+    elif hw.arch in ("x86_64", "AMD64"):
         # Could be RTX 4000 Pro or dev machine - check GPU
-        try:
-            pynvml.nvmlInit()
-            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            gpu_name = pynvml.nvmlDeviceGetName(handle)
-            if isinstance(gpu_name, bytes):
-                gpu_name = gpu_name.decode('utf-8')
-            pynvml.nvmlShutdown()
-
-            if "RTX 4000" in gpu_name or "AD104" in gpu_name:
-                return "rtx_4000_pro"
-            elif "Tesla P40" in gpu_name or "P40" in gpu_name:
-                return "tesla_p40"
-            else:
-                return "generic"
-        except Exception:
+        if "RTX 4000" in hw.gpu_name or "AD104" in hw.gpu_name:
+            return "rtx_4000_pro"
+        elif "Tesla P40" in hw.gpu_name or "P40" in hw.gpu_name:
+            return "tesla_p40"
+        else:
             return "generic"
     else:
         return "generic"
@@ -126,7 +184,34 @@ def load_sku_profiles(path: str = "sku_profiles.yaml") -> Dict:
         print(f"Warning: SKU profiles not found at {path}")
         return {}
 
-def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_profiles.yaml") -> ServerConfig:
+def find_sku_profile(profiles: Dict, sku_name: str) -> Dict:
+    """Profile for a SKU name, by key or by a profile's `aliases`, else generic"""
+    if sku_name in profiles:
+        return profiles[sku_name]
+    for profile in profiles.values():
+        if isinstance(profile, dict) and sku_name in (profile.get("aliases") or []):
+            return profile
+    return profiles.get("generic", {})
+
+def resolve_sku_name() -> str:
+    """SKU from FORGE_SKU, else auto-detection (NVML), else generic"""
+    auto_detect = os.environ.get("FORGE_SKU_AUTO_DETECT", "true").lower() == "true"
+    sku_override = os.environ.get("FORGE_SKU")
+
+    if sku_override:
+        print(f"SKU override: {sku_override}")
+        return sku_override
+    elif auto_detect:
+        sku_name = detect_sku()
+        print(f"Auto-detected SKU: {sku_name}")
+        return sku_name
+    return "generic"
+
+def load_config(
+    config_path: str = "config.yaml",
+    profiles_path: str = "sku_profiles.yaml",
+    sku_name: Optional[str] = None
+) -> ServerConfig:
     """
     Load configuration with SKU auto-detection.
     SKU-specific settings override base config.
@@ -139,22 +224,13 @@ def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_prof
     except FileNotFoundError:
         pass
 
-    # Detect SKU
-    auto_detect = os.environ.get("FORGE_SKU_AUTO_DETECT", "true").lower() == "true"
-    sku_override = os.environ.get("FORGE_SKU")
-
-    if sku_override:
-        sku_name = sku_override
-        print(f"SKU override: {sku_name}")
-    elif auto_detect:
-        sku_name = detect_sku()
-        print(f"Auto-detected SKU: {sku_name}")
-    else:
-        sku_name = "generic"
+    # Detect SKU (callers that already probed NVML pass it in)
+    if sku_name is None:
+        sku_name = resolve_sku_name()
 
     # Load SKU profiles and apply
     profiles = load_sku_profiles(profiles_path)
-    sku_profile = profiles.get(sku_name, profiles.get("generic", {}))
+    sku_profile = find_sku_profile(profiles, sku_name)
 
     # Merge: base config < SKU defaults < environment overrides
     config_dict = {
@@ -165,6 +241,21 @@ def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_prof
         "sku_description": sku_profile.get("description", ""),
     }
 
+    # Backend pool (FORGE_INFERENCE_BACKEND overrides the type)
+    backend = base_config.get("backend", {})
+    config_dict["backend_type"] = os.environ.get(
+        "FORGE_INFERENCE_BACKEND", backend.get("type", "builtin")
+    )
+    config_dict["replicas_per_gpu"] = backend.get("replicas_per_gpu", False)
+    config_dict["remote_replicas"] = backend.get("remote_replicas", []) or []
+    config_dict["hedging"] = backend.get("hedging", {}) or {}
+    config_dict["warmup"] = base_config.get("warmup", {}) or {}
+    config_dict["conversation"] = base_config.get("conversation", {}) or {}
+    config_dict["tokenizer"] = base_config.get("tokenizer", {}) or {}
+    config_dict["session_store"] = dict(base_config.get("session_store", {}) or {})
+    if "FORGE_SESSION_STORE" in os.environ:
+        config_dict["session_store"]["path"] = os.environ["FORGE_SESSION_STORE"]
+
     # Apply SKU-specific inference settings
     inference = sku_profile.get("inference", {})
     config_dict["max_concurrent_sessions"] = inference.get(
@@ -173,6 +264,12 @@ def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_prof
     )
     config_dict["quantization"] = inference.get("quantization", "FP16")
 
+    # Degradation policy: SKU settings override config.yaml
+    config_dict["degradation"] = {
+        **(base_config.get("degradation", {}) or {}),
+        **(sku_profile.get("degradation", {}) or {}),
+    }
+
     # Apply SKU-specific thresholds
     thresholds = sku_profile.get("thresholds", {})
     config_dict["gpu_memory_threshold"] = thresholds.get(
@@ -183,6 +280,11 @@ def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_prof
     config_dict["target_tps"] = thresholds.get("target_tps", 50.0)
     config_dict["max_queue_depth"] = thresholds.get("max_queue_depth", 10)
 
+    # Pre-ready queue defaults to the SKU queue depth
+    pre_ready = base_config.get("pre_ready_queue", {}) or {}
+    config_dict["pre_ready_max_depth"] = pre_ready.get("max_depth", config_dict["max_queue_depth"])
+    config_dict["pre_ready_timeout_s"] = pre_ready.get("timeout_s", 60.0)
+
     # Apply TensorRT-LLM specific settings
     trtllm_settings = sku_profile.get("tensorrt_llm", {})
     config_dict["tensorrt_llm"] = TensorRTLLMConfig(
@@ -206,11 +308,11 @@ def load_config(config_path: str = "config.yaml", profiles_path: str = "sku_prof
     print(f"  KV Cache dtype: {config_dict['tensorrt_llm'].kv_cache_dtype}")
     print(f"  Paged KV Cache: {config_dict['tensorrt_llm'].use_paged_kv_cache}")
     print(f"  Scheduler: {config_dict['tensorrt_llm'].scheduler_policy}")
+    print(f"  Inference backend: {config_dict['backend_type']} "
+          f"(+{len(config_dict['remote_replicas'])} remote replicas)")
 
     return ServerConfig(**config_dict)
 
-config = load_config()
-
 # ============================================================================
 # Prometheus Metrics
 # ============================================================================
@@ -247,75 +349,197 @@ TOTAL_LATENCY = Histogram(
 # Gauges
 ACTIVE_SESSIONS = Gauge(
     'forge_active_sessions',
-    'Number of active inference sessions'
+    'Number of active inference sessions',
+    multiprocess_mode='livemax'
+)
+
+HISTORY_BYTES = Gauge(
+    'forge_conversation_history_bytes',
+    'Memory held by server-side conversation history across sessions',
+    multiprocess_mode='livemax'
 )
 
 MAX_SESSIONS = Gauge(
     'forge_max_sessions',
-    'Maximum allowed concurrent sessions'
+    'Maximum allowed concurrent sessions',
+    multiprocess_mode='livemax'
 )
 
 QUEUE_DEPTH = Gauge(
     'forge_queue_depth',
-    'Current request queue depth'
+    'Current request queue depth',
+    multiprocess_mode='livemax'
 )
 
 MAX_QUEUE_DEPTH = Gauge(
     'forge_max_queue_depth',
-    'Maximum allowed queue depth before rejection'
+    'Maximum allowed queue depth before rejection',
+    multiprocess_mode='livemax'
 )
 
 GPU_MEMORY_USED = Gauge(
     'forge_gpu_memory_used_bytes',
     'GPU memory used in bytes',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
 )
 
 GPU_MEMORY_TOTAL = Gauge(
     'forge_gpu_memory_total_bytes',
     'GPU memory total in bytes',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
 )
 
 GPU_UTILIZATION = Gauge(
     'forge_gpu_utilization_percent',
     'GPU utilization percentage',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
 )
 
 # Performance target gauges (for Grafana thresholds)
 TARGET_TTFT_MS = Gauge(
     'forge_target_ttft_ms',
-    'Target TTFT in milliseconds'
+    'Target TTFT in milliseconds',
+    multiprocess_mode='livemax'
 )
 
 TARGET_TTFT_P99_MS = Gauge(
     'forge_target_ttft_p99_ms',
-    'Target P99 TTFT in milliseconds'
+    'Target P99 TTFT in milliseconds',
+    multiprocess_mode='livemax'
 )
 
 TARGET_TPS = Gauge(
     'forge_target_tps',
-    'Target tokens per second'
+    'Target tokens per second',
+    multiprocess_mode='livemax'
 )
 
 # Thermal monitoring gauges
 GPU_TEMPERATURE = Gauge(
     'forge_gpu_temperature_celsius',
     'GPU temperature in Celsius',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
 )
 
 GPU_POWER_USAGE = Gauge(
     'forge_gpu_power_watts',
     'GPU power usage in Watts',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
 )
 
 GPU_THERMAL_THROTTLE = Gauge(
     'forge_gpu_thermal_throttle',
     'GPU thermal throttling active (1=throttling, 0=normal)',
-    ['gpu_id']
+    ['gpu_id'],
+    multiprocess_mode='livemax'
+)
+
+# Readiness / warm-up
+READY = Gauge(
+    'forge_ready',
+    'Model loaded and warmed up (1=ready for traffic, 0=not ready)',
+    multiprocess_mode='livemax'
+)
+
+WARMUP_DURATION = Gauge(
+    'forge_warmup_duration_seconds',
+    'Duration of the model warm-up phase in seconds',
+    multiprocess_mode='livemax'
+)
+
+FIRST_REQUEST_LATENCY = Gauge(
+    'forge_first_request_latency_seconds',
+    'Total latency of the first real request after readiness in seconds',
+    multiprocess_mode='livemax'
+)
+
+PRE_READY_QUEUE_DEPTH = Gauge(
+    'forge_pre_ready_queue_depth',
+    'Requests waiting for the model to finish loading',
+    multiprocess_mode='livemax'
+)
+
+PRE_READY_REJECTED = Counter(
+    'forge_pre_ready_rejected_total',
+    'Requests rejected while the model was loading',
+    ['reason']
+)
+
+TIME_TO_FIRST_SERVED = Gauge(
+    'forge_time_to_first_served_seconds',
+    'Time from process start until the first request was served in seconds',
+    multiprocess_mode='livemax'
+)
+
+CONFIG_RELOADS = Counter(
+    'forge_config_reloads_total',
+    'Config hot reloads (SIGHUP or file change)',
+    ['status']
+)
+
+# Goodput: requests / output tokens that met each SLO target
+# (target = ttft | ttft_p99 | tps | all; all = ttft and tps)
+REQUESTS_BY_PRIORITY = Counter(
+    'forge_requests_by_priority_total',
+    'Inference requests (success and error) by priority class',
+    ['priority', 'sku']
+)
+
+OUTPUT_TOKENS = Counter(
+    'forge_output_tokens_total',
+    'Output tokens generated by priority class',
+    ['priority', 'sku']
+)
+
+GOODPUT_REQUESTS = Counter(
+    'forge_goodput_requests_total',
+    'Successful requests that met the SLO target',
+    ['target', 'priority', 'sku']
+)
+
+GOODPUT_TOKENS = Counter(
+    'forge_goodput_tokens_total',
+    'Output tokens of successful requests that met the SLO target',
+    ['target', 'priority', 'sku']
+)
+
+GOODPUT_TARGETS = ("ttft", "ttft_p99", "tps", "all")
+PRIORITIES = ("high", "normal", "low")
+
+class RequestMetrics:
+    """
+    Label children for the /v1/chat hot path, bound once at startup:
+    .labels() is a locked dict lookup per call, and model / SKU are fixed
+    for the life of the process.
+    """
+
+    def __init__(self, model_name: str, sku_name: str):
+        self.ttft = TTFT_HISTOGRAM.labels(model=model_name)
+        self.tokens_per_second = TOKENS_PER_SECOND.labels(model=model_name)
+        self.total_latency = TOTAL_LATENCY.labels(model=model_name)
+        self.success = REQUEST_COUNT.labels(status="success", model=model_name)
+        self.error = REQUEST_COUNT.labels(status="error", model=model_name)
+        self.requests = {p: REQUESTS_BY_PRIORITY.labels(priority=p, sku=sku_name) for p in PRIORITIES}
+        self.output_tokens = {p: OUTPUT_TOKENS.labels(priority=p, sku=sku_name) for p in PRIORITIES}
+        self.goodput_requests = {
+            (t, p): GOODPUT_REQUESTS.labels(target=t, priority=p, sku=sku_name)
+            for t in GOODPUT_TARGETS for p in PRIORITIES
+        }
+        self.goodput_tokens = {
+            (t, p): GOODPUT_TOKENS.labels(target=t, priority=p, sku=sku_name)
+            for t in GOODPUT_TARGETS for p in PRIORITIES
+        }
+
+STARTUP_PHASE_SECONDS = Gauge(
+    'forge_startup_phase_seconds',
+    'Duration of each startup phase in seconds (import, nvml, config, model_load, warmup)',
+    ['phase'],
+    multiprocess_mode='livemax'
 )
 
 # ============================================================================
@@ -459,8 +683,6 @@ class GPUMonitor:
         if self.initialized:
             pynvml.nvmlShutdown()
 
-gpu_monitor = GPUMonitor()
-
 # ============================================================================
 # Session Management (Simulates concurrent users)
 # ============================================================================
@@ -475,10 +697,28 @@ class InferenceSession:
     avg_latency_ms: float = 0.0
 
 class SessionManager:
-    def __init__(self, max_sessions: int):
+    def __init__(
+        self,
+        max_sessions: int,
+        conversation: Optional[ConversationConfig] = None,
+        store: Optional[SessionStore] = None
+    ):
         self.max_sessions = max_sessions
         self.sessions: Dict[str, InferenceSession] = {}
+        self.conversation = conversation or ConversationConfig()
+        self.histories: Dict[str, ConversationHistory] = {}  # Sessions that used history
+        self._system_tokens = (None, 0)  # (system prompt, its token count)
         self._lock = asyncio.Lock()
+        # Snapshots (see session_store.py): changes since the last flush
+        self.store = store
+        self._journal: List[Dict] = []   # Message and close records, in order
+        self._dirty: set = set()         # Sessions whose metadata changed
+        self._compact = False            # Rewrite the whole log at the next snapshot
+        self._snapshot_lock = asyncio.Lock()
+        self._restored: Dict[str, RestoredSession] = {}  # History not rebuilt yet
+        self.restore_done = asyncio.Event()
+        if store is None:
+            self.restore_done.set()
 
     async def create_session(self) -> str:
         async with self._lock:
@@ -495,10 +735,13 @@ class SessionManager:
                 created_at=now,
                 last_request=now
             )
+            self._mark_dirty(session_id)
             ACTIVE_SESSIONS.set(len(self.sessions))
             return session_id
 
     async def get_session(self, session_id: str) -> InferenceSession:
+        if session_id not in self.sessions and not self.restore_done.is_set():
+            await self.restore_done.wait()  # It may be in the snapshot
         if session_id not in self.sessions:
             raise HTTPException(status_code=404, detail="Session not found")
         return self.sessions[session_id]
@@ -515,13 +758,68 @@ class SessionManager:
                     (session.avg_latency_ms * (session.request_count - 1) + latency_ms)
                     / session.request_count
                 )
+                self._mark_dirty(session_id)
 
     async def close_session(self, session_id: str):
         async with self._lock:
+            self._drop_history(session_id)
             if session_id in self.sessions:
                 del self.sessions[session_id]
                 ACTIVE_SESSIONS.set(len(self.sessions))
 
+    def _history(self, session_id: str) -> ConversationHistory:
+        history = self.histories.get(session_id)
+        if history is None:
+            history = self.histories[session_id] = ConversationHistory(self.conversation.max_messages, count_tokens)
+            restored = self._restored.pop(session_id, None)
+            if restored is not None:
+                for role, text in restored.messages:
+                    history.append(role, text)
+                HISTORY_BYTES.inc(history.memory_bytes())
+        return history
+
+    def _drop_history(self, session_id: str):
+        """Forget a closed session's history (and tell the snapshot)"""
+        self._restored.pop(session_id, None)
+        if self.store is not None:
+            self._dirty.discard(session_id)
+            self._journal.append(close_record(session_id))
+        if self.histories.pop(session_id, None) is not None:
+            HISTORY_BYTES.set(sum(h.memory_bytes() for h in self.histories.values()))
+
+    def _mark_dirty(self, session_id: str):
+        if self.store is not None:
+            self._dirty.add(session_id)
+
+    async def build_prompt(self, session_id: str, prompt: str) -> str:
+        """
+        Prompt for a new turn: pinned system prompt, as much recent history
+        as fits conversation.max_input_len, then the new prompt. A session
+        that is gone (expired, closed) gets no history and no new entry.
+        """
+        system_prompt = self.conversation.system_prompt
+        if self._system_tokens[0] != system_prompt:
+            self._system_tokens = (system_prompt, count_tokens(system_prompt) + ROLE_OVERHEAD_TOKENS if system_prompt else 0)
+        if session_id in self.sessions:
+            history = self._history(session_id)
+        else:
+            history = self.histories.get(session_id) or ConversationHistory(self.conversation.max_messages, count_tokens)
+        return history.build_context(prompt, self.conversation, self._system_tokens[1])
+
+    async def append_turn(self, session_id: str, prompt: str, response: str):
+        if session_id in self.sessions:
+            history = self._history(session_id)
+            before = history.memory_bytes()
+            history.add_turn(prompt, response)
+            HISTORY_BYTES.inc(history.memory_bytes() - before)
+            if self.store is not None:
+                self._journal.append(message_record(session_id, USER, prompt))
+                self._journal.append(message_record(session_id, ASSISTANT, response))
+
+    async def history_stats(self) -> Dict[str, Dict]:
+        """Per-session history accounting for sessions that use history"""
+        return {sid: h.stats() for sid, h in self.histories.items()}
+
     async def get_all_sessions(self) -> List[InferenceSession]:
         return list(self.sessions.values())
 
@@ -535,52 +833,404 @@ class SessionManager:
             ]
             for sid in stale:
                 del self.sessions[sid]
+                self._drop_history(sid)
             if stale:
                 ACTIVE_SESSIONS.set(len(self.sessions))
                 print(f"Cleaned up {len(stale)} stale sessions")
 
-session_manager = SessionManager(config.max_concurrent_sessions)
+    # Snapshots ---------------------------------------------------------------
+
+    def _full_state(self) -> List[Dict]:
+        """Records that recreate every live session and its history"""
+        records = []
+        for sid, session in self.sessions.items():
+            records.append(session_record(asdict(session)))
+            if sid in self.histories:
+                messages = self.histories[sid].messages()
+            elif sid in self._restored:
+                messages = self._restored[sid].messages
+            else:
+                continue
+            records.extend(message_record(sid, role, text) for role, text in messages)
+        return records
+
+    async def snapshot(self) -> Optional[Dict]:
+        """
+        Flush changes since the last snapshot as one append, or rewrite the
+        whole log when it has grown compact_ratio times past the live state.
+        """
+        if self.store is None or not self.restore_done.is_set():
+            return None  # Restore reads the log; it is rewritten right after
+        async with self._snapshot_lock:
+            # Taken without awaiting, so later changes go to the next snapshot
+            if self._compact or self.store.needs_compaction():
+                kind, records = "compaction", self._full_state()
+                write = self.store.rewrite
+            else:
+                kind = "incremental"
+                records = [session_record(asdict(self.sessions[sid])) for sid in self._dirty if sid in self.sessions]
+                records.extend(self._journal)
+                write = self.store.append
+            self._journal, self._dirty, self._compact = [], set(), False
+            if not records and kind == "incremental":
+                return None
+
+            start = time.perf_counter()
+            try:
+                nbytes = await asyncio.to_thread(write, records)
+            except OSError as e:
+                print(f"Session snapshot failed ({e}); retrying with a full rewrite")
+                self._compact = True
+                return None
+            self.store.record_snapshot(kind, time.perf_counter() - start, len(records), nbytes)
+            return self.store.last_snapshot
+
+    async def restore(self, max_idle_seconds: int = 300):
+        """
+        Load sessions from the snapshot log in the background. Sessions idle
+        past max_idle_seconds, or beyond max_sessions (most recent first),
+        are not restored. Histories are rebuilt on each session's next turn.
+        """
+        try:
+            start = time.perf_counter()
+            try:
+                records = await asyncio.to_thread(self.store.load)
+            except (OSError, ValueError) as e:
+                print(f"Session restore failed ({e}); starting with no sessions")
+                records = []
+            restored = replay(records, self.conversation.max_messages)
+
+            now = time.time()
+            candidates = sorted(
+                (r for r in restored.values() if now - r.session["last_request"] <= max_idle_seconds),
+                key=lambda r: r.session["last_request"],
+                reverse=True
+            )
+            count = 0
+            async with self._lock:
+                for r in candidates:
+                    sid = r.session["session_id"]
+                    if len(self.sessions) >= self.max_sessions:
+                        break
+                    if sid in self.sessions:
+                        continue
+                    self.sessions[sid] = InferenceSession(**r.session)
+                    if r.messages:
+                        self._restored[sid] = r
+                    count += 1
+                ACTIVE_SESSIONS.set(len(self.sessions))
+                self._compact = True  # Drop closed and skipped sessions from the log
+
+            seconds = time.perf_counter() - start
+            self.store.record_restore(seconds, count, len(restored) - count, len(records))
+            print(f"Restored {count} sessions from {self.store.path} in {seconds * 1000:.1f}ms "
+                  f"({len(records)} records, {len(restored) - count} skipped)")
+        finally:
+            self.restore_done.set()
+
+    async def snapshot_stats(self) -> Optional[Dict]:
+        if self.store is None:
+            return None
+        return {
+            **self.store.stats(),
+            "pending_records": len(self._journal) + len(self._dirty),
+            "restore_pending": not self.restore_done.is_set(),
+            "histories_not_rebuilt": len(self._restored),
+        }
 
 # ============================================================================
-# Inference Engine (Simulated for prototype)
+# Inference Engine
 # ============================================================================
 
 class InferenceEngine:
     """
-    Simulated inference engine for prototype.
-    In production, this would wrap TensorRT-LLM.
+    Inference engine used by the API.
+
+    Without a backend it simulates inference for the prototype. With a
+    backend pool (see create_backend_pool) it routes to inference_backends
+    replicas, e.g. TensorRT-LLM on Triton in production.
     """
 
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        backend: Optional[BackendPool] = None,
+        pre_ready_max_depth: int = 0,
+        pre_ready_timeout_s: float = 60.0,
+        degradation: Optional[DegradationController] = None,
+        concurrency: int = 10
+    ):
         self.model_name = model_name
+        self.backend = backend
         self.loaded = False
+        self.ready = False  # Loaded and warmed up
+        self.load_error: Optional[str] = None
+        self.warmup_summary: List[Dict] = []
+        self.warmup_duration_s = 0.0  # Wall clock; replicas warm up in parallel
+        self.first_request_latency_ms: Optional[float] = None
+        self.time_to_first_served_s: Optional[float] = None
+        # Bounded queue of requests waiting for load_model to finish
+        self.pre_ready_max_depth = pre_ready_max_depth
+        self.pre_ready_timeout_s = pre_ready_timeout_s
+        self.pre_ready_waiting = 0
+        self._loaded_event = asyncio.Event()
+        # Load signals for output-length clamping (see degradation.py).
+        # Up to `concurrency` requests run at once; the rest are waiting.
+        self.degradation = degradation
+        self.concurrency = concurrency
+        self.inflight = 0
+        self.reserved_tokens = 0
         self._base_latency_ms = 50  # Base processing time
         self._token_latency_ms = 10  # Per-token generation time
 
+    @property
+    def backend_name(self) -> str:
+        return self.backend.backend_name if self.backend else "builtin"
+
     async def load_model(self):
-        """Simulate model loading"""
-        print(f"Loading model: {self.model_name}")
-        await asyncio.sleep(2)  # Simulate load time
-        self.loaded = True
+        """
+        Load the backend model (or simulate loading). Requests held in the
+        pre-ready queue are released as soon as this finishes, even before
+        warm-up.
+        """
+        print(f"Loading model: {self.model_name} (backend: {self.backend_name})")
+        try:
+            if self.backend is not None:
+                await self.backend.load_model()
+                self.backend.start_probing()
+            else:
+                await asyncio.sleep(2)  # Simulate load time
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"Model load failed: {e}")
+            raise
+        finally:
+            # Wake pre-ready waiters on success and failure alike
+            self.loaded = self.load_error is None
+            self._loaded_event.set()
         print(f"Model loaded: {self.model_name}")
 
+    async def wait_until_loaded(self):
+        """
+        Hold a request in the bounded pre-ready queue until the model is
+        loaded; 503 when the queue is full, the deadline passes or the load
+        failed.
+        """
+        if self.load_error is None and self.pre_ready_waiting >= self.pre_ready_max_depth:
+            PRE_READY_REJECTED.labels(reason="queue_full").inc()
+            raise HTTPException(status_code=503, detail="Model not loaded (pre-ready queue full)")
+
+        self.pre_ready_waiting += 1
+        PRE_READY_QUEUE_DEPTH.set(self.pre_ready_waiting)
+        try:
+            await asyncio.wait_for(self._loaded_event.wait(), self.pre_ready_timeout_s)
+        except asyncio.TimeoutError:
+            PRE_READY_REJECTED.labels(reason="deadline").inc()
+            raise HTTPException(
+                status_code=503,
+                detail=f"Model still loading after {self.pre_ready_timeout_s:.0f}s"
+            )
+        finally:
+            self.pre_ready_waiting -= 1
+            PRE_READY_QUEUE_DEPTH.set(self.pre_ready_waiting)
+
+        if self.load_error is not None:
+            PRE_READY_REJECTED.labels(reason="load_failed").inc()
+            raise HTTPException(status_code=503, detail=f"Model failed to load: {self.load_error}")
+
+    async def warm_up(self, warmup_cfg: WarmupConfig):
+        """
+        Replay the warm-up workload on every loaded replica (or the built-in
+        engine), then mark the engine ready for traffic.
+        """
+        if warmup_cfg.enabled:
+            start_time = time.perf_counter()
+            if self.backend is not None:
+                self.warmup_summary = list(await asyncio.gather(*(
+                    run_warmup(
+                        lambda prompt, n, backend=r.backend: backend.generate(prompt=prompt, max_tokens=n),
+                        warmup_cfg,
+                        r.name
+                    )
+                    for r in self.backend.replicas if r.backend.is_loaded
+                )))
+            else:
+                self.warmup_summary = [await run_warmup(
+                    # Not admitted: warm-up load must not trip degraded mode
+                    lambda prompt, n: self._simulate_once(prompt, n),
+                    warmup_cfg
+                )]
+            duration_s = self.warmup_duration_s = time.perf_counter() - start_time
+            WARMUP_DURATION.set(duration_s)
+            print(f"Warm-up complete in {duration_s:.2f}s")
+
+        self.ready = True
+        READY.set(1)
+
+    def record_first_request(self, latency_ms: float):
+        """Track how much the first real request still paid for cold start"""
+        if self.first_request_latency_ms is None and self.ready:
+            self.first_request_latency_ms = latency_ms
+            FIRST_REQUEST_LATENCY.set(latency_ms / 1000)
+
+    def record_served(self):
+        """Track time-to-first-served, measured from process start"""
+        if self.time_to_first_served_s is None:
+            self.time_to_first_served_s = time.perf_counter() - _IMPORT_START
+            TIME_TO_FIRST_SERVED.set(self.time_to_first_served_s)
+            print(f"First request served {self.time_to_first_served_s:.2f}s after start")
+
+    async def close(self):
+        if self.backend is not None and hasattr(self.backend, "close"):
+            await self.backend.close()
+
+    async def forget_session(self, session_id: str):
+        if self.backend is not None:
+            self.backend.forget_session(session_id)
+
+    async def replica_stats(self) -> Optional[Dict]:
+        """Per-replica load and health, None for the built-in engine"""
+        return self.backend.stats() if self.backend is not None else None
+
+    async def degradation_stats(self) -> Optional[Dict]:
+        if self.degradation is None:
+            return None
+        return {
+            **self.degradation.stats(),
+            "inflight": self.inflight,
+            "waiting": self.queue_depth,
+            "reserved_tokens": self.reserved_tokens,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """Admitted requests beyond the concurrency the engine runs at once"""
+        return max(0, self.inflight - self.concurrency)
+
+    def observe_load(self):
+        QUEUE_DEPTH.set(self.queue_depth)
+        if self.degradation is not None:
+            self.degradation.observe(self.queue_depth, self.reserved_tokens)
+
+    def _admit(self, prompt: str, max_tokens: int, priority: str) -> Tuple[int, bool, int]:
+        """
+        Count a request as in flight; in degraded mode its max_tokens is
+        first clamped by its class policy. Returns (max_tokens, clamped,
+        reserved tokens).
+        """
+        clamped = False
+        if self.degradation is not None:
+            self.degradation.observe(self.queue_depth, self.reserved_tokens)
+            max_tokens, clamped = self.degradation.clamp(priority, max_tokens)
+        reserved = count_tokens(prompt) + max_tokens
+        self.inflight += 1
+        self.reserved_tokens += reserved
+        self.observe_load()
+        return max_tokens, clamped, reserved
+
+    def _release(self, reserved: int):
+        self.inflight -= 1
+        self.reserved_tokens -= reserved
+        self.observe_load()
+
     async def generate(
         self,
         prompt: str,
         max_tokens: int = 256,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        session_id: Optional[str] = None,
+        priority: str = "normal"
     ) -> Dict:
         """
-        Simulate inference with realistic latency patterns.
-        Adds load-based latency to simulate contention.
+        Run one request on the backend pool (or the simulation). The result
+        has clamped / effective_max_tokens for degraded mode.
+        """
+        if not self.loaded:
+            await self.wait_until_loaded()
+
+        max_tokens, clamped, reserved = self._admit(prompt, max_tokens, priority)
+        try:
+            if self.backend is not None:
+                result = asdict(await self.backend.generate(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    session_id=session_id
+                ))
+            else:
+                result = await self._simulate_once(prompt, max_tokens)
+        finally:
+            self._release(reserved)
+        result.update(clamped=clamped, effective_max_tokens=max_tokens)
+        return result
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        session_id: Optional[str] = None,
+        priority: str = "normal"
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream output as {"text", "num_tokens", "finished", "result"} chunks;
+        the last chunk has finished=True and the generate() result dict.
+        Closing the iterator early cancels the backend request.
         """
         if not self.loaded:
-            raise HTTPException(status_code=503, detail="Model not loaded")
+            await self.wait_until_loaded()
+
+        max_tokens, clamped, reserved = self._admit(prompt, max_tokens, priority)
+        try:
+            if self.backend is None:
+                stream = self._simulate(prompt, max_tokens, chunk_tokens=1)
+            else:
+                stream = self._backend_stream(prompt, max_tokens, temperature, session_id)
+            async with aclosing(stream) as chunks:
+                async for chunk in chunks:
+                    if chunk["finished"]:
+                        chunk["result"].update(clamped=clamped, effective_max_tokens=max_tokens)
+                    yield chunk
+        finally:
+            self._release(reserved)
+
+    async def _backend_stream(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        session_id: Optional[str]
+    ) -> AsyncIterator[Dict]:
+        stream = self.backend.generate_stream(prompt, max_tokens, temperature, session_id=session_id)
+        async with aclosing(stream) as chunks:
+            async for chunk in chunks:
+                yield {
+                    "text": chunk.text,
+                    "num_tokens": chunk.num_tokens,
+                    "finished": chunk.finished,
+                    "result": asdict(chunk.result) if chunk.result is not None else None,
+                }
+
+    async def _simulate_once(self, prompt: str, max_tokens: int) -> Dict:
+        async for chunk in self._simulate(prompt, max_tokens):
+            pass
+        return chunk["result"]
 
+    async def _simulate(
+        self,
+        prompt: str,
+        max_tokens: int,
+        chunk_tokens: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Simulate inference with realistic latency patterns, emitting
+        chunk_tokens tokens per chunk (everything at once by default).
+        Adds load-based latency to simulate contention.
+        """
         start_time = time.perf_counter()
 
         # Simulate compute based on input length and active sessions
-        input_tokens = len(prompt.split()) * 1.3  # Rough token estimate
+        input_tokens = count_tokens(prompt)
         active_count = len(session_manager.sessions)
 
         # TTFT simulation (increases with load)
@@ -591,30 +1241,474 @@ class InferenceEngine:
         ttft_time = time.perf_counter()
         ttft_actual = (ttft_time - start_time) * 1000
 
-        # Token generation simulation
+        # Simulated response
         output_tokens = min(max_tokens, int(input_tokens * 0.8) + 50)
-        generation_time_ms = output_tokens * self._token_latency_ms * load_factor
-        await asyncio.sleep(generation_time_ms / 1000)
+        response_text = f"[Simulated response for: {prompt[:50]}...] " + \
+                       "This is a prototype response simulating the Maintenance Assistant. " * 5
+        response_text = response_text[:output_tokens * 4]  # Rough char estimate
+
+        # Token generation simulation
+        chunk_tokens = chunk_tokens or output_tokens
+        sent = 0
+        while sent < output_tokens:
+            n = min(chunk_tokens, output_tokens - sent)
+            await asyncio.sleep(n * self._token_latency_ms * load_factor / 1000)
+            text = response_text[sent * 4:(sent + n) * 4]
+            sent += n
+            if chunk_tokens < output_tokens:
+                yield {"text": text, "num_tokens": n, "finished": False, "result": None}
 
         end_time = time.perf_counter()
         total_latency = (end_time - start_time) * 1000
         tokens_per_sec = output_tokens / ((end_time - ttft_time) if (end_time - ttft_time) > 0 else 1)
 
-        # Simulated response
-        response_text = f"[Simulated response for: {prompt[:50]}...] " + \
-                       "This is a prototype response simulating the Maintenance Assistant. " * 5
+        yield {
+            "text": "" if chunk_tokens < output_tokens else response_text,
+            "num_tokens": 0 if chunk_tokens < output_tokens else output_tokens,
+            "finished": True,
+            "result": {
+                "text": response_text,
+                "input_tokens": int(input_tokens),
+                "output_tokens": output_tokens,
+                "ttft_ms": round(ttft_actual, 2),
+                "total_latency_ms": round(total_latency, 2),
+                "tokens_per_second": round(tokens_per_sec, 2),
+                "model": self.model_name
+            },
+        }
+
+def create_backend_pool(cfg: ServerConfig, device_count: int) -> Optional[BackendPool]:
+    """
+    Build the replica pool: local replicas of cfg.backend_type (one per GPU
+    when replicas_per_gpu is set; only the simulated backend accepts a GPU
+    other than 0, see create_inference_backend) plus cfg.remote_replicas.
+    Returns None when there are no replicas, i.e. backend "builtin" and no
+    remotes, which keeps the built-in simulated engine.
+    """
+    replicas = []
+    if cfg.backend_type != "builtin":
+        local_count = max(1, device_count) if cfg.replicas_per_gpu else 1
+        for gpu_id in range(local_count):
+            replicas.append(Replica(
+                f"local-{gpu_id}",
+                create_inference_backend(cfg.backend_type, gpu_id=gpu_id)
+            ))
+
+    for spec in cfg.remote_replicas:
+        spec = dict(spec)
+        name = spec.pop("name", f"remote-{len(replicas)}")
+        backend_type = spec.pop("type", "triton")
+        replicas.append(Replica(name, create_inference_backend(backend_type, **spec)))
+
+    if not replicas:
+        return None
+
+    # Hedging later than the P99 TTFT target cannot help meet it
+    hedge_settings = {"max_delay_ms": cfg.target_ttft_p99_ms, **cfg.hedging}
+    return BackendPool(replicas, hedge_policy=HedgePolicy(**hedge_settings))
+
+# ============================================================================
+# Multi-Worker Mode (FORGE_WORKERS > 1)
+# ============================================================================
+# One engine process owns the GPU, the model, sessions and limits; uvicorn
+# front-end workers parse, validate and serialize, and reach the engine
+# through engine_ipc over a Unix socket (FORGE_ENGINE_SOCKET).
+
+class RemoteSessionManager:
+    """SessionManager facade for front-end workers; the store is the engine's"""
+
+    def __init__(self, client: EngineClient, max_sessions: int):
+        self.client = client
+        self.max_sessions = max_sessions  # Informational; enforced by the engine
+
+    async def create_session(self) -> str:
+        return await self.client.call("create_session")
+
+    async def get_session(self, session_id: str) -> InferenceSession:
+        return InferenceSession(**await self.client.call("get_session", session_id=session_id))
+
+    async def update_session(self, session_id: str, tokens: int, latency_ms: float):
+        await self.client.call("update_session", session_id=session_id, tokens=tokens, latency_ms=latency_ms)
+
+    async def close_session(self, session_id: str):
+        await self.client.call("close_session", session_id=session_id)
+
+    async def get_all_sessions(self) -> List[InferenceSession]:
+        return [InferenceSession(**s) for s in await self.client.call("list_sessions")]
+
+    async def build_prompt(self, session_id: str, prompt: str) -> str:
+        return await self.client.call("build_prompt", session_id=session_id, prompt=prompt)
+
+    async def append_turn(self, session_id: str, prompt: str, response: str):
+        await self.client.call("append_turn", session_id=session_id, prompt=prompt, response=response)
+
+    async def history_stats(self) -> Dict[str, Dict]:
+        return await self.client.call("history_stats")
+
+    async def snapshot_stats(self) -> Optional[Dict]:
+        return await self.client.call("snapshot_stats")
+
+    async def cleanup_stale_sessions(self, max_idle_seconds: int = 300):
+        pass  # The engine process runs the cleanup
+
+class RemoteInferenceEngine(InferenceEngine):
+    """
+    InferenceEngine facade for front-end workers. Loading, warm-up and the
+    pre-ready queue happen in the engine process; load_model / warm_up here
+    only wait for the engine to report each state.
+    """
+
+    def __init__(self, client: EngineClient, model_name: str):
+        super().__init__(model_name)
+        self.client = client
+        self._backend_name = "builtin"
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend_name
+
+    async def refresh_status(self):
+        status = await self.client.call("status")
+        self.loaded = status["loaded"]
+        self.ready = status["ready"]
+        self.load_error = status["load_error"]
+        self.warmup_summary = status["warmup"]
+        self.warmup_duration_s = status["warmup_duration_s"]
+        self.pre_ready_waiting = status["pre_ready_waiting"]
+        self._backend_name = status["backend"]
+
+    async def _wait_for(self, state: str):
+        while not getattr(self, state):
+            try:
+                await self.refresh_status()
+            except EngineUnavailableError:
+                pass  # Engine process still starting
+            if self.load_error is not None:
+                raise RuntimeError(f"Engine failed to load: {self.load_error}")
+            if not getattr(self, state):
+                await asyncio.sleep(0.5)
 
+    async def load_model(self):
+        print(f"Waiting for engine process ({self.client.socket_path}) to load the model")
+        await self._wait_for("loaded")
+
+    async def warm_up(self, warmup_cfg: WarmupConfig):
+        await self._wait_for("ready")
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        session_id: Optional[str] = None,
+        priority: str = "normal"
+    ) -> Dict:
+        return await self.client.call(
+            "generate",
+            prompt=prompt,
+            prompt_tokens=count_tokens(prompt),  # Spares the engine a second tokenization
+            max_tokens=max_tokens,
+            temperature=temperature,
+            session_id=session_id,
+            priority=priority
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        session_id: Optional[str] = None,
+        priority: str = "normal"
+    ) -> AsyncIterator[Dict]:
+        # engine_ipc is request/response: the whole result arrives as one chunk
+        result = await self.generate(prompt, max_tokens, temperature, session_id, priority)
+        yield {"text": result["text"], "num_tokens": result["output_tokens"], "finished": True, "result": result}
+
+    async def forget_session(self, session_id: str):
+        await self.client.call("forget_session", session_id=session_id)
+
+    async def replica_stats(self) -> Optional[Dict]:
+        return await self.client.call("replica_stats")
+
+    async def degradation_stats(self) -> Optional[Dict]:
+        return await self.client.call("degradation_stats")
+
+    async def close(self):
+        await self.client.close()
+
+# Engine ops without side effects: safe to resend after a lost connection
+ENGINE_READ_OPS = frozenset({
+    "status", "get_session", "list_sessions", "build_prompt", "history_stats", "snapshot_stats",
+    "replica_stats", "degradation_stats", "slo_snapshot",
+})
+
+def engine_handlers() -> Dict:
+    """IPC ops served by the engine process, backed by its local runtime"""
+    async def status():
         return {
-            "text": response_text[:output_tokens * 4],  # Rough char estimate
-            "input_tokens": int(input_tokens),
-            "output_tokens": output_tokens,
-            "ttft_ms": round(ttft_actual, 2),
-            "total_latency_ms": round(total_latency, 2),
-            "tokens_per_second": round(tokens_per_sec, 2),
-            "model": self.model_name
+            "loaded": inference_engine.loaded,
+            "ready": inference_engine.ready,
+            "load_error": inference_engine.load_error,
+            "warmup": inference_engine.warmup_summary,
+            "warmup_duration_s": inference_engine.warmup_duration_s,
+            "pre_ready_waiting": inference_engine.pre_ready_waiting,
+            "backend": inference_engine.backend_name,
         }
 
-inference_engine = InferenceEngine(config.model_name)
+    async def get_session(session_id: str):
+        return asdict(await session_manager.get_session(session_id))
+
+    async def list_sessions():
+        return [asdict(s) for s in await session_manager.get_all_sessions()]
+
+    async def generate(prompt: str, prompt_tokens: int, priority: str = "normal", **kwargs):
+        tokenization.get_service().prime(prompt, prompt_tokens)
+        # SLO/goodput windows live here so they cover every front-end worker
+        result = await inference_engine.generate(prompt=prompt, priority=priority, **kwargs)
+        record_slo(priority, result)
+        return result
+
+    async def record_error(priority: str):
+        record_slo_error(priority)
+
+    async def performance():
+        return slo_snapshot()
+
+    return {
+        "status": status,
+        "generate": generate,
+        "record_error": record_error,
+        "slo_snapshot": performance,
+        "create_session": session_manager.create_session,
+        "get_session": get_session,
+        "update_session": session_manager.update_session,
+        "close_session": session_manager.close_session,
+        "list_sessions": list_sessions,
+        "build_prompt": session_manager.build_prompt,
+        "append_turn": session_manager.append_turn,
+        "history_stats": session_manager.history_stats,
+        "snapshot_stats": session_manager.snapshot_stats,
+        "forget_session": inference_engine.forget_session,
+        "replica_stats": inference_engine.replica_stats,
+        "degradation_stats": inference_engine.degradation_stats,
+    }
+
+def run_engine_process(socket_path: str):
+    """Engine process entry point: the normal lifespan plus the IPC server"""
+    global ENGINE_PROCESS
+    ENGINE_PROCESS = True
+
+    async def serve():
+        # terminate() from the launcher (or Ctrl-C) stops the IPC server and
+        # runs the lifespan shutdown: final session snapshot, engine close
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        async with lifespan(None):
+            ipc_server = EngineIPCServer(socket_path, engine_handlers())
+            await ipc_server.start()
+            try:
+                await stop.wait()
+            finally:
+                await ipc_server.close()
+
+    asyncio.run(serve())
+
+# ============================================================================
+# Runtime State (initialised lazily, see init_runtime)
+# ============================================================================
+
+ENGINE_PROCESS = False  # True inside the engine process of multi-worker mode
+
+config: Optional[ServerConfig] = None
+gpu_monitor: Optional[GPUMonitor] = None
+session_manager: Optional[SessionManager] = None
+inference_engine: Optional[InferenceEngine] = None
+loop_monitor: Optional[LoopLagMonitor] = None
+request_metrics: Optional[RequestMetrics] = None
+
+def init_runtime(engine_socket: Optional[str] = None) -> Dict[str, float]:
+    """
+    Create config, GPU monitor, session manager and inference engine.
+    Called from the app lifespan instead of at import time; returns the
+    duration of each phase in seconds for the startup breakdown. With
+    engine_socket, sessions and inference go to the engine process.
+    """
+    global config, gpu_monitor, session_manager, inference_engine, request_metrics
+    phases = {}
+
+    phase_start = time.perf_counter()
+    sku_name = resolve_sku_name()
+    gpu_monitor = GPUMonitor()
+    phases["nvml"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    config = load_config(*config_paths(), sku_name=sku_name)
+    request_metrics = RequestMetrics(config.model_name, config.sku_name)
+    tokenization.configure(TokenizerConfig(**config.tokenizer))
+    if engine_socket:
+        client = EngineClient(engine_socket, idempotent_ops=ENGINE_READ_OPS)
+        session_manager = RemoteSessionManager(client, config.max_concurrent_sessions)
+        inference_engine = RemoteInferenceEngine(client, config.model_name)
+    else:
+        store_cfg = SessionStoreConfig(**config.session_store)
+        session_manager = SessionManager(
+            config.max_concurrent_sessions,
+            ConversationConfig(**config.conversation),
+            store=SessionStore(store_cfg) if store_cfg.path else None
+        )
+        inference_engine = InferenceEngine(
+            config.model_name,
+            backend=create_backend_pool(config, gpu_monitor.device_count),
+            pre_ready_max_depth=config.pre_ready_max_depth,
+            pre_ready_timeout_s=config.pre_ready_timeout_s,
+            degradation=DegradationController(
+                DegradationConfig(**config.degradation),
+                config.max_queue_depth
+            ),
+            concurrency=config.max_concurrent_sessions
+        )
+    phases["config"] = time.perf_counter() - phase_start
+    return phases
+
+# ============================================================================
+# Cached Metrics Exposition
+# ============================================================================
+
+class MetricsExposition:
+    """
+    Renders the Prometheus exposition (after refreshing GPU gauges) in a
+    worker thread at scrape cadence; /metrics returns the cached bytes.
+    """
+
+    def __init__(self, interval_s: float = 5.0):
+        self.interval_s = interval_s
+        self.body: Optional[bytes] = None
+        self.gzipped: Optional[bytes] = None
+        self.rendered_at = 0.0
+
+    def _render(self):
+        if gpu_monitor is not None:
+            gpu_monitor.get_gpu_stats()
+        if MULTIPROCESS_DIR:
+            # Aggregate the per-process metric files of all workers and the engine
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            body = generate_latest(registry)
+        else:
+            body = generate_latest()
+        # Swap both together; a scrape never mixes bodies
+        self.body, self.gzipped = body, gzip.compress(body, compresslevel=5)
+        self.rendered_at = time.time()
+
+    async def refresh(self):
+        await asyncio.to_thread(self._render)
+
+    async def refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Metrics render failed: {e}")
+            await asyncio.sleep(self.interval_s)
+
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+metrics_exposition = MetricsExposition(float(os.environ.get("FORGE_METRICS_RENDER_INTERVAL_S", "5")))
+
+# ============================================================================
+# Config Hot Reload
+# ============================================================================
+
+# Settings baked into the backend pool / engine at startup; changes to these
+# are logged and kept for the next restart instead of being applied live
+RESTART_REQUIRED_FIELDS = (
+    "model_name", "sku_name", "sku_description", "quantization", "tensorrt_llm",
+    "backend_type", "replicas_per_gpu", "remote_replicas", "hedging", "warmup",
+    "tokenizer", "session_store",
+)
+
+def config_paths() -> tuple:
+    return (
+        os.environ.get("FORGE_CONFIG_PATH", "config.yaml"),
+        os.environ.get("FORGE_SKU_PROFILES_PATH", "sku_profiles.yaml"),
+    )
+
+def set_target_gauges(cfg: ServerConfig):
+    """Limit and target gauges used for Grafana thresholds"""
+    MAX_SESSIONS.set(cfg.max_concurrent_sessions)
+    MAX_QUEUE_DEPTH.set(cfg.max_queue_depth)
+    TARGET_TTFT_MS.set(cfg.target_ttft_ms)
+    TARGET_TTFT_P99_MS.set(cfg.target_ttft_p99_ms)
+    TARGET_TPS.set(cfg.target_tps)
+
+def reload_config() -> Dict[str, tuple]:
+    """
+    Re-run the load_config merge and swap the live ServerConfig. Runs
+    synchronously on the event loop, so no request sees a half-applied
+    config. Session and pre-ready queue limits are resized in place; sessions
+    above a lowered limit are kept, new ones are rejected until below it.
+    Returns the applied changes as {field: (old, new)}.
+    """
+    global config
+    # Reuse the detected SKU: hardware does not change under a live process
+    new_config = load_config(*config_paths(), sku_name=config.sku_name)
+    old, new = asdict(config), asdict(new_config)
+
+    pending = [f for f in RESTART_REQUIRED_FIELDS if old[f] != new[f]]
+    if pending:
+        print(f"Config reload: {', '.join(pending)} changed; takes effect on restart")
+        new_config = replace(new_config, **{f: getattr(config, f) for f in pending})
+        new = asdict(new_config)
+
+    changes = {k: (old[k], new[k]) for k in new if old[k] != new[k]}
+    config = new_config
+
+    session_manager.max_sessions = config.max_concurrent_sessions
+    session_manager.conversation = ConversationConfig(**config.conversation)
+    inference_engine.pre_ready_max_depth = config.pre_ready_max_depth
+    inference_engine.pre_ready_timeout_s = config.pre_ready_timeout_s
+    if inference_engine.degradation is not None:
+        inference_engine.degradation.config = DegradationConfig(**config.degradation)
+        inference_engine.degradation.max_queue_depth = config.max_queue_depth
+        inference_engine.concurrency = config.max_concurrent_sessions
+    set_target_gauges(config)
+    CONFIG_RELOADS.labels(status="success").inc()
+
+    if changes:
+        print("Config reloaded: " + ", ".join(f"{k} {a} -> {b}" for k, (a, b) in changes.items()))
+    else:
+        print("Config reloaded: no changes")
+    return changes
+
+def _try_reload_config(trigger: str):
+    print(f"Reloading config ({trigger})")
+    try:
+        reload_config()
+    except Exception as e:
+        # Keep serving with the current config
+        CONFIG_RELOADS.labels(status="error").inc()
+        print(f"Config reload failed, keeping current config: {e}")
+
+async def watch_config_files(interval_s: float):
+    """Reload when config.yaml or sku_profiles.yaml change (incl. ConfigMap swaps)"""
+    def mtimes():
+        result = []
+        for path in config_paths():
+            try:
+                result.append(os.stat(path).st_mtime)
+            except OSError:
+                result.append(None)
+        return result
+
+    last = mtimes()
+    while True:
+        await asyncio.sleep(interval_s)
+        current = mtimes()
+        if current != last:
+            last = current
+            _try_reload_config("file change")
 
 # ============================================================================
 # API Models
@@ -625,11 +1719,33 @@ class ChatRequest(BaseModel):
     session_id: Optional[str] = None
     max_tokens: int = 256
     temperature: float = 0.7
+    priority: Literal["high", "normal", "low"] = "normal"
+    # Prepend the session's server-side history (and record this turn in it)
+    use_history: bool = False
 
 class ChatResponse(BaseModel):
     session_id: str
     response: str
     metrics: Dict
+    # max_tokens was lowered because the server is degraded (see degradation.py)
+    clamped: bool = False
+    effective_max_tokens: int
+
+def encode_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse for payloads that are already plain dicts: encodes with
+    orjson when installed (stdlib json otherwise, same compact output).
+    Returning it from a route skips FastAPI's response_model validation and
+    jsonable_encoder pass; response_model still documents the schema.
+    """
+
+    def render(self, content) -> bytes:
+        return encode_json(content)
 
 class HealthResponse(BaseModel):
     status: str
@@ -646,20 +1762,43 @@ class HealthResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    global loop_monitor
     print("Starting Forge Cognition Inference Server...")
+    phases = {"import": _IMPORT_SECONDS}
+    if inference_engine is None:
+        engine_socket = None if ENGINE_PROCESS else os.environ.get("FORGE_ENGINE_SOCKET")
+        phases.update(init_runtime(engine_socket))
+
     print(f"SKU: {config.sku_name}")
     print(f"TensorRT-LLM KV Cache: {config.tensorrt_llm.kv_cache_dtype}")
 
     # Set initial gauge values for Grafana thresholds
-    MAX_SESSIONS.set(config.max_concurrent_sessions)
-    MAX_QUEUE_DEPTH.set(config.max_queue_depth)
-    TARGET_TTFT_MS.set(config.target_ttft_ms)
-    TARGET_TTFT_P99_MS.set(config.target_ttft_p99_ms)
-    TARGET_TPS.set(config.target_tps)
+    set_target_gauges(config)
     ACTIVE_SESSIONS.set(0)
     QUEUE_DEPTH.set(0)
+    READY.set(0)
+    PRE_READY_QUEUE_DEPTH.set(0)
 
-    await inference_engine.load_model()
+    # Load and warm up in the background so HTTP (probes, pre-ready queue)
+    # is served while the model loads
+    async def load_and_warm_up():
+        phase_start = time.perf_counter()
+        try:
+            await inference_engine.load_model()
+        except Exception:
+            return
+        phases["model_load"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        await inference_engine.warm_up(WarmupConfig(**config.warmup))
+        phases["warmup"] = time.perf_counter() - phase_start
+
+        for phase, seconds in phases.items():
+            STARTUP_PHASE_SECONDS.labels(phase=phase).set(seconds)
+        print("Startup: " + ", ".join(f"{p}={s:.3f}s" for p, s in phases.items())
+              + f" (total {sum(phases.values()):.3f}s)")
+
+    startup_task = asyncio.create_task(load_and_warm_up())
 
     # Start background cleanup task
     async def cleanup_loop():
@@ -669,37 +1808,300 @@ async def lifespan(app: FastAPI):
 
     cleanup_task = asyncio.create_task(cleanup_loop())
 
-    yield
+    # Degraded mode is re-evaluated on every request; this also lets it end
+    # (and accounts its time) when traffic stops
+    async def load_loop():
+        while True:
+            await asyncio.sleep(1)
+            inference_engine.observe_load()
+
+    load_task = asyncio.create_task(load_loop()) if inference_engine.degradation is not None else None
+
+    # Session snapshots: restore alongside model loading (readiness does not
+    # wait for it), then flush changes every interval_s
+    snapshot_task = None
+    if getattr(session_manager, "store", None) is not None:
+        snapshot_interval_s = session_manager.store.config.interval_s
+
+        async def snapshot_loop():
+            await session_manager.restore()
+            while True:
+                await asyncio.sleep(snapshot_interval_s)
+                await session_manager.snapshot()
+
+        snapshot_task = asyncio.create_task(snapshot_loop())
+
+    # Event-loop lag; FORGE_LOOP_MONITOR_DEBUG also captures blocking stacks
+    loop_monitor = LoopLagMonitor(
+        debug=os.environ.get("FORGE_LOOP_MONITOR_DEBUG", "false").lower() == "true",
+        block_threshold_ms=float(os.environ.get("FORGE_LOOP_BLOCK_THRESHOLD_MS", "100"))
+    )
+    loop_monitor.start()
+
+    metrics_task = asyncio.create_task(metrics_exposition.refresh_loop())
+
+    # gRPC API on FORGE_GRPC_PORT (0 disables); the engine process serves IPC only
+    grpc_port = int(os.environ.get("FORGE_GRPC_PORT", "8001"))
+    grpc_server = await start_grpc(grpc_port) if grpc_port and not ENGINE_PROCESS else None
+
+    # Hot reload: `kill -HUP <pid>` or edit the watched files
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, _try_reload_config, "SIGHUP")
+    except (NotImplementedError, RuntimeError, ValueError, AttributeError):
+        pass  # No SIGHUP (Windows) or not on the main thread
+    watch_interval_s = float(os.environ.get("FORGE_CONFIG_WATCH_INTERVAL_S", "5"))
+    watch_task = (
+        asyncio.create_task(watch_config_files(watch_interval_s))
+        if watch_interval_s > 0 else None
+    )
+
+    try:
+        yield
+    finally:
+        # Shutdown (also when the lifespan is cancelled or fails)
+        startup_task.cancel()
+        cleanup_task.cancel()
+        if load_task is not None:
+            load_task.cancel()
+        metrics_task.cancel()
+        loop_monitor.stop()
+        if watch_task is not None:
+            watch_task.cancel()
+        if grpc_server is not None:
+            await grpc_server.stop(grace=5)
+        if snapshot_task is not None:
+            snapshot_task.cancel()
+            await session_manager.snapshot()  # Last changes, so the next start resumes them
+            session_manager.store.close()
+        await inference_engine.close()
+        tokenization.get_service().close()
+        gpu_monitor.shutdown()
+        if MULTIPROCESS_DIR:
+            multiprocess.mark_process_dead(os.getpid())
+        print("Inference server shutdown complete")
+
+router = APIRouter()
+
+# On-box sliding-window percentiles, served at /v1/performance/current
+slo_tracker = SLOTracker()
+
+def slo_objectives(cfg: ServerConfig) -> List[SLOObjective]:
+    """SLOs derived from the SKU targets (re-read on every call for hot reload)"""
+    return [
+        SLOObjective("ttft_p90", "ttft_ms", cfg.target_ttft_ms, 0.90),
+        SLOObjective("ttft_p99", "ttft_ms", cfg.target_ttft_p99_ms, 0.99),
+        # target_tps per request is a per-token time budget
+        SLOObjective("tpot_p90", "tpot_ms", round(1000.0 / cfg.target_tps, 2), 0.90),
+    ]
+
+goodput_tracker = GoodputTracker(GOODPUT_TARGETS)
+
+def goodput_met(result: Dict) -> Dict[str, bool]:
+    """Which goodput targets one successful request met"""
+    ttft_ok = result["ttft_ms"] <= config.target_ttft_ms
+    tps_ok = result["tokens_per_second"] >= config.target_tps
+    return {
+        "ttft": ttft_ok,
+        "ttft_p99": result["ttft_ms"] <= config.target_ttft_p99_ms,
+        "tps": tps_ok,
+        "all": ttft_ok and tps_ok,
+    }
+
+def record_goodput(priority: str, result: Dict):
+    """Count the request and its tokens toward every target it met"""
+    tokens = result["output_tokens"]
+    request_metrics.requests[priority].inc()
+    request_metrics.output_tokens[priority].inc(tokens)
+    for target, ok in goodput_met(result).items():
+        if ok:
+            request_metrics.goodput_requests[target, priority].inc()
+            request_metrics.goodput_tokens[target, priority].inc(tokens)
+
+def record_slo(priority: str, result: Dict):
+    """
+    Sliding-window SLO and goodput trackers behind /v1/performance/current.
+    In multi-worker mode the engine process records them for every worker
+    (see engine_handlers), so the windows cover all traffic.
+    """
+    decode_tokens = max(result["output_tokens"] - 1, 1)
+    tpot_ms = result.get("tpot_ms") or (result["total_latency_ms"] - result["ttft_ms"]) / decode_tokens
+    slo_tracker.record(result["ttft_ms"], tpot_ms, result["total_latency_ms"])
+    goodput_tracker.record(priority, result["output_tokens"], goodput_met(result))
+
+def record_slo_error(priority: str):
+    slo_tracker.record_error()
+    goodput_tracker.record_error(priority)
+
+def slo_snapshot() -> Dict:
+    return {
+        "windows": slo_tracker.snapshot(slo_objectives(config)),
+        "goodput": goodput_tracker.snapshot(),
+    }
 
-    # Shutdown
-    cleanup_task.cancel()
-    gpu_monitor.shutdown()
-    print("Inference server shutdown complete")
+async def _record_error(priority: str = "normal"):
+    request_metrics.error.inc()
+    request_metrics.requests[priority].inc()
+    if not isinstance(inference_engine, RemoteInferenceEngine):
+        record_slo_error(priority)
+        return
+    try:
+        await inference_engine.client.call("record_error", priority=priority)
+    except EngineUnavailableError:
+        pass  # Engine gone: nothing left to record it in
 
-app = FastAPI(
-    title="Forge Cognition Inference Server",
-    description="Prototype LLM inference server for Honeywell Forge Cognition",
-    version="0.1.0",
-    lifespan=lifespan
+async def record_turn(session_id: str, priority: str, result: Dict) -> Dict:
+    """
+    Metrics, SLO/goodput and session stats for one completed turn (HTTP or
+    WebSocket); returns the metrics block sent to the client.
+    """
+    request_metrics.ttft.observe(result["ttft_ms"] / 1000)
+    request_metrics.tokens_per_second.observe(result["tokens_per_second"])
+    request_metrics.total_latency.observe(result["total_latency_ms"] / 1000)
+    request_metrics.success.inc()
+    record_goodput(priority, result)
+    if not isinstance(inference_engine, RemoteInferenceEngine):
+        record_slo(priority, result)
+    inference_engine.record_first_request(result["total_latency_ms"])
+    inference_engine.record_served()
+
+    # Update session stats
+    await session_manager.update_session(
+        session_id,
+        result["output_tokens"],
+        result["total_latency_ms"]
+    )
+    return {
+        "ttft_ms": result["ttft_ms"],
+        "total_latency_ms": result["total_latency_ms"],
+        "tokens_per_second": result["tokens_per_second"],
+        "input_tokens": result["input_tokens"],
+        "output_tokens": result["output_tokens"]
+    }
+
+def inference_error(e: Exception) -> HTTPException:
+    """Map an inference failure to the HTTP error clients see"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, NoReplicaAvailableError):
+        # All replicas ejected or circuit-broken: fail fast, tell clients when to retry
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after_s + 0.999))}
+        )
+    if isinstance(e, EngineUnavailableError):
+        # Engine process down or restarting (multi-worker mode)
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if isinstance(e, BackendError):
+        return HTTPException(status_code=502, detail=str(e))
+    if isinstance(e, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail="Inference backend timed out")
+    return HTTPException(status_code=500, detail=str(e))
+
+async def start_grpc(port: int):
+    """Serve forge_inference.proto on port; None when grpcio or the stubs are missing"""
+    try:
+        from grpc_server import ForgeInferenceServicer, start_grpc_server
+    except ImportError as e:
+        print(f"gRPC API disabled: {e}")
+        return None
+    servicer = ForgeInferenceServicer(
+        session_manager, inference_engine, record_turn, _record_error, inference_error
+    )
+    try:
+        grpc_server = await start_grpc_server(port, servicer)
+    except RuntimeError as e:
+        print(f"gRPC API disabled: could not bind port {port}: {e}")
+        return None
+    print(f"gRPC API listening on port {port}")
+    return grpc_server
+
+# Slowest traced requests, served at /v1/debug/slow
+slow_requests = SlowRequestLog(
+    int(os.environ.get("FORGE_SLOW_REQUEST_LOG_SIZE", "50")),
+    window=int(os.environ.get("FORGE_SLOW_REQUEST_WINDOW", "1000"))
 )
 
+TRACED_PATHS = ("/v1/chat",)
+
+async def trace_requests(request: Request, call_next):
+    """
+    Phase tracing for inference requests: the handler marks its phases on
+    request.state.trace. The handler encodes its response inside the
+    serialize phase; whatever remains after it returns is added to it.
+    """
+    if request.url.path not in TRACED_PATHS:
+        return await call_next(request)
+
+    trace = RequestTrace()
+    request.state.trace = trace
+    response = await call_next(request)
+    trace.mark("serialize")
+    trace.meta.update(path=request.url.path, status_code=response.status_code)
+
+    response.headers["Server-Timing"] = trace.server_timing()
+    trace.observe()
+    slow_requests.record(trace)
+    return response
+
+def create_app() -> FastAPI:
+    """App factory; runtime state is created by the lifespan on startup"""
+    app = FastAPI(
+        title="Forge Cognition Inference Server",
+        description="Prototype LLM inference server for Honeywell Forge Cognition",
+        version="0.1.0",
+        lifespan=lifespan
+    )
+    app.middleware("http")(trace_requests)
+    app.include_router(router)
+    return app
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
 
-@app.get("/health", response_model=HealthResponse)
+@router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint with GPU stats and SKU info"""
     return HealthResponse(
-        status="healthy" if inference_engine.loaded else "loading",
+        status=_readiness_status(),
         model_loaded=inference_engine.loaded,
-        active_sessions=len(session_manager.sessions),
+        active_sessions=len(await session_manager.get_all_sessions()),
         gpu_stats=gpu_monitor.get_gpu_stats(),
         sku=config.sku_name,
         sku_description=config.sku_description
     )
 
-@app.get("/v1/sku")
+def _readiness_status() -> str:
+    if inference_engine.ready:
+        return "healthy"
+    if inference_engine.load_error is not None:
+        return "failed"
+    return "warming" if inference_engine.loaded else "loading"
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and serving HTTP"""
+    return {"status": "alive"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe: 200 only once the model is loaded and warmed up,
+    so Kubernetes does not route traffic to a cold replica.
+    """
+    body = {
+        "status": _readiness_status(),
+        "model_loaded": inference_engine.loaded,
+        "load_error": inference_engine.load_error,
+        "pre_ready_queue_depth": inference_engine.pre_ready_waiting,
+        "warmup_duration_s": round(inference_engine.warmup_duration_s, 3),
+        "warmup": inference_engine.warmup_summary,
+    }
+    return JSONResponse(content=body, status_code=200 if inference_engine.ready else 503)
+
+@router.get("/v1/sku")
 async def get_sku_info():
     """Get detailed SKU information and applied configuration"""
     return {
@@ -716,87 +2118,301 @@ async def get_sku_info():
         "gpu_info": gpu_monitor.get_gpu_stats()
     }
 
-@app.post("/v1/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+@router.post("/v1/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, http_request: Request):
     """
     Main inference endpoint.
     Handles session management and tracks metrics.
     """
+    trace = getattr(http_request.state, "trace", None) or RequestTrace()
+    trace.mark("parse")
+
     # Create or get session
     if request.session_id:
         session = await session_manager.get_session(request.session_id)
         session_id = session.session_id
     else:
         session_id = await session_manager.create_session()
+    trace.mark("session")
+    trace.meta["session_id"] = session_id
 
     try:
         # Run inference
+        prompt = request.prompt
+        if request.use_history:
+            prompt = await session_manager.build_prompt(session_id, request.prompt)
+        # Cached for the engine, the pool's routing cost and the backend
+        await tokenization.get_service().count_async(prompt)
+        trace.mark("tokenize")
+        generate_start = time.perf_counter()
         result = await inference_engine.generate(
-            prompt=request.prompt,
+            prompt=prompt,
             max_tokens=request.max_tokens,
-            temperature=request.temperature
+            temperature=request.temperature,
+            session_id=session_id,
+            priority=request.priority
         )
+        # Whatever the engine did not spend generating was spent waiting
+        generate_ms = (time.perf_counter() - generate_start) * 1000
+        trace.add("queue", generate_ms - result["total_latency_ms"])
+        trace.add("prefill", result["ttft_ms"])
+        trace.add("decode", result["total_latency_ms"] - result["ttft_ms"])
+        trace.skip()
+        trace.meta.update(input_tokens=result["input_tokens"], output_tokens=result["output_tokens"])
+
+        metrics = await record_turn(session_id, request.priority, result)
+        if request.use_history:
+            await session_manager.append_turn(session_id, request.prompt, result["text"])
+        trace.mark("postprocess")
+
+        # Same shape as ChatResponse, built as a dict and encoded once (here)
+        response = FastJSONResponse({
+            "session_id": session_id,
+            "response": result["text"],
+            "metrics": metrics,
+            "clamped": result["clamped"],
+            "effective_max_tokens": result["effective_max_tokens"]
+        })
+        trace.mark("serialize")
+        return response
 
-        # Record metrics
-        TTFT_HISTOGRAM.labels(model=config.model_name).observe(result["ttft_ms"] / 1000)
-        TOKENS_PER_SECOND.labels(model=config.model_name).observe(result["tokens_per_second"])
-        TOTAL_LATENCY.labels(model=config.model_name).observe(result["total_latency_ms"] / 1000)
-        REQUEST_COUNT.labels(status="success", model=config.model_name).inc()
-
-        # Update session stats
-        await session_manager.update_session(
-            session_id,
-            result["output_tokens"],
-            result["total_latency_ms"]
-        )
+    except Exception as e:
+        await _record_error(request.priority)
+        raise inference_error(e)
 
-        return ChatResponse(
+@router.websocket("/v1/ws")
+async def session_channel(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Persistent multi-turn channel bound to one session. Pass ?session_id=
+    to attach to an existing session; otherwise one is created for the
+    connection and closed when it ends. The server keeps the conversation,
+    so each turn carries only the new prompt.
+
+      client: {"type": "turn", "prompt": ..., "max_tokens"?, "temperature"?, "priority"?}
+              {"type": "cancel"}
+      server: {"type": "session", "session_id": ...}
+              {"type": "token", "text": ...}  (one per streamed chunk)
+              {"type": "done", "response": ..., "metrics": {...}, "clamped": ..., "effective_max_tokens": ...}
+              {"type": "cancelled"} | {"type": "error", "status": ..., "detail": ...}
+
+    If the session expires or is closed while the socket is open, the next
+    turn gets a 404 error frame and the socket is closed (1008).
+    """
+    await websocket.accept()
+    owns_session = session_id is None
+    try:
+        if owns_session:
+            session_id = await session_manager.create_session()
+        else:
+            await session_manager.get_session(session_id)
+    except HTTPException as e:
+        await _ws_send(websocket, {"type": "error", "status": e.status_code, "detail": e.detail})
+        await websocket.close(code=1013 if e.status_code == 503 else 1008)
+        return
+    await _ws_send(websocket, {"type": "session", "session_id": session_id})
+
+    turn_task: Optional[asyncio.Task] = None
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                kind = message.get("type")
+            except (ValueError, AttributeError):
+                await _ws_send(websocket, {"type": "error", "status": 400, "detail": "Expected a JSON object"})
+                continue
+
+            if kind == "cancel":
+                if turn_task is not None and not turn_task.done():
+                    turn_task.cancel()
+            elif kind != "turn":
+                await _ws_send(websocket, {"type": "error", "status": 400, "detail": f"Unknown message type: {kind}"})
+            elif turn_task is not None and not turn_task.done():
+                await _ws_send(websocket, {"type": "error", "status": 409, "detail": "A turn is already in progress"})
+            else:
+                try:
+                    turn = ChatRequest.model_validate(message)
+                except ValueError as e:
+                    await _ws_send(websocket, {"type": "error", "status": 422, "detail": str(e)})
+                    continue
+                try:
+                    await session_manager.get_session(session_id)
+                except HTTPException as e:
+                    # Expired or closed while the socket stayed open
+                    await _ws_send(websocket, {"type": "error", "status": e.status_code, "detail": e.detail})
+                    await websocket.close(code=1008)
+                    return
+                turn_task = asyncio.create_task(_stream_turn(websocket, session_id, turn))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if turn_task is not None:
+            turn_task.cancel()
+        if owns_session:
+            await session_manager.close_session(session_id)
+            await inference_engine.forget_session(session_id)
+
+async def _ws_send(websocket: WebSocket, message: Dict):
+    await websocket.send_text(encode_json(message).decode("utf-8"))
+
+async def _stream_turn(websocket: WebSocket, session_id: str, turn: ChatRequest):
+    """Run one WebSocket turn: stream chunks, then record it like /v1/chat"""
+    try:
+        prompt = await session_manager.build_prompt(session_id, turn.prompt)
+        result = None
+        stream = inference_engine.generate_stream(
+            prompt=prompt,
+            max_tokens=turn.max_tokens,
+            temperature=turn.temperature,
             session_id=session_id,
-            response=result["text"],
-            metrics={
-                "ttft_ms": result["ttft_ms"],
-                "total_latency_ms": result["total_latency_ms"],
-                "tokens_per_second": result["tokens_per_second"],
-                "input_tokens": result["input_tokens"],
-                "output_tokens": result["output_tokens"]
-            }
+            priority=turn.priority
         )
-
+        async with aclosing(stream) as chunks:
+            async for chunk in chunks:
+                if chunk["text"]:
+                    await _ws_send(websocket, {"type": "token", "text": chunk["text"]})
+                if chunk["finished"]:
+                    result = chunk["result"]
+
+        metrics = await record_turn(session_id, turn.priority, result)
+        await session_manager.append_turn(session_id, turn.prompt, result["text"])
+        await _ws_send(websocket, {
+            "type": "done",
+            "response": result["text"],
+            "metrics": metrics,
+            "clamped": result["clamped"],
+            "effective_max_tokens": result["effective_max_tokens"]
+        })
+    except asyncio.CancelledError:
+        # In-band cancel (or disconnect): the backend request was closed with the stream
+        try:
+            await _ws_send(websocket, {"type": "cancelled"})
+        except Exception:
+            pass  # Connection already gone
+        raise
     except Exception as e:
-        REQUEST_COUNT.labels(status="error", model=config.model_name).inc()
-        raise HTTPException(status_code=500, detail=str(e))
+        await _record_error(turn.priority)
+        error = inference_error(e)
+        try:
+            await _ws_send(websocket, {"type": "error", "status": error.status_code, "detail": error.detail})
+        except Exception:
+            pass
 
-@app.post("/v1/sessions")
+@router.post("/v1/sessions")
 async def create_session():
     """Create a new inference session"""
     session_id = await session_manager.create_session()
     return {"session_id": session_id}
 
-@app.delete("/v1/sessions/{session_id}")
+@router.delete("/v1/sessions/{session_id}")
 async def close_session(session_id: str):
     """Close an inference session"""
     await session_manager.close_session(session_id)
+    await inference_engine.forget_session(session_id)
     return {"status": "closed", "session_id": session_id}
 
-@app.get("/v1/sessions")
+@router.get("/v1/sessions")
 async def list_sessions():
     """List all active sessions"""
     sessions = await session_manager.get_all_sessions()
+    histories = await session_manager.history_stats()
     return {
         "count": len(sessions),
         "max_sessions": config.max_concurrent_sessions,
+        "history_memory_bytes": sum(h["memory_bytes"] for h in histories.values()),
+        "snapshot": await session_manager.snapshot_stats(),
         "sessions": [
             {
                 "session_id": s.session_id,
                 "request_count": s.request_count,
                 "total_tokens": s.total_tokens,
-                "avg_latency_ms": round(s.avg_latency_ms, 2)
+                "avg_latency_ms": round(s.avg_latency_ms, 2),
+                "history": histories.get(s.session_id)
             }
             for s in sessions
         ]
     }
 
-@app.get("/v1/gpu/stats")
+@router.get("/v1/replicas")
+async def list_replicas():
+    """Per-replica load and health of the backend pool"""
+    stats = await inference_engine.replica_stats()
+    if stats is None:
+        return {"backend": "builtin", "replicas": []}
+    return {
+        "backend": inference_engine.backend_name,
+        **stats
+    }
+
+@router.get("/v1/tokenizer")
+async def tokenizer_stats():
+    """Tokenizer in use and token count cache statistics (this worker)"""
+    return tokenization.get_service().stats()
+
+@router.get("/v1/debug/slow")
+async def slowest_requests(limit: int = 20):
+    """Slowest of the recent /v1/chat requests with their per-phase breakdown"""
+    return {
+        "capacity": slow_requests.size,
+        "window": slow_requests.window,
+        "recent_requests": len(slow_requests),
+        "requests": slow_requests.slowest(limit)
+    }
+
+# Profiling is off unless FORGE_DEBUG_TOKEN is set; callers must send it
+DEBUG_TOKEN = os.environ.get("FORGE_DEBUG_TOKEN")
+MAX_PROFILE_SECONDS = 60.0
+_profile_lock = asyncio.Lock()
+
+def _check_debug_token(token: Optional[str]):
+    if not DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Debug endpoints disabled (set FORGE_DEBUG_TOKEN)")
+    if token is None or not hmac.compare_digest(token.encode(), DEBUG_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+@router.get("/v1/debug/profile")
+async def profile(
+    seconds: float = 10.0,
+    hz: float = 100.0,
+    blocking_ms: float = 50.0,
+    format: str = "json",
+    x_forge_debug_token: Optional[str] = Header(None)
+):
+    """
+    Sample every thread's stack for `seconds` and return collapsed stacks
+    (flame-graph ready; format=collapsed for plain text) plus an event-loop
+    blocking report. One profile at a time; requires X-Forge-Debug-Token.
+    """
+    _check_debug_token(x_forge_debug_token)
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or not 1 <= hz <= 1000:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS:.0f}] and hz in [1, 1000]"
+        )
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(
+            interval_s=1.0 / hz,
+            loop_thread_id=threading.get_ident(),
+            blocking_threshold_ms=blocking_ms
+        )
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return profiler.report()
+
+@router.get("/v1/debug/loop")
+async def event_loop_stats():
+    """Event-loop lag summary and, in debug mode, stacks of blocking calls"""
+    return loop_monitor.stats()
+
+@router.get("/v1/gpu/stats")
 async def gpu_stats():
     """Get current GPU statistics"""
     return {
@@ -804,7 +2420,7 @@ async def gpu_stats():
         "gpus": gpu_monitor.get_gpu_stats()
     }
 
-@app.get("/v1/gpu/thermal")
+@router.get("/v1/gpu/thermal")
 async def gpu_thermal():
     """
     Get GPU thermal status and throttling information.
@@ -838,21 +2454,29 @@ async def gpu_thermal():
         }
     }
 
-@app.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint"""
-    # Update GPU metrics before returning
-    gpu_monitor.get_gpu_stats()
-    return Response(
-        content=generate_latest(),
-        media_type=CONTENT_TYPE_LATEST
-    )
+@router.get("/metrics")
+async def metrics(accept_encoding: Optional[str] = Header(None)):
+    """
+    Prometheus metrics endpoint. Serves the exposition rendered by
+    metrics_exposition.refresh_loop (gzipped when the scraper accepts it),
+    so scrapes do no NVML or rendering work on the event loop.
+    """
+    if metrics_exposition.body is None:
+        await metrics_exposition.refresh()
+    if accept_encoding and "gzip" in accept_encoding:
+        return Response(
+            content=metrics_exposition.gzipped,
+            media_type=CONTENT_TYPE_LATEST,
+            headers={"Content-Encoding": "gzip"}
+        )
+    return Response(content=metrics_exposition.body, media_type=CONTENT_TYPE_LATEST)
 
-@app.get("/v1/config")
+@router.get("/v1/config")
 async def get_config():
     """Get current server configuration"""
     return {
         "model_name": config.model_name,
+        "inference_backend": inference_engine.backend_name,
         "max_concurrent_sessions": config.max_concurrent_sessions,
         "max_tokens": config.max_tokens,
         "target_ttft_ms": config.target_ttft_ms,
@@ -863,7 +2487,7 @@ async def get_config():
         "quantization": config.quantization,
     }
 
-@app.get("/v1/tensorrt-llm/config")
+@router.get("/v1/tensorrt-llm/config")
 async def get_tensorrt_llm_config():
     """
     Get TensorRT-LLM specific performance settings.
@@ -901,7 +2525,7 @@ async def get_tensorrt_llm_config():
         }
     }
 
-@app.get("/v1/performance/targets")
+@router.get("/v1/performance/targets")
 async def get_performance_targets():
     """Get performance targets for this SKU (for monitoring/alerting)"""
     return {
@@ -924,19 +2548,80 @@ async def get_performance_targets():
             "warning_threshold_percent": config.gpu_memory_threshold * 100 - 10,
             "critical_threshold_percent": config.gpu_memory_threshold * 100,
             "description": "GPU memory thresholds for alerting"
+        },
+        "goodput": {
+            "ttft": f"ttft_ms <= {config.target_ttft_ms}",
+            "ttft_p99": f"ttft_ms <= {config.target_ttft_p99_ms}",
+            "tps": f"tokens_per_second >= {config.target_tps}",
+            "all": "ttft and tps",
+            "description": "A request counts toward goodput for each target it met; see /v1/performance/current"
         }
     }
 
+@router.get("/v1/performance/current")
+async def get_performance_current():
+    """
+    Live TTFT / TPOT / end-to-end percentiles over 1, 5 and 15 minute
+    sliding windows, with SLO attainment and error-budget burn rate
+    against this SKU's targets. Works without Prometheus. In multi-worker
+    mode the windows come from the engine process and cover all workers.
+    """
+    if isinstance(inference_engine, RemoteInferenceEngine):
+        windows = await inference_engine.client.call("slo_snapshot")
+    else:
+        windows = slo_snapshot()
+    return {
+        "sku": config.sku_name,
+        "targets": {
+            "ttft_target_ms": config.target_ttft_ms,
+            "ttft_p99_target_ms": config.target_ttft_p99_ms,
+            "tokens_per_second_target": config.target_tps,
+        },
+        **windows,
+        "degradation": await inference_engine.degradation_stats(),
+    }
+
+app = create_app()
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
 # ============================================================================
 # Main
 # ============================================================================
 
 if __name__ == "__main__":
+    import multiprocessing
+    import tempfile
     import uvicorn
-    uvicorn.run(
-        "server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=False,
-        log_level="info"
-    )
+
+    workers = int(os.environ.get("FORGE_WORKERS", "1"))
+    engine_process = None
+    if workers > 1:
+        # Children inherit these; prometheus_client reads the dir at import
+        os.environ.setdefault("FORGE_ENGINE_SOCKET", "/tmp/forge-engine.sock")
+        prom_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="forge-prom-"))
+        for name in os.listdir(prom_dir):
+            if not name.endswith(f"_{os.getpid()}.db"):
+                os.unlink(os.path.join(prom_dir, name))  # Stale files from a previous run
+
+        engine_process = multiprocessing.get_context("spawn").Process(
+            target=run_engine_process,
+            args=(os.environ["FORGE_ENGINE_SOCKET"],),
+            name="forge-engine"
+        )
+        engine_process.start()
+        print(f"Multi-worker mode: {workers} HTTP workers, engine pid {engine_process.pid}")
+
+    try:
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+            reload=False,
+            log_level="info"
+        )
+    finally:
+        if engine_process is not None:
+            engine_process.terminate()
+            engine_process.join(timeout=30)
@@ -0,0 +1,286 @@
+"""
+Honeywell Forge Cognition - Session Snapshots
+
+Sessions and their conversation history otherwise live only in the engine's
+memory, so every restart or rolling upgrade sends all clients back to a new
+session with a cold context at the same time. SessionStore keeps them in a
+local append-only log:
+
+  header   b"FSS1"
+  record   4-byte big-endian length + 4-byte CRC32 + JSON object
+
+  {"t": "s", "s": {...}}                    session metadata (upsert)
+  {"t": "m", "id": ..., "r": 0|1, "x": ...} one history message (user|assistant)
+  {"t": "c", "id": ...}                     session closed
+
+Snapshots are incremental: SessionManager journals changes as they happen
+and flushes them every interval_s as one append. Metadata updates to the
+same session coalesce into one record per flush. Once the log has grown to
+compact_ratio times the live state, it is rewritten from the live sessions
+(temp file + rename, so a crash leaves the old or the new log, never half).
+A torn record at the tail (crash mid-append) is dropped on load.
+
+Restore runs in the background and does not delay readiness. Requests for
+unknown session IDs wait for it, and the other requests do not. Histories
+are rebuilt (and tokenized) on a session's first turn, not all at once.
+Timings are exported as forge_session_snapshot_seconds{kind} and
+forge_session_restore_seconds.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Tuple
+
+from prometheus_client import Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FSS1"
+_HEADER = struct.Struct(">II")  # Payload length, CRC32 of the payload
+
+SNAPSHOT_LATENCY = Histogram(
+    'forge_session_snapshot_seconds',
+    'Session snapshot write time in seconds (incremental append or full compaction)',
+    ['kind'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+SNAPSHOT_LOG_BYTES = Gauge(
+    'forge_session_snapshot_log_bytes',
+    'Size of the session snapshot log',
+    multiprocess_mode='livemax'
+)
+
+RESTORE_SECONDS = Gauge(
+    'forge_session_restore_seconds',
+    'Time to read and replay the session snapshot log at startup',
+    multiprocess_mode='livemax'
+)
+
+RESTORED_SESSIONS = Gauge(
+    'forge_sessions_restored',
+    'Sessions restored from the snapshot log at startup',
+    multiprocess_mode='livemax'
+)
+
+_SNAPSHOT_LATENCY = {kind: SNAPSHOT_LATENCY.labels(kind=kind) for kind in ("incremental", "compaction")}
+
+
+@dataclass
+class SessionStoreConfig:
+    """config.yaml `session_store:` section"""
+    path: str = ""                          # Snapshot log ("" disables snapshots)
+    interval_s: float = 2.0                 # Flush journaled changes this often
+    fsync: bool = True                      # fsync every flush (off: page cache only)
+    compact_min_bytes: int = 4 * 1024 * 1024  # Never compact a smaller log
+    compact_ratio: float = 4.0              # Compact once the log is this many times the live state
+
+
+# ============================================================================
+# Records
+# ============================================================================
+
+def session_record(session: Dict) -> Dict:
+    return {"t": "s", "s": session}
+
+
+def message_record(session_id: str, role: int, text: str) -> Dict:
+    return {"t": "m", "id": session_id, "r": role, "x": text}
+
+
+def close_record(session_id: str) -> Dict:
+    return {"t": "c", "id": session_id}
+
+
+@dataclass
+class RestoredSession:
+    """One session as replayed from the log"""
+    session: Dict
+    messages: Deque[Tuple[int, str]] = field(default_factory=deque)
+
+
+def replay(records: List[Dict], max_messages: int) -> Dict[str, RestoredSession]:
+    """Fold log records into the last state of each open session"""
+    sessions: Dict[str, RestoredSession] = {}
+    for record in records:
+        kind = record.get("t")
+        if kind == "s":
+            session = record["s"]
+            restored = sessions.get(session["session_id"])
+            if restored is None:
+                sessions[session["session_id"]] = RestoredSession(session, deque(maxlen=max_messages))
+            else:
+                restored.session = session
+        elif kind == "m":
+            restored = sessions.get(record["id"])
+            if restored is not None:
+                restored.messages.append((record["r"], record["x"]))
+        elif kind == "c":
+            sessions.pop(record["id"], None)
+    return sessions
+
+
+# ============================================================================
+# Log file
+# ============================================================================
+
+def _encode(records: List[Dict]) -> bytes:
+    out = bytearray()
+    for record in records:
+        payload = json.dumps(record, separators=(",", ":")).encode()
+        out += _HEADER.pack(len(payload), zlib.crc32(payload))
+        out += payload
+    return bytes(out)
+
+
+class SessionStore:
+    """
+    Append-only snapshot log. Methods block on disk I/O; SessionManager
+    calls them through asyncio.to_thread. A write still running when its
+    caller is cancelled (shutdown) finishes before the next one starts.
+    """
+
+    def __init__(self, cfg: SessionStoreConfig):
+        self.config = cfg
+        self.path = cfg.path
+        self._io_lock = threading.Lock()
+        self._file = None
+        self.size = 0
+        self.live_bytes = 0  # Size right after the last compaction
+        self.last_snapshot: Dict = {}
+        self.last_restore: Dict = {}
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(MAGIC)
+                self._file.flush()
+            self.size = self._file.tell()
+            SNAPSHOT_LOG_BYTES.set(self.size)
+
+    def _sync(self, f):
+        f.flush()
+        if self.config.fsync:
+            os.fsync(f.fileno())
+
+    def load(self) -> List[Dict]:
+        """All intact records; a torn or corrupt tail is truncated away"""
+        with self._io_lock:
+            return self._load()
+
+    def _load(self) -> List[Dict]:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        if not data:
+            return []
+        if not data.startswith(MAGIC):
+            logger.warning(f"{self.path} is not a session snapshot log; starting empty")
+            os.replace(self.path, self.path + ".bad")
+            return []
+
+        records, offset = [], len(MAGIC)
+        while offset + _HEADER.size <= len(data):
+            length, crc = _HEADER.unpack_from(data, offset)
+            payload = data[offset + _HEADER.size:offset + _HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            records.append(json.loads(payload))
+            offset += _HEADER.size + length
+        if offset < len(data):
+            logger.warning(f"Dropping {len(data) - offset} bytes of torn records at the end of {self.path}")
+            os.truncate(self.path, offset)
+        self.size = self.live_bytes = offset
+        SNAPSHOT_LOG_BYTES.set(self.size)
+        return records
+
+    def append(self, records: List[Dict]) -> int:
+        """Append records as one write; returns the bytes written"""
+        data = _encode(records)
+        with self._io_lock:
+            self._open()
+            self._file.write(data)
+            self._sync(self._file)
+            self.size += len(data)
+        SNAPSHOT_LOG_BYTES.set(self.size)
+        return len(data)
+
+    def needs_compaction(self) -> bool:
+        return (
+            self.size >= self.config.compact_min_bytes
+            and self.size > self.config.compact_ratio * max(self.live_bytes, 1)
+        )
+
+    def rewrite(self, records: List[Dict]) -> int:
+        """Replace the log with records (the full live state); returns its size"""
+        data = _encode(records)
+        with self._io_lock:
+            return self._rewrite(data)
+
+    def _rewrite(self, data: bytes) -> int:
+        tmp_path = self.path + ".tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(data)
+            self._sync(f)
+            size = f.tell()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(tmp_path, self.path)
+        if self.config.fsync:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        self._open()
+        self.live_bytes = size
+        return size
+
+    def record_snapshot(self, kind: str, seconds: float, records: int, nbytes: int):
+        _SNAPSHOT_LATENCY[kind].observe(seconds)
+        self.last_snapshot = {
+            "kind": kind,
+            "at": time.time(),
+            "duration_ms": round(seconds * 1000, 3),
+            "records": records,
+            "bytes": nbytes,
+        }
+
+    def record_restore(self, seconds: float, sessions: int, skipped: int, records: int):
+        RESTORE_SECONDS.set(seconds)
+        RESTORED_SESSIONS.set(sessions)
+        self.last_restore = {
+            "duration_ms": round(seconds * 1000, 3),
+            "records": records,
+            "sessions": sessions,
+            "skipped": skipped,
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "log_bytes": self.size,
+            "live_bytes": self.live_bytes,
+            "last_snapshot": self.last_snapshot or None,
+            "restore": self.last_restore or None,
+        }
+
+    def close(self):
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
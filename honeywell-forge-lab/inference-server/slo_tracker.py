@@ -0,0 +1,244 @@
+"""
+Honeywell Forge Cognition - Sliding-Window SLO Tracker
+
+On-box latency percentiles, SLO attainment and goodput for edge boxes
+without Prometheus. Each metric (TTFT, TPOT, end-to-end latency) is recorded into a
+ring of fixed-length time slots; each slot holds a DDSketch-style
+log-bucketed histogram with 1% relative accuracy. A 1, 5 or 15 minute view
+merges the slots it covers. Memory is bounded by slots x buckets, whatever
+the request rate.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+WINDOWS_S = {"1m": 60, "5m": 300, "15m": 900}
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LogSketch:
+    """Relative-error quantile sketch (DDSketch): log-spaced buckets"""
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "LogSketch"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Bucket midpoint in log space: within relative_accuracy of the true value
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return None
+
+    def fraction_at_or_below(self, value: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        limit = self._index(value)
+        return sum(c for i, c in self.buckets.items() if i <= limit) / self.count
+
+
+class SlidingWindowSketch:
+    """Ring of per-slot sketches covering the longest window"""
+
+    def __init__(self, horizon_s: int = 900, slot_s: int = 10, relative_accuracy: float = 0.01):
+        self.slot_s = slot_s
+        self.relative_accuracy = relative_accuracy
+        self._slots: List[Optional[LogSketch]] = [None] * (horizon_s // slot_s)
+        self._slot_ids: List[int] = [-1] * len(self._slots)
+
+    def _slot(self, now: float) -> LogSketch:
+        slot_id = int(now // self.slot_s)
+        pos = slot_id % len(self._slots)
+        if self._slot_ids[pos] != slot_id:
+            # Reuse the expired slot
+            self._slots[pos] = LogSketch(self.relative_accuracy)
+            self._slot_ids[pos] = slot_id
+        return self._slots[pos]
+
+    def add(self, value: float, now: Optional[float] = None):
+        self._slot(time.time() if now is None else now).add(value)
+
+    def window(self, seconds: int, now: Optional[float] = None) -> LogSketch:
+        now = time.time() if now is None else now
+        newest = int(now // self.slot_s)
+        oldest = newest - max(1, seconds // self.slot_s) + 1
+        merged = LogSketch(self.relative_accuracy)
+        for slot_id, sketch in zip(self._slot_ids, self._slots):
+            if sketch is not None and oldest <= slot_id <= newest:
+                merged.merge(sketch)
+        return merged
+
+
+class SlidingCounter:
+    """Event count per slot over the same ring layout"""
+
+    def __init__(self, horizon_s: int = 900, slot_s: int = 10):
+        self.slot_s = slot_s
+        self._counts = [0] * (horizon_s // slot_s)
+        self._slot_ids = [-1] * len(self._counts)
+
+    def add(self, n: int = 1, now: Optional[float] = None):
+        slot_id = int((time.time() if now is None else now) // self.slot_s)
+        pos = slot_id % len(self._counts)
+        if self._slot_ids[pos] != slot_id:
+            self._counts[pos] = 0
+            self._slot_ids[pos] = slot_id
+        self._counts[pos] += n
+
+    def window(self, seconds: int, now: Optional[float] = None) -> int:
+        newest = int((time.time() if now is None else now) // self.slot_s)
+        oldest = newest - max(1, seconds // self.slot_s) + 1
+        return sum(c for s, c in zip(self._slot_ids, self._counts) if oldest <= s <= newest)
+
+
+def _percentiles(sketch: LogSketch) -> Dict[str, Optional[float]]:
+    result = {}
+    for q in QUANTILES:
+        value = sketch.quantile(q)
+        result[f"p{round(q * 100)}"] = round(value, 2) if value is not None else None
+    return result
+
+
+@dataclass
+class SLOObjective:
+    """`target` of requests must have `metric` at or below `threshold_ms`"""
+    name: str
+    metric: str
+    threshold_ms: float
+    target: float
+
+
+class SLOTracker:
+    """Sliding-window percentiles, SLO attainment and error-budget burn rate"""
+
+    METRICS = ("ttft_ms", "tpot_ms", "e2e_ms")
+
+    def __init__(self, horizon_s: int = max(WINDOWS_S.values()), slot_s: int = 10):
+        self.sketches = {m: SlidingWindowSketch(horizon_s, slot_s) for m in self.METRICS}
+        self.errors = SlidingCounter(horizon_s, slot_s)
+
+    def record(self, ttft_ms: float, tpot_ms: float, e2e_ms: float):
+        now = time.time()
+        self.sketches["ttft_ms"].add(ttft_ms, now)
+        self.sketches["tpot_ms"].add(tpot_ms, now)
+        self.sketches["e2e_ms"].add(e2e_ms, now)
+
+    def record_error(self):
+        self.errors.add()
+
+    def snapshot(self, objectives: Sequence[SLOObjective]) -> Dict:
+        now = time.time()
+        windows = {}
+        for label, seconds in WINDOWS_S.items():
+            merged = {m: s.window(seconds, now) for m, s in self.sketches.items()}
+            requests = merged["e2e_ms"].count
+            errors = self.errors.window(seconds, now)
+            slos = []
+            for objective in objectives:
+                attainment = merged[objective.metric].fraction_at_or_below(objective.threshold_ms)
+                burn_rate = None
+                if attainment is not None:
+                    # 1.0 = spending the error budget exactly as fast as allowed
+                    burn_rate = round((1 - attainment) / max(1 - objective.target, 1e-9), 3)
+                    attainment = round(attainment, 4)
+                slos.append({
+                    "name": objective.name,
+                    "metric": objective.metric,
+                    "threshold_ms": objective.threshold_ms,
+                    "target": objective.target,
+                    "attainment": attainment,
+                    "burn_rate": burn_rate,
+                })
+            windows[label] = {
+                "requests": requests,
+                "errors": errors,
+                "error_rate": round(errors / (requests + errors), 4) if requests + errors else None,
+                "percentiles_ms": {m: _percentiles(sketch) for m, sketch in merged.items()},
+                "slo": slos,
+            }
+        return windows
+
+
+class GoodputTracker:
+    """
+    Requests and output tokens per second that met each target, per
+    priority class, over the same sliding windows. A request counts toward
+    a target's goodput only if it succeeded and met that target.
+    """
+
+    def __init__(self, targets: Sequence[str], horizon_s: int = max(WINDOWS_S.values()), slot_s: int = 10):
+        self.targets = tuple(targets)
+        self.horizon_s = horizon_s
+        self.slot_s = slot_s
+        self._counters: Dict[tuple, SlidingCounter] = {}
+
+    def _add(self, key: tuple, n: int, now: float):
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = SlidingCounter(self.horizon_s, self.slot_s)
+        counter.add(n, now)
+
+    def record(self, priority: str, output_tokens: int, met: Dict[str, bool]):
+        now = time.time()
+        self._add((priority, "requests", None), 1, now)
+        self._add((priority, "tokens", None), output_tokens, now)
+        for target in self.targets:
+            if met.get(target):
+                self._add((priority, "requests", target), 1, now)
+                self._add((priority, "tokens", target), output_tokens, now)
+
+    def record_error(self, priority: str):
+        self._add((priority, "requests", None), 1, time.time())
+
+    def _count(self, priority: str, kind: str, target: Optional[str], seconds: int, now: float) -> int:
+        counter = self._counters.get((priority, kind, target))
+        return counter.window(seconds, now) if counter is not None else 0
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        priorities = sorted({key[0] for key in self._counters})
+        windows = {}
+        for label, seconds in WINDOWS_S.items():
+            by_priority = {}
+            for priority in priorities:
+                requests = self._count(priority, "requests", None, seconds, now)
+                tokens = self._count(priority, "tokens", None, seconds, now)
+                entry = {
+                    "requests_per_s": round(requests / seconds, 3),
+                    "tokens_per_s": round(tokens / seconds, 2),
+                    "goodput": {},
+                }
+                for target in self.targets:
+                    good = self._count(priority, "requests", target, seconds, now)
+                    entry["goodput"][target] = {
+                        "requests_per_s": round(good / seconds, 3),
+                        "tokens_per_s": round(self._count(priority, "tokens", target, seconds, now) / seconds, 2),
+                        "attainment": round(good / requests, 4) if requests else None,
+                    }
+                by_priority[priority] = entry
+            windows[label] = by_priority
+        return windows
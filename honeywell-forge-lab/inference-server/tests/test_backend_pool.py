@@ -0,0 +1,130 @@
+"""BackendPool routing around a failing replica, with and without hedging"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from backend_pool import BackendPool, HedgePolicy, PoolConfig, RatioBudget, Replica  # noqa: E402
+from inference_backends import BackendError, SimulatedBackend, StreamChunk, create_inference_backend  # noqa: E402
+
+
+class FastBackend(SimulatedBackend):
+    def __init__(self):
+        super().__init__()
+        self._loaded = True
+        self._base_latency_ms = 1
+        self._token_latency_ms = 0
+
+
+class FailingBackend(FastBackend):
+    async def generate(self, prompt, max_tokens=256, temperature=0.7, stream=False):
+        raise BackendError("replica is broken")
+
+
+class StaggeredBackend(FastBackend):
+    """Streams its whole answer after a fixed time to first token"""
+
+    def __init__(self, ttft_s: float):
+        super().__init__()
+        self.ttft_s = ttft_s
+        self.calls = 0
+
+    async def generate_stream(self, prompt, max_tokens=256, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(self.ttft_s)
+        result = await self.generate(prompt, max_tokens, temperature)
+        yield StreamChunk(text=result.text, num_tokens=result.output_tokens, finished=True, result=result)
+
+
+class EmptyStreamBackend(StaggeredBackend):
+    """Finishes quickly without producing any output"""
+
+    async def generate_stream(self, prompt, max_tokens=256, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(self.ttft_s)
+        yield StreamChunk(text="", finished=True)
+
+
+def hedged_pool(primary, secondary) -> BackendPool:
+    return BackendPool(
+        # Primary first: it wins the least-outstanding-tokens tie
+        [Replica("primary", primary), Replica("secondary", secondary)],
+        hedge_policy=HedgePolicy(enabled=True, min_samples=0, min_delay_ms=10, max_delay_ms=20, budget_percent=50)
+    )
+
+
+def run_requests(hedging: bool, n: int = 10):
+    pool = BackendPool(
+        # Bad replica first: it wins the least-outstanding-tokens tie
+        [Replica("bad", FailingBackend()), Replica("good", FastBackend())],
+        config=PoolConfig(eject_consecutive_failures=1000),
+        hedge_policy=HedgePolicy(enabled=hedging, min_samples=0, min_delay_ms=1)
+    )
+
+    async def main():
+        errors = 0
+        for i in range(n):
+            try:
+                await pool.generate("check the chiller", max_tokens=32, session_id=f"s{i}")
+            except BackendError:
+                errors += 1
+        return errors
+
+    return pool, asyncio.run(main())
+
+
+@pytest.mark.parametrize("hedging", [False, True])
+def test_failed_request_is_retried_on_other_replica(hedging):
+    pool, errors = run_requests(hedging)
+    assert errors == 0
+    bad = pool.replicas[0]
+    assert bad.total_errors > 0
+
+
+def test_hedge_budget_charged_only_for_issued_hedges():
+    primary, secondary = StaggeredBackend(ttft_s=0.08), StaggeredBackend(ttft_s=0.005)
+    pool = hedged_pool(primary, secondary)
+    n = 24
+
+    async def main():
+        for _ in range(n):
+            await pool.generate("check the chiller", max_tokens=32)
+
+    asyncio.run(main())
+
+    # Every request is slow enough to hedge, so replay deposit + spend per request
+    expected = RatioBudget(0.5)
+    issued = 0
+    for _ in range(n):
+        expected.deposit()
+        issued += expected.try_spend()
+
+    stats = pool.hedge_stats()
+    assert 0 < issued < n                      # The budget ran out part way
+    assert stats["hedges_issued"] == issued == secondary.calls
+    assert stats["hedges_won"] == issued
+    assert pool._hedge_budget.tokens == pytest.approx(expected.tokens)
+
+
+def test_empty_hedge_does_not_win_or_cancel_the_primary():
+    primary, secondary = StaggeredBackend(ttft_s=0.05), EmptyStreamBackend(ttft_s=0.001)
+    pool = hedged_pool(primary, secondary)
+    result = asyncio.run(pool.generate("check the chiller", max_tokens=32))
+
+    stats = pool.hedge_stats()
+    assert stats["hedges_issued"] == 1 and stats["hedges_won"] == 0
+    assert result.text
+    assert pool.replicas[0].total_errors == 0
+    assert pool.replicas[1].total_errors == 1
+
+
+
+def test_gpu_id_is_rejected_by_backends_that_cannot_pin_it():
+    assert create_inference_backend("simulated", gpu_id=1).backend_name == "simulated"
+    create_inference_backend("triton", gpu_id=0)
+    with pytest.raises(ValueError, match="cannot be pinned to GPU 1"):
+        create_inference_backend("vllm", gpu_id=1)
@@ -0,0 +1,64 @@
+"""CircuitBreaker state machine on a fake clock"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import circuit_breaker  # noqa: E402
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerConfig, CircuitBreaker  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def opened_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", BreakerConfig(failure_threshold=2, open_duration_s=10.0))
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_closed_open_half_open_closed(clock):
+    breaker = opened_breaker()
+    assert not breaker.allow_request()
+    assert breaker.retry_after_s() == 10.0
+
+    clock[0] += 10.0
+    # Reads do not move it to half-open or use up the trial slot
+    assert breaker.state == OPEN
+    assert not breaker.rejecting
+    assert breaker.state == OPEN
+
+    assert breaker.allow_request()             # The trial request
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()         # half_open_max_calls = 1
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_failure_reopens(clock):
+    breaker = opened_breaker()
+    clock[0] += 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.rejecting
+    assert breaker.retry_after_s() == 10.0     # A fresh cool-down
+
+
+def test_cancelled_trial_gives_the_slot_back(clock):
+    breaker = opened_breaker()
+    clock[0] += 10.0
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
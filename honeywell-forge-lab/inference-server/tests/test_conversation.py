@@ -0,0 +1,52 @@
+"""ConversationHistory context building under the max_input_len budget"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from conversation import ConversationConfig, ConversationHistory  # noqa: E402
+from tokenization import count_tokens  # noqa: E402
+
+SYSTEM_TOKENS = 5
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def history(turns: int) -> ConversationHistory:
+    # One token per word: every message here costs 2 words + 2 role overhead
+    h = ConversationHistory(capacity=32, count_tokens=words)
+    for i in range(1, turns + 1):
+        h.add_turn(f"question {i}", f"answer {i}")
+    return h
+
+
+def context(h: ConversationHistory, max_input_len: int) -> list:
+    config = ConversationConfig(max_input_len=max_input_len, system_prompt="Be brief.")
+    return h.build_context("next one", config, SYSTEM_TOKENS).split("\n")
+
+
+def test_oldest_messages_drop_first():
+    # Budget 26 - 5 system - 4 prompt - 2 reply prefix = 15: three messages fit,
+    # but the window never opens on an answer, so only the newest turn is kept
+    assert context(history(4), 26) == [
+        "System: Be brief.", "User: question 4", "Assistant: answer 4", "User: next one", "Assistant:",
+    ]
+    # Budget 16: the two newest turns
+    assert context(history(4), 27)[1:5] == [
+        "User: question 3", "Assistant: answer 3", "User: question 4", "Assistant: answer 4",
+    ]
+
+
+def test_system_prompt_kept_without_room_for_history():
+    h = history(4)
+    assert context(h, 8) == ["System: Be brief.", "User: next one", "Assistant:"]
+    assert h.last_context_tokens == SYSTEM_TOKENS + 4 + 2
+
+
+def test_default_counter_is_the_tokenization_estimator():
+    h = ConversationHistory(capacity=4)
+    h.append(0, "one two three four five six")
+    assert h.stats()["tokens"] == count_tokens("one two three four five six") + 2
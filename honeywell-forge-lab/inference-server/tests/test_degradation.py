@@ -0,0 +1,69 @@
+"""DegradationController watermarks, hysteresis and per-priority clamping"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from degradation import DegradationConfig, DegradationController  # noqa: E402
+
+# max_queue_depth 10: queue_high 0.8 -> 8 waiting, queue_low 0.4 -> below 4
+QUEUE_DEPTH = 10
+
+
+def controller(**overrides) -> DegradationController:
+    cfg = DegradationConfig(min_degraded_s=10.0, min_tokens=32, **overrides)
+    return DegradationController(cfg, max_queue_depth=QUEUE_DEPTH)
+
+
+def test_hysteresis_with_fake_clock():
+    c = controller()
+    assert not c.observe(7, 0, now=0.0)        # Below high
+    assert c.observe(8, 0, now=1.0)            # Reaches high: degraded
+    assert c.observe(5, 0, now=2.0)            # Between the watermarks: stays
+    assert c.observe(1, 0, now=5.0)            # Below low, but only 4s after the last high
+    assert c.observe(1, 0, now=10.9)
+    assert not c.observe(1, 0, now=11.0)       # 10s since the last high reading
+    assert c.total_degraded_s == 10.0
+
+
+def test_high_reading_restarts_min_degraded_window():
+    c = controller()
+    c.observe(9, 0, now=0.0)
+    c.observe(9, 0, now=8.0)                   # Still high
+    assert c.observe(0, 0, now=12.0)           # Only 4s since the last high
+    assert not c.observe(0, 0, now=18.0)
+
+
+def test_kv_signal():
+    c = controller(kv_budget_tokens=1000)
+    assert c.observe(0, 900, now=0.0)          # kv_high 0.9
+    assert c.observe(0, 750, now=20.0)         # Above kv_low 0.7
+    assert not c.observe(0, 600, now=21.0)
+
+
+def test_clamp_per_priority_class():
+    c = controller()
+    assert c.clamp("normal", 1000) == (1000, False)  # Not degraded: untouched
+    c.observe(QUEUE_DEPTH, 0, now=0.0)
+
+    assert c.clamp("high", 1000) == (1000, False)    # scale 1.0, no cap
+    assert c.clamp("normal", 1000) == (256, True)    # 0.5 x 1000, capped at 256
+    assert c.clamp("normal", 300) == (150, True)     # 0.5 x 300
+    assert c.clamp("low", 1000) == (128, True)       # 0.25 x 1000, capped at 128
+    assert c.clamp("low", 100) == (32, True)         # 25 raised to min_tokens
+    assert c.clamp("low", 20) == (20, False)         # Already below min_tokens
+    assert c.clamp("unknown", 1000) == (256, True)   # Falls back to normal
+
+
+def test_policy_override_merges_over_defaults():
+    c = controller(policy={"normal": {"max_tokens": 192}, "low": {"scale": 0.2}})
+    c.observe(QUEUE_DEPTH, 0, now=0.0)
+    assert c.clamp("normal", 1000) == (192, True)    # Default scale 0.5, new cap
+    assert c.clamp("low", 400) == (80, True)         # New scale, default cap 128
+
+
+def test_disabled_never_degrades():
+    c = controller(enabled=False)
+    assert not c.observe(QUEUE_DEPTH, 0, now=0.0)
+    assert c.clamp("low", 1000) == (1000, False)
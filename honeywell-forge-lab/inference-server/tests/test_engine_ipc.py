@@ -0,0 +1,82 @@
+"""EngineClient when the engine side of a pooled connection goes away"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from engine_ipc import EngineClient, EngineIPCServer, EngineUnavailableError  # noqa: E402
+
+
+class DroppingServer(EngineIPCServer):
+    """EngineIPCServer that can sever its open connections, as a dying engine would"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writers = []
+
+    async def _serve_connection(self, reader, writer):
+        self.writers.append(writer)
+        await super()._serve_connection(reader, writer)
+
+    def drop_connections(self):
+        for writer in self.writers:
+            writer.transport.abort()
+        self.writers.clear()
+
+
+def run_with_server(tmp_path, scenario):
+    async def main():
+        calls = {"generate": 0}
+
+        async def status():
+            return "ok"
+
+        async def generate():
+            calls["generate"] += 1
+            return "text"
+
+        server = DroppingServer(str(tmp_path / "engine.sock"), {"status": status, "generate": generate})
+        await server.start()
+        client = EngineClient(server.socket_path, idempotent_ops={"status"})
+        try:
+            return await scenario(server, client, calls)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_idempotent_op_reconnects_after_engine_drops_connection(tmp_path):
+    async def scenario(server, client, calls):
+        assert await client.call("status") == "ok"  # Leaves a pooled connection
+        server.drop_connections()
+        await asyncio.sleep(0.01)
+        return await client.call("status")
+
+    assert run_with_server(tmp_path, scenario) == "ok"
+
+
+def test_non_idempotent_op_raises_engine_unavailable(tmp_path):
+    async def scenario(server, client, calls):
+        assert await client.call("generate") == "text"
+        server.drop_connections()
+        await asyncio.sleep(0.01)
+        with pytest.raises(EngineUnavailableError):
+            await client.call("generate")
+        # Not resent; the next call gets a fresh connection
+        assert calls["generate"] == 1
+        return await client.call("generate")
+
+    assert run_with_server(tmp_path, scenario) == "text"
+
+
+def test_engine_unavailable_maps_to_503():
+    import server
+    error = server.inference_error(EngineUnavailableError("engine restarting"))
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
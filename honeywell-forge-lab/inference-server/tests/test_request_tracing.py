@@ -0,0 +1,30 @@
+"""SlowRequestLog reports the slowest of the recent requests"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from request_tracing import RequestTrace, SlowRequestLog  # noqa: E402
+
+
+def trace(total_ms: float) -> RequestTrace:
+    t = RequestTrace()
+    t._last = t.start + total_ms / 1000
+    return t
+
+
+def test_startup_outliers_age_out():
+    log = SlowRequestLog(size=2, window=5)
+    log.record(trace(5000))  # Cold start
+    for ms in (10, 30, 20, 40, 15):
+        log.record(trace(ms))
+    assert [r["total_ms"] for r in log.slowest()] == [40, 30]
+
+
+def test_limit_is_capped_at_size():
+    log = SlowRequestLog(size=2, window=10)
+    for ms in (1, 2, 3):
+        log.record(trace(ms))
+    assert len(log.slowest(limit=20)) == 2
+    assert len(log) == 3
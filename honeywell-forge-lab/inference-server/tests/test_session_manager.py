@@ -0,0 +1,37 @@
+"""SessionManager history bookkeeping for sessions that are gone"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from conversation import ConversationConfig  # noqa: E402
+from server import SessionManager  # noqa: E402
+
+
+def test_build_prompt_for_unknown_session_creates_no_history():
+    async def main():
+        manager = SessionManager(4, ConversationConfig(system_prompt="sys"))
+        prompt = await manager.build_prompt("gone", "hello")
+        return manager, prompt
+
+    manager, prompt = asyncio.run(main())
+    assert "hello" in prompt
+    assert manager.histories == {}
+
+
+def test_closed_session_history_is_not_recreated():
+    async def main():
+        manager = SessionManager(4, ConversationConfig())
+        session_id = await manager.create_session()
+        await manager.build_prompt(session_id, "first")
+        await manager.append_turn(session_id, "first", "answer")
+        await manager.close_session(session_id)
+        prompt = await manager.build_prompt(session_id, "second")
+        await manager.append_turn(session_id, "second", "answer")
+        return manager, prompt
+
+    manager, prompt = asyncio.run(main())
+    assert "first" not in prompt
+    assert manager.histories == {}
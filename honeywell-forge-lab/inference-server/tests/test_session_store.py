@@ -0,0 +1,136 @@
+"""Session snapshot log: CRC framing, torn-tail recovery and compaction"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from session_store import (  # noqa: E402
+    MAGIC, SessionStore, SessionStoreConfig, close_record, message_record, replay, session_record
+)
+
+
+def session(session_id: str, request_count: int = 0) -> dict:
+    return {"session_id": session_id, "request_count": request_count}
+
+
+def open_store(path) -> SessionStore:
+    return SessionStore(SessionStoreConfig(path=str(path), fsync=False))
+
+
+def state(records) -> dict:
+    return {
+        sid: (restored.session, list(restored.messages))
+        for sid, restored in replay(records, max_messages=32).items()
+    }
+
+
+def test_torn_tail_is_truncated_and_earlier_sessions_survive(tmp_path):
+    path = tmp_path / "sessions.log"
+    store = open_store(path)
+    store.append([session_record(session("a")), message_record("a", 0, "hello")])
+    store.append([session_record(session("b"))])
+    intact_size = store.size
+    store.append([message_record("b", 0, "lost in the crash")])
+    store.close()
+    # Crash mid-append: the last record is cut short
+    os.truncate(path, os.path.getsize(path) - 5)
+
+    reopened = open_store(path)
+    records = reopened.load()
+    assert state(records) == {
+        "a": (session("a"), [(0, "hello")]),
+        "b": (session("b"), []),
+    }
+    assert os.path.getsize(path) == intact_size
+
+    # Appends after recovery land right after the last intact record
+    reopened.append([message_record("b", 0, "after restart")])
+    reopened.close()
+    assert state(open_store(path).load())["b"][1] == [(0, "after restart")]
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path = tmp_path / "sessions.log"
+    store = open_store(path)
+    store.append([session_record(session("a"))])
+    store.append([session_record(session("b"))])
+    store.close()
+    data = bytearray(path.read_bytes())
+    data[-2] ^= 0xFF  # Flip a payload byte: the CRC no longer matches
+    path.write_bytes(bytes(data))
+
+    assert set(state(open_store(path).load())) == {"a"}
+
+
+def test_rewrite_then_replay_gives_the_same_state(tmp_path):
+    path = tmp_path / "sessions.log"
+    store = open_store(path)
+    store.append([session_record(session("a")), message_record("a", 0, "q1"), message_record("a", 1, "r1")])
+    store.append([session_record(session("b")), message_record("b", 0, "gone")])
+    store.append([session_record(session("a", request_count=1)), close_record("b")])
+    before = state(store.load())
+
+    # Compaction writes the live state: one session record plus its history
+    live = []
+    for sid, (meta, messages) in before.items():
+        live.append(session_record(meta))
+        live.extend(message_record(sid, role, text) for role, text in messages)
+    size = store.rewrite(live)
+    store.close()
+
+    assert os.path.getsize(path) == size
+    assert path.read_bytes().startswith(MAGIC)
+    assert not os.path.exists(str(path) + ".tmp")
+    assert state(open_store(path).load()) == before == {
+        "a": (session("a", request_count=1), [(0, "q1"), (1, "r1")]),
+    }
+
+
+def test_needs_compaction_after_growth(tmp_path):
+    store = SessionStore(SessionStoreConfig(
+        path=str(tmp_path / "sessions.log"), fsync=False, compact_min_bytes=1, compact_ratio=2.0
+    ))
+    store.rewrite([session_record(session("a"))])
+    assert not store.needs_compaction()
+    for i in range(3):
+        store.append([session_record(session("a", request_count=i))])
+    assert store.needs_compaction()
+    store.close()
+
+
+def test_session_manager_compaction_round_trip(tmp_path):
+    import asyncio
+    from server import SessionManager
+
+    path = tmp_path / "sessions.log"
+
+    async def first_run():
+        manager = SessionManager(4, store=open_store(path))
+        await manager.restore()                       # Empty log; snapshots wait for it
+        keep = await manager.create_session()
+        drop = await manager.create_session()
+        await manager.append_turn(keep, "q1", "r1")
+        await manager.update_session(keep, tokens=5, latency_ms=10.0)
+        await manager.append_turn(drop, "q2", "r2")
+        await manager.snapshot()                      # Incremental
+        await manager.close_session(drop)
+        manager._compact = True
+        await manager.snapshot()                      # Full rewrite of the live state
+        manager.store.close()
+        return keep, manager.sessions[keep]
+
+    async def second_run():
+        manager = SessionManager(4, store=open_store(path))
+        await manager.restore()
+        prompt = await manager.build_prompt(keep, "q3")
+        return manager, prompt
+
+    keep, session_before = asyncio.run(first_run())
+    records = open_store(path).load()
+    assert [r["t"] for r in records] == ["s", "m", "m"]  # Closed session compacted away
+
+    manager, prompt = asyncio.run(second_run())
+    assert list(manager.sessions) == [keep]
+    assert manager.sessions[keep] == session_before
+    assert "q1" in prompt and "r1" in prompt
@@ -0,0 +1,59 @@
+"""SKU detection resolves to the profile in sku_profiles.yaml, not generic"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import server  # noqa: E402
+from degradation import DegradationConfig, DegradationController  # noqa: E402
+from hardware_probe import HardwareInfo  # noqa: E402
+
+SERVER_DIR = os.path.dirname(server.__file__)
+
+
+@pytest.fixture
+def rtx_box(monkeypatch):
+    hw = HardwareInfo(arch="x86_64", gpu_count=1, gpu_name="NVIDIA RTX 4000 Ada Generation")
+    monkeypatch.setattr(server, "probe_hardware", lambda: hw)
+    for var in ("FORGE_SKU", "FORGE_MAX_SESSIONS", "FORGE_KV_CACHE_DTYPE"):
+        monkeypatch.delenv(var, raising=False)
+
+
+def load(sku_name):
+    return server.load_config(
+        os.path.join(SERVER_DIR, "config.yaml"),
+        os.path.join(SERVER_DIR, "sku_profiles.yaml"),
+        sku_name=sku_name
+    )
+
+
+def test_rtx_detected_sku_loads_rtx_profile(rtx_box):
+    sku_name = server.detect_sku()
+    assert sku_name == "rtx_4000_pro"
+
+    cfg = load(sku_name)
+    assert cfg.sku_description.startswith("NVIDIA Blackwell RTX Pro 4000")
+    assert cfg.max_concurrent_sessions == 8
+    assert cfg.max_queue_depth == 5
+    assert cfg.tensorrt_llm.scheduler_policy == "guaranteed_no_evict"
+    # The RTX degradation override, merged over config.yaml
+    assert cfg.degradation["queue_high"] == 0.6
+    assert cfg.degradation["policy"]["normal"]["max_tokens"] == 192
+    # Keys the profile does not set still come from config.yaml
+    assert cfg.degradation["min_degraded_s"] == 10.0
+    assert cfg.degradation["kv_high"] == 0.9
+
+    controller = DegradationController(DegradationConfig(**cfg.degradation), cfg.max_queue_depth)
+    assert controller.max_queue_depth == 5
+    assert controller.observe(3, 0, now=0.0)          # 3/5 reaches queue_high 0.6
+    assert controller.clamp("high", 1000) == (384, True)
+    assert controller.clamp("normal", 1000) == (192, True)
+    assert controller.clamp("low", 200) == (40, True)
+
+
+def test_unknown_sku_falls_back_to_generic():
+    profiles = server.load_sku_profiles(os.path.join(SERVER_DIR, "sku_profiles.yaml"))
+    assert server.find_sku_profile(profiles, "no_such_sku") is profiles["generic"]
@@ -0,0 +1,72 @@
+"""Sliding-window sketches: percentile accuracy and window eviction"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from slo_tracker import GoodputTracker, LogSketch, SLOObjective, SLOTracker, SlidingWindowSketch  # noqa: E402
+
+T0 = 1_800_000_000.0  # Aligned to the 10 s slots
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_percentiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(4.0, 0.8) for _ in range(20000)]  # Latency-like, ms
+    sketch = LogSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+    for q in (0.5, 0.9, 0.99, 0.999):
+        expected = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected
+
+
+def test_samples_older_than_the_window_stop_counting():
+    sketch = SlidingWindowSketch(horizon_s=900, slot_s=10)
+    for _ in range(100):
+        sketch.add(1000.0, now=T0)           # A slow burst
+    for _ in range(100):
+        sketch.add(10.0, now=T0 + 120)       # Two minutes later
+
+    now = T0 + 125
+    assert sketch.window(60, now).count == 100
+    assert abs(sketch.window(60, now).quantile(0.99) - 10.0) <= 0.1
+    assert sketch.window(300, now).count == 200
+
+    # Past the 15 minute horizon the burst's slot is reused, not merged
+    later = T0 + 900 + 5
+    sketch.add(10.0, now=later)
+    assert sketch.window(900, later).count == 101
+
+
+def test_tracker_attainment_and_errors():
+    tracker = SLOTracker()
+    objective = SLOObjective("ttft_p90", "ttft_ms", 100.0, 0.90)
+    for i in range(100):
+        tracker.record(ttft_ms=50.0 if i < 80 else 200.0, tpot_ms=5.0, e2e_ms=300.0)
+    tracker.record_error()
+
+    window = tracker.snapshot([objective])["1m"]
+    assert window["requests"] == 100
+    assert window["errors"] == 1
+    slo = window["slo"][0]
+    assert slo["attainment"] == 0.8
+    assert slo["burn_rate"] == 2.0               # 20% misses against a 10% budget
+
+
+def test_goodput_counts_only_met_targets():
+    goodput = GoodputTracker(("ttft", "all"))
+    goodput.record("normal", 60, {"ttft": True, "all": False})
+    goodput.record("normal", 60, {"ttft": True, "all": True})
+    goodput.record_error("normal")
+
+    entry = goodput.snapshot()["1m"]["normal"]
+    assert entry["requests_per_s"] == round(3 / 60, 3)
+    assert entry["goodput"]["ttft"]["attainment"] == round(2 / 3, 4)
+    assert entry["goodput"]["all"]["tokens_per_s"] == 1.0
@@ -0,0 +1,345 @@
+"""
+Honeywell Forge Cognition - Tokenization Service
+
+Admission, replica cost, KV accounting and context budgets all depend on
+token counts. This module replaces the `len(prompt.split())` guesses with a
+pluggable tokenizer loaded from a local file, with no network access:
+
+  huggingface  tokenizer.json (the model's own tokenizer; needs `tokenizers`)
+  wordpiece    vocab.txt, one token per line (pure Python, greedy longest match)
+  estimate     ~1.3 tokens per whitespace word (default, no file)
+
+The estimate is what the built-in engine always used. SimulatedBackend, the
+OpenAI-compatible backend's fallback when the server returns no usage, and
+the pool's request cost used to count plain words, so with the default they
+now report about 1.3x the old numbers.
+
+TokenizerService adds an LRU cache of token counts, so a prompt tokenized
+at admission is free for the backend, the pool and the history. It also
+adds batch counting. Misses on long texts can go to a process pool so a
+pure-Python tokenizer does not hold up the event loop. Latency is exported
+as forge_tokenization_seconds{mode}.
+
+Modules that only need a count call count_tokens(), which uses the service
+set up by configure() (the estimate until then).
+
+Each process has its own service and cache. In multi-worker mode the
+front-end worker counts the prompt and sends the count with the generate
+call; the engine process primes its cache with it instead of tokenizing the
+prompt again. Other texts (history turns, outputs) are counted in the
+process that uses them.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+TOKENIZATION_LATENCY = Histogram(
+    'forge_tokenization_seconds',
+    'Tokenization latency of cache misses in seconds, by where it ran',
+    ['mode'],
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+
+TOKENIZER_CACHE = Counter(
+    'forge_tokenizer_cache_total',
+    'Token count cache lookups',
+    ['result']
+)
+
+_LATENCY = {mode: TOKENIZATION_LATENCY.labels(mode=mode) for mode in ("inline", "pool")}
+_CACHE_HIT = TOKENIZER_CACHE.labels(result="hit")
+_CACHE_MISS = TOKENIZER_CACHE.labels(result="miss")
+
+
+# ============================================================================
+# Tokenizers
+# ============================================================================
+
+class Tokenizer(ABC):
+    """Text -> token IDs"""
+
+    name = "tokenizer"
+
+    @abstractmethod
+    def encode(self, text: str) -> List[int]:
+        pass
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [self.count(t) for t in texts]
+
+
+class EstimateTokenizer(Tokenizer):
+    """No vocabulary: about 1.3 tokens per whitespace-separated word"""
+
+    name = "estimate"
+
+    def encode(self, text: str) -> List[int]:
+        return list(range(self.count(text)))
+
+    def count(self, text: str) -> int:
+        return int(len(text.split()) * 1.3)
+
+
+class WordPieceTokenizer(Tokenizer):
+    """
+    BERT-style WordPiece over a local vocab.txt: split on whitespace and
+    punctuation, then greedy longest-match subwords ("##" continuation).
+    """
+
+    name = "wordpiece"
+    _SPLIT = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self, vocab_path: str, lowercase: bool = True, max_word_chars: int = 100):
+        with open(vocab_path, encoding="utf-8") as f:
+            self.vocab: Dict[str, int] = {line.rstrip("\n"): i for i, line in enumerate(f) if line.strip()}
+        self.lowercase = lowercase
+        self.max_word_chars = max_word_chars
+        self.unk_id = self.vocab.get("[UNK]", 0)
+
+    def _normalize(self, text: str) -> str:
+        if self.lowercase:
+            text = unicodedata.normalize("NFD", text.lower())
+            text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+        return text
+
+    def _word_ids(self, word: str, ids: List[int]):
+        if len(word) > self.max_word_chars:
+            ids.append(self.unk_id)
+            return
+        start, pieces = 0, []
+        while start < len(word):
+            end = len(word)
+            while end > start:
+                piece = word[start:end] if start == 0 else "##" + word[start:end]
+                token_id = self.vocab.get(piece)
+                if token_id is not None:
+                    pieces.append(token_id)
+                    break
+                end -= 1
+            if end == start:
+                ids.append(self.unk_id)  # No piece matches: the whole word is unknown
+                return
+            start = end
+        ids.extend(pieces)
+
+    def encode(self, text: str) -> List[int]:
+        ids: List[int] = []
+        for word in self._SPLIT.findall(self._normalize(text)):
+            self._word_ids(word, ids)
+        return ids
+
+
+class HuggingFaceTokenizer(Tokenizer):
+    """The model's tokenizer.json via the `tokenizers` library (Rust, releases the GIL)"""
+
+    name = "huggingface"
+
+    def __init__(self, path: str):
+        from tokenizers import Tokenizer as _HFTokenizer  # Optional dependency
+        self._tokenizer = _HFTokenizer.from_file(path)
+
+    def encode(self, text: str) -> List[int]:
+        return self._tokenizer.encode(text, add_special_tokens=False).ids
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [len(e.ids) for e in self._tokenizer.encode_batch(list(texts), add_special_tokens=False)]
+
+
+@dataclass
+class TokenizerConfig:
+    """config.yaml `tokenizer:` section"""
+    type: str = "estimate"        # estimate | wordpiece | huggingface | auto (from path)
+    path: str = ""                # Local vocab.txt / tokenizer.json
+    lowercase: bool = True        # wordpiece only
+    cache_size: int = 4096        # Cached token counts (0 disables)
+    workers: int = 0              # Process pool size for long cache misses (0: inline)
+    offload_min_chars: int = 2048  # Shorter texts are tokenized inline even with workers
+
+
+def create_tokenizer(cfg: TokenizerConfig) -> Tokenizer:
+    kind = cfg.type
+    if kind == "auto":
+        kind = "huggingface" if cfg.path.endswith(".json") else "wordpiece" if cfg.path else "estimate"
+    if kind == "estimate":
+        return EstimateTokenizer()
+    if not cfg.path:
+        raise ValueError(f"Tokenizer type {kind} needs a path")
+    if kind == "wordpiece":
+        return WordPieceTokenizer(cfg.path, lowercase=cfg.lowercase)
+    if kind == "huggingface":
+        return HuggingFaceTokenizer(cfg.path)
+    raise ValueError(f"Unknown tokenizer type: {kind}")
+
+
+# Process pool workers build their own tokenizer once
+_worker_tokenizer: Optional[Tokenizer] = None
+
+
+def _init_worker(cfg: TokenizerConfig):
+    global _worker_tokenizer
+    _worker_tokenizer = create_tokenizer(cfg)
+
+
+def _worker_count_batch(texts: List[str]) -> List[int]:
+    return _worker_tokenizer.count_batch(texts)
+
+
+# ============================================================================
+# Service
+# ============================================================================
+
+class TokenizerService:
+    """Cached, batchable token counting; long misses optionally off-process"""
+
+    def __init__(self, cfg: Optional[TokenizerConfig] = None, tokenizer: Optional[Tokenizer] = None):
+        self.config = cfg or TokenizerConfig()
+        self.tokenizer = tokenizer or create_tokenizer(self.config)
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()  # count() is also called from worker threads
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+        if self.config.workers > 0:
+            import multiprocessing
+            self._pool = ProcessPoolExecutor(
+                self.config.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+
+    @property
+    def name(self) -> str:
+        return self.tokenizer.name
+
+    def _lookup(self, text: str) -> Optional[int]:
+        with self._lock:
+            count = self._cache.get(text)
+            if count is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                _CACHE_HIT.inc()
+                return count
+            self.misses += 1
+            _CACHE_MISS.inc()
+            return None
+
+    def _store(self, text: str, count: int, seconds: float, mode: str):
+        _LATENCY[mode].observe(seconds)
+        with self._lock:
+            self.miss_seconds += seconds
+            self._insert(text, count)
+
+    def _insert(self, text: str, count: int):
+        if self.config.cache_size <= 0:
+            return
+        self._cache[text] = count
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.config.cache_size:
+            self._cache.popitem(last=False)
+
+    def prime(self, text: str, count: int):
+        """Cache a count computed by another process with the same tokenizer"""
+        with self._lock:
+            self._insert(text, count)
+
+    def count(self, text: str) -> int:
+        """Token count, tokenizing inline on a cache miss"""
+        count = self._lookup(text)
+        if count is None:
+            start = time.perf_counter()
+            count = self.tokenizer.count(text)
+            self._store(text, count, time.perf_counter() - start, "inline")
+        return count
+
+    async def count_async(self, text: str) -> int:
+        """Token count; long misses run in the process pool when configured"""
+        return (await self.count_batch_async([text]))[0]
+
+    async def count_batch_async(self, texts: Sequence[str]) -> List[int]:
+        counts: List[Optional[int]] = [self._lookup(t) for t in texts]
+        missing = [i for i, c in enumerate(counts) if c is None]
+        if not missing:
+            return counts
+
+        offload, inline = [], []
+        for i in missing:
+            if self._pool is not None and len(texts[i]) >= self.config.offload_min_chars:
+                offload.append(i)
+            else:
+                inline.append(i)
+        if offload:
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            batch = [texts[i] for i in offload]
+            results = await loop.run_in_executor(self._pool, _worker_count_batch, batch)
+            per_text_s = (time.perf_counter() - start) / len(batch)
+            for i, count in zip(offload, results):
+                counts[i] = count
+                self._store(texts[i], count, per_text_s, "pool")
+        if inline:
+            start = time.perf_counter()
+            results = self.tokenizer.count_batch([texts[i] for i in inline])
+            per_text_s = (time.perf_counter() - start) / len(inline)
+            for i, count in zip(inline, results):
+                counts[i] = count
+                self._store(texts[i], count, per_text_s, "inline")
+        return counts
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "tokenizer": self.name,
+            "path": self.config.path or None,
+            "cache_entries": len(self._cache),
+            "cache_size": self.config.cache_size,
+            "cache_hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "pool_workers": self.config.workers if self._pool is not None else 0,
+            "mean_miss_us": round(self.miss_seconds / self.misses * 1e6, 2) if self.misses else None,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_service: Optional[TokenizerService] = None
+
+
+def configure(cfg: TokenizerConfig) -> TokenizerService:
+    """Install the process-wide service used by count_tokens()"""
+    global _service
+    if _service is not None:
+        _service.close()
+    _service = TokenizerService(cfg)
+    logger.info(f"Tokenizer: {_service.name} ({cfg.path or 'no vocab file'})")
+    return _service
+
+
+def get_service() -> TokenizerService:
+    global _service
+    if _service is None:
+        _service = TokenizerService()
+    return _service
+
+
+def count_tokens(text: str) -> int:
+    return get_service().count(text)
@@ -0,0 +1,88 @@
+"""
+Honeywell Forge Cognition - Model Warm-up
+
+Replays representative prompts across prompt lengths and batch sizes before
+a replica reports ready, so CUDA graphs, TensorRT tactics, allocator pools
+and the KV cache are initialised by warm-up traffic instead of the first
+real users (who would otherwise blow the TTFT SLO for the first minute).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARMUP_PROMPTS = [
+    "What is the recommended maintenance schedule for HVAC unit AHU-001?",
+    "Explain the troubleshooting steps for a VFD fault code E-015",
+    "Generate a preventive maintenance checklist for elevator ELV-012",
+    "What are the common causes of high discharge pressure in cooling towers?",
+]
+
+
+@dataclass
+class WarmupConfig:
+    """Warm-up workload: every prompt length is run at every batch size"""
+    enabled: bool = True
+    prompts: List[str] = field(default_factory=lambda: list(DEFAULT_WARMUP_PROMPTS))
+    prompt_lengths: List[int] = field(default_factory=lambda: [32, 256, 1024])
+    batch_sizes: List[int] = field(default_factory=lambda: [1, 4])
+    max_tokens: int = 16
+    timeout_s: float = 300.0
+
+
+def build_prompt(prompts: List[str], length: int) -> str:
+    """Repeat representative prompt words to roughly `length` tokens"""
+    words = " ".join(prompts).split()
+    repeated = (words * (length // max(len(words), 1) + 1))[:length]
+    return " ".join(repeated)
+
+
+async def run_warmup(
+    generate: Callable[[str, int], Awaitable],
+    cfg: WarmupConfig,
+    name: str = "engine"
+) -> Dict:
+    """
+    Run the warm-up workload against one generate(prompt, max_tokens)
+    callable and return a per-step latency summary.
+    """
+    start_time = time.perf_counter()
+    steps = []
+
+    async def workload():
+        for length in cfg.prompt_lengths:
+            prompt = build_prompt(cfg.prompts, length)
+            for batch_size in cfg.batch_sizes:
+                step_start = time.perf_counter()
+                await asyncio.gather(
+                    *(generate(prompt, cfg.max_tokens) for _ in range(batch_size))
+                )
+                steps.append({
+                    "prompt_tokens": length,
+                    "batch_size": batch_size,
+                    "latency_ms": round((time.perf_counter() - step_start) * 1000, 2),
+                })
+
+    try:
+        await asyncio.wait_for(workload(), cfg.timeout_s)
+        status = "complete"
+    except asyncio.TimeoutError:
+        status = "timeout"
+        logger.warning(f"Warm-up of {name} timed out after {cfg.timeout_s}s")
+    except Exception as e:
+        # Best effort: a failing replica is handled by health probing
+        status = "failed"
+        logger.warning(f"Warm-up of {name} failed: {e}")
+
+    duration_s = time.perf_counter() - start_time
+    logger.info(f"Warm-up of {name} {status} in {duration_s:.2f}s ({len(steps)} steps)")
+    return {
+        "target": name,
+        "status": status,
+        "duration_s": round(duration_s, 3),
+        "steps": steps,
+    }
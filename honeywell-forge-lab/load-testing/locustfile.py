@@ -178,10 +178,8 @@ class AssetEngineerUser(HttpUser):
         response = self.client.post("/v1/sessions")
         if response.status_code == 200:
             self.session_id = response.json().get("session_id")
-            self.conversation_history = []
         else:
             self.session_id = None
-            self.conversation_history = []
 
     def on_stop(self):
         """Close session when user stops"""
@@ -193,18 +191,15 @@ class AssetEngineerUser(HttpUser):
         """Complex asset engineering query"""
         prompt = random.choice(ASSET_ENGINEERING_PROMPTS)
 
-        # Add context from previous turn (simulates multi-turn)
-        if self.conversation_history:
-            context = f"Following up on: {self.conversation_history[-1][:100]}... "
-            prompt = context + prompt
-
+        # Multi-turn: the server keeps the conversation, only the new turn is sent
         with self.client.post(
             "/v1/chat",
             json={
                 "prompt": prompt,
                 "session_id": self.session_id,
                 "max_tokens": 512,  # Longer responses for engineering queries
-                "temperature": 0.5  # More deterministic for analysis
+                "temperature": 0.5,  # More deterministic for analysis
+                "use_history": self.session_id is not None
             },
             catch_response=True
         ) as response:
@@ -216,11 +211,6 @@ class AssetEngineerUser(HttpUser):
 
                 metrics.record(ttft, tps, latency)
 
-                # Store for context
-                self.conversation_history.append(prompt)
-                if len(self.conversation_history) > 3:
-                    self.conversation_history.pop(0)
-
                 # Mark as failure if TTFT > 750ms (different SLO for complex queries)
                 if ttft > 750:
                     response.failure(f"TTFT SLO violation: {ttft}ms > 750ms")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Stub Triton Inference Server
+
+Serves just enough of Triton's HTTP API to exercise TritonBackend without a
+GPU or a TensorRT-LLM engine:
+  GET  /v2/health/ready
+  GET  /v2/models/{model}/ready
+  POST /v2/models/{model}/generate          (single JSON response)
+  POST /v2/models/{model}/generate_stream   (server-sent events, one per token)
+
+Usage:
+    python triton-stub-server.py --port 8010 --ttft-ms 80 --token-ms 12
+
+    FORGE_INFERENCE_BACKEND=triton FORGE_TRITON_URL=http://localhost:8010 \\
+        python ../inference-server/server.py
+
+Requirements:
+    pip install aiohttp
+"""
+
+import argparse
+import asyncio
+import json
+
+from aiohttp import web
+
+STUB_WORDS = (
+    "Inspect the filter, verify the belt tension, check refrigerant "
+    "pressure and log the reading in the maintenance record."
+).split()
+
+
+def build_app(ttft_ms: float, token_ms: float, fail_rate: float) -> web.Application:
+    state = {"requests": 0}
+
+    async def ready(request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    def should_fail() -> bool:
+        state["requests"] += 1
+        return fail_rate > 0 and (state["requests"] % round(1 / fail_rate)) == 0
+
+    async def generate(request: web.Request) -> web.Response:
+        body = await request.json()
+        if should_fail():
+            return web.json_response({"error": "stub failure"}, status=500)
+        n = int(body.get("max_tokens", 16))
+        await asyncio.sleep((ttft_ms + token_ms * n) / 1000)
+        text = " ".join(STUB_WORDS[i % len(STUB_WORDS)] for i in range(n))
+        return web.json_response({
+            "model_name": request.match_info["model"],
+            "model_version": "1",
+            "text_output": text,
+        })
+
+    async def generate_stream(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        if should_fail():
+            return web.json_response({"error": "stub failure"}, status=500)
+        n = int(body.get("max_tokens", 16))
+
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await asyncio.sleep(ttft_ms / 1000)
+        for i in range(n):
+            if i:
+                await asyncio.sleep(token_ms / 1000)
+            event = {
+                "model_name": request.match_info["model"],
+                "model_version": "1",
+                "text_output": ("" if i == 0 else " ") + STUB_WORDS[i % len(STUB_WORDS)],
+            }
+            await resp.write(f"data: {json.dumps(event)}\n\n".encode())
+        await resp.write_eof()
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/v2/health/ready", ready)
+    app.router.add_get("/v2/models/{model}/ready", ready)
+    app.router.add_post("/v2/models/{model}/generate", generate)
+    app.router.add_post("/v2/models/{model}/generate_stream", generate_stream)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Triton Inference Server")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--ttft-ms", type=float, default=80.0, help="Delay before first token")
+    parser.add_argument("--token-ms", type=float, default=12.0, help="Delay between tokens")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    args = parser.parse_args()
+
+    web.run_app(build_app(args.ttft_ms, args.token_ms, args.fail_rate), port=args.port)
+
+
+if __name__ == "__main__":
+    main()